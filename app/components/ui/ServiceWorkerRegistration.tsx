@@ -0,0 +1,26 @@
+'use client';
+
+import { useEffect } from 'react';
+
+// Registers public/sw.js, which precaches the entries in /precache-manifest.json
+const ServiceWorkerRegistration: React.FC = () => {
+  useEffect(() => {
+    if (process.env.NODE_ENV !== 'production' || !('serviceWorker' in navigator)) {
+      return;
+    }
+
+    navigator.serviceWorker
+      .register('/sw.js')
+      .then((registration) => {
+        // Pick up a rebuilt manifest even when sw.js itself is unchanged
+        registration.active?.postMessage('refresh');
+      })
+      .catch((error) => {
+        console.warn('Service worker registration failed:', error);
+      });
+  }, []);
+
+  return null;
+};
+
+export default ServiceWorkerRegistration;
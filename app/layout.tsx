@@ -6,6 +6,7 @@ import Navbar from "./components/layout/Navbar";
 import Footer from "./components/layout/Footer";
 import GamificationHeader from "./components/ui/GamificationHeader";
 import LoadingScreen from "./components/ui/LoadingScreen";
+import ServiceWorkerRegistration from "./components/ui/ServiceWorkerRegistration";
 import { AdminProvider } from "@/contexts/AdminContext";
 import { generateWebSiteSchema } from "@/lib/schemas";
 
@@ -214,6 +215,7 @@ export default function RootLayout({
       <body className={`${inter.className} antialiased`}>
         <AdminProvider>
           <LoadingScreen />
+          <ServiceWorkerRegistration />
           <div className="min-h-screen flex flex-col">
             <Navbar />
             <GamificationHeader />
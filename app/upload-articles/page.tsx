@@ -1,11 +1,21 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { collection, addDoc, Timestamp } from 'firebase/firestore';
+import { collection, deleteDoc, doc, getDocs, query, setDoc, Timestamp, where } from 'firebase/firestore';
 import { db, auth } from '@/lib/firebase';
 import { onAuthStateChanged, User } from 'firebase/auth';
 import { useRouter } from 'next/navigation';
 
+// Articles are stored under their slug, the document ID scripts/diff-articles.py
+// addresses. Uploads before that used addDoc (random IDs); drop those copies so
+// re-uploading an article replaces it instead of duplicating it.
+async function removeRandomIdCopies(slug: string) {
+  const copies = await getDocs(query(collection(db, 'blog'), where('slug', '==', slug)));
+  for (const copy of copies.docs) {
+    if (copy.id !== slug) await deleteDoc(copy.ref);
+  }
+}
+
 export default function ArticleUploader() {
   const [user, setUser] = useState<User | null>(null);
   const [loading, setLoading] = useState(true);
@@ -66,9 +76,13 @@ export default function ArticleUploader() {
             updatedAt: Timestamp.now(),
           };
 
-          const docRef = await addDoc(collection(db, 'blog'), articleData);
+          if (!article.slug) {
+            throw new Error(`"${article.title}" has no slug (run scripts/add-slugs-to-articles.py)`);
+          }
+          await setDoc(doc(db, 'blog', article.slug), articleData);
+          await removeRandomIdCopies(article.slug);
           
-          const result = `✓ ${i + 1}/${articles.length}: ${article.title.substring(0, 50)}... (ID: ${docRef.id})`;
+          const result = `✓ ${i + 1}/${articles.length}: ${article.title.substring(0, 50)}... (ID: ${article.slug})`;
           setResults(prev => [...prev, result]);
           setProgress(`Uploaded ${i + 1} of ${articles.length} articles to blog collection`);
 
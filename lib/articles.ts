@@ -1,3 +1,4 @@
+import { createHash } from 'crypto';
 import fs from 'fs';
 import path from 'path';
 import matter from 'gray-matter';
@@ -6,6 +7,18 @@ import html from 'remark-html';
 import remarkGfm from 'remark-gfm';
 
 const articlesDirectory = path.join(process.cwd(), 'content/articles');
+// Written by scripts/build-article-manifest.py
+const manifestPath = path.join(process.cwd(), 'content/articles-manifest.json');
+// Must match MANIFEST_VERSION in scripts/pipeline/manifest.py
+const MANIFEST_VERSION = 2;
+// Written by scripts/build-html-cache.py
+const htmlCacheDirectory = path.join(process.cwd(), '.markdown-cache');
+// Must match RENDERER_VERSION and RENDER_PACKAGES in scripts/pipeline/rendercache.py
+const RENDERER_VERSION = 1;
+const RENDER_PACKAGES = ['remark', 'remark-gfm', 'remark-html'];
+let rendererId: string | null = null;
+// Written by scripts/build-listings.py
+const listingsDirectory = path.join(process.cwd(), 'public/listings');
 
 export interface ArticleFrontmatter {
   title: string;
@@ -25,18 +38,132 @@ export interface Article extends ArticleFrontmatter {
   htmlContent?: string;
 }
 
+export type ArticleSummary = Pick<
+  ArticleFrontmatter,
+  'title' | 'slug' | 'excerpt' | 'tags' | 'publishedAt' | 'updatedAt' | 'featured' | 'imageUrl'
+>;
+
+interface ManifestEntry extends ArticleSummary {
+  file: string;
+  hash: string;
+  mtime: number;
+  size: number;
+}
+
+interface ArticleManifest {
+  version: number;
+  fingerprint: string;
+  articles: ManifestEntry[];
+}
+
 /**
- * Get all article slugs for static generation
+ * Article file names in a stable order (the order scripts/pipeline/mdx.py lists them in)
  */
-export function getAllArticleSlugs(): string[] {
+function getArticleFileNames(): string[] {
   if (!fs.existsSync(articlesDirectory)) {
     return [];
   }
-  
-  const fileNames = fs.readdirSync(articlesDirectory);
-  return fileNames
+
+  return fs.readdirSync(articlesDirectory)
     .filter(fileName => fileName.endsWith('.mdx') || fileName.endsWith('.md'))
-    .map(fileName => fileName.replace(/\.mdx?$/, ''));
+    .sort();
+}
+
+/**
+ * Get all article slugs for static generation
+ */
+export function getAllArticleSlugs(): string[] {
+  return getArticleFileNames().map(fileName => fileName.replace(/\.mdx?$/, ''));
+}
+
+/**
+ * Sort key for publishedAt. gray-matter turns unquoted YAML dates into Date
+ * objects; scripts/pipeline/manifest.py stores them as the same ISO string.
+ */
+function publishedKey(value: unknown): string {
+  return value instanceof Date ? value.toISOString() : String(value ?? '');
+}
+
+/**
+ * Newest first, file order for ties; the manifest is sorted the same way
+ */
+function newestFirst(a: { publishedAt: unknown }, b: { publishedAt: unknown }): number {
+  const keyA = publishedKey(a.publishedAt);
+  const keyB = publishedKey(b.publishedAt);
+  return keyA < keyB ? 1 : keyA > keyB ? -1 : 0;
+}
+
+/**
+ * The article manifest, if it still describes content/articles: the same
+ * files, each with the mtime and size it was built from. Returns null when it
+ * is missing or stale, so callers read the files instead.
+ */
+function readFreshManifest(): ArticleManifest | null {
+  if (!fs.existsSync(manifestPath)) {
+    return null;
+  }
+  try {
+    const manifest: ArticleManifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8'));
+    if (manifest.version !== MANIFEST_VERSION) {
+      return null;
+    }
+    if (manifest.articles.length !== getArticleFileNames().length) {
+      return null;
+    }
+    const fresh = manifest.articles.every((entry) => {
+      const fullPath = path.join(articlesDirectory, entry.file);
+      if (!fs.existsSync(fullPath)) {
+        return false;
+      }
+      // Both sides round the nanosecond mtime to a double the same way
+      const stat = fs.statSync(fullPath, { bigint: true });
+      return Number(stat.mtimeNs) === entry.mtime && Number(stat.size) === entry.size;
+    });
+    return fresh ? manifest : null;
+  } catch (error) {
+    console.error('Error reading article manifest:', error);
+    return null;
+  }
+}
+
+/**
+ * "remark@15.0.1 remark-gfm@4.0.1 remark-html@16.0.1", the versions locked in
+ * package-lock.json. Cache keys include it, so upgrading remark misses the cache.
+ */
+function getRendererId(): string {
+  if (rendererId === null) {
+    let packages: Record<string, { version?: string }> = {};
+    try {
+      const lock = JSON.parse(fs.readFileSync(path.join(process.cwd(), 'package-lock.json'), 'utf8'));
+      packages = lock.packages ?? {};
+    } catch (error) {
+      console.error('Error reading package-lock.json:', error);
+    }
+    rendererId = RENDER_PACKAGES
+      .map((name) => `${name}@${packages[`node_modules/${name}`]?.version ?? ''}`)
+      .join(' ');
+  }
+  return rendererId;
+}
+
+/**
+ * Pre-rendered HTML for cleaned article Markdown, looked up by content hash
+ * and renderer versions. Entries from another renderer version are ignored
+ * so remark renders instead.
+ */
+function getCachedHtml(markdown: string): string | null {
+  const hash = createHash('sha256').update(`${getRendererId()}\n${markdown}`).digest('hex').slice(0, 16);
+  const cachePath = path.join(htmlCacheDirectory, `${hash}.json`);
+  if (!fs.existsSync(cachePath)) {
+    return null;
+  }
+  try {
+    const entry = JSON.parse(fs.readFileSync(cachePath, 'utf8'));
+    return entry.version === RENDERER_VERSION && typeof entry.html === 'string' ? entry.html : null;
+  } catch (error) {
+    console.error(`Error reading cached HTML ${hash}:`, error);
+    return null;
+  }
 }
 
 /**
@@ -68,12 +195,12 @@ export async function getArticleBySlug(slug: string): Promise<Article | null> {
       .replace(/\n{3,}/g, '\n\n')  // Replace multiple newlines with double
       .trim();
 
-    // Convert markdown to HTML with GitHub Flavored Markdown support
-    const processedContent = await remark()
+    // Convert markdown to HTML with GitHub Flavored Markdown support,
+    // unless scripts/build-html-cache.py already rendered this exact content
+    const htmlContent = getCachedHtml(cleanedContent) ?? (await remark()
       .use(remarkGfm) // Enable images, tables, strikethrough, etc.
       .use(html, { sanitize: false })
-      .process(cleanedContent);
-    const htmlContent = processedContent.toString();
+      .process(cleanedContent)).toString();
 
     return {
       ...(data as ArticleFrontmatter),
@@ -102,11 +229,106 @@ export async function getAllArticles(): Promise<Article[]> {
   // Filter out nulls and sort by date
   return articles
     .filter((article): article is Article => article !== null)
-    .sort((a, b) => {
-      const dateA = new Date(a.publishedAt).getTime();
-      const dateB = new Date(b.publishedAt).getTime();
-      return dateB - dateA;
-    });
+    .sort(newestFirst);
+}
+
+/**
+ * Get the frontmatter of all articles, newest first, without reading their bodies.
+ * Uses the manifest while it is up to date, otherwise parses each file's frontmatter.
+ */
+export function getArticleSummaries(): ArticleSummary[] {
+  const manifest = readFreshManifest();
+  if (manifest) {
+    return manifest.articles;
+  }
+
+  return getArticleFileNames()
+    .map((fileName) => {
+      const { data } = matter(fs.readFileSync(path.join(articlesDirectory, fileName), 'utf8'));
+      const slug = fileName.replace(/\.mdx?$/, '');
+      return {
+        ...(data as ArticleFrontmatter),
+        slug: data.slug || slug,
+        publishedAt: publishedKey(data.publishedAt),
+      };
+    })
+    .sort(newestFirst);
+}
+
+/**
+ * Get article summaries by tag
+ */
+export function getArticleSummariesByTag(tag: string): ArticleSummary[] {
+  return getArticleSummaries().filter(article =>
+    article.tags.some(t => t.toLowerCase() === tag.toLowerCase())
+  );
+}
+
+export interface ListingPage {
+  list: string;
+  page: number;
+  pages: number;
+  pageSize: number;
+  total: number;
+  articles: (ArticleSummary & { category: string | null })[];
+  next: string | null;
+  prev: string | null;
+}
+
+/**
+ * Whether public/listings was built from the current article manifest
+ * (which in turn must match content/articles)
+ */
+function listingsAreCurrent(): boolean {
+  const manifest = readFreshManifest();
+  const indexPath = path.join(listingsDirectory, 'index.json');
+  if (!manifest || !fs.existsSync(indexPath)) {
+    return false;
+  }
+  try {
+    return JSON.parse(fs.readFileSync(indexPath, 'utf8')).manifest === manifest.fingerprint;
+  } catch (error) {
+    console.error('Error reading listing index:', error);
+    return false;
+  }
+}
+
+// A list name: one or two slugs as create_slug() in scripts/pipeline/slugs.py
+// makes them (Python's \w is Unicode letters, digits and the underscore).
+// Built with the constructor because tsconfig targets ES2017, which predates \p{...}
+const LIST_NAME = new RegExp('^[\\p{L}\\p{N}_-]+(/[\\p{L}\\p{N}_-]+)?$', 'u');
+
+/**
+ * Read a precomputed listing page: 'newest', 'featured', 'category/<slug>' or 'tag/<slug>'.
+ * Returns null if the page does not exist or the listings are out of date.
+ */
+export function getListingPage(list: string, page: number = 1): ListingPage | null {
+  if (!LIST_NAME.test(list) || !(page > 0)) {
+    return null;
+  }
+  if (!listingsAreCurrent()) {
+    return null;
+  }
+
+  const pagePath = path.join(listingsDirectory, list, `${page}.json`);
+  if (!fs.existsSync(pagePath)) {
+    return null;
+  }
+  try {
+    return JSON.parse(fs.readFileSync(pagePath, 'utf8'));
+  } catch (error) {
+    console.error(`Error reading listing ${list} page ${page}:`, error);
+    return null;
+  }
+}
+
+/**
+ * Read the listing page a next/prev cursor points at
+ */
+export function getListingPageByCursor(cursor: string): ListingPage | null {
+  const decoded = Buffer.from(cursor, 'base64url').toString('utf8');
+  const separator = decoded.lastIndexOf('~');
+  return getListingPage(decoded.slice(0, separator), parseInt(decoded.slice(separator + 1), 10));
 }
 
 /**
@@ -175,17 +397,33 @@ export async function searchArticles(query: string): Promise<Article[]> {
  * Get paginated articles
  */
 export async function getPaginatedArticles(page: number = 1, limit: number = 12, search?: string) {
-  let articles = await getAllArticles();
+  // Listing only needs frontmatter; searching also looks at the body
+  let articles: ArticleSummary[];
   
   // Apply search filter
   if (search) {
     const searchTerm = search.toLowerCase();
-    articles = articles.filter(article =>
+    articles = (await getAllArticles()).filter(article =>
       article.title.toLowerCase().includes(searchTerm) ||
       article.excerpt.toLowerCase().includes(searchTerm) ||
       article.content.toLowerCase().includes(searchTerm) ||
       article.tags.some(tag => tag.toLowerCase().includes(searchTerm))
     );
+  } else {
+    // Pages built by scripts/build-listings.py, when they are current and
+    // were built with this page size
+    const listing = getListingPage('newest', page);
+    if (listing && listing.pageSize === limit) {
+      return {
+        articles: listing.articles,
+        totalArticles: listing.total,
+        totalPages: listing.pages,
+        currentPage: page,
+        hasNext: listing.next !== null,
+        hasPrev: listing.prev !== null
+      };
+    }
+    articles = getArticleSummaries();
   }
   
   const totalArticles = articles.length;
@@ -0,0 +1,55 @@
+import slugIndex from '@/lib/slug-index.json';
+
+/**
+ * Slug lookups for the middleware, backed by lib/slug-index.json
+ * (generated by scripts/build-slug-index.py; the hashing here must match
+ * scripts/pipeline/slugindex.py).
+ *
+ * Keys are route-qualified: "blog/<slug>" or "watch/<slug>".
+ */
+
+const FNV_OFFSET = 0x811c9dc5;
+const FNV_PRIME = 0x01000193;
+const SECOND_SEED = 0x9e3779b9;
+
+const encoder = new TextEncoder();
+
+function fnv1a(key: string, seed: number = 0): number {
+  let h = (FNV_OFFSET ^ seed) >>> 0;
+  for (const byte of encoder.encode(key)) {
+    h = Math.imul(h ^ byte, FNV_PRIME) >>> 0;
+  }
+  return h;
+}
+
+const bloom = slugIndex.bloom;
+const bloomBits = Uint8Array.from(atob(bloom.data), (c) => c.charCodeAt(0));
+const seeds: number[] = slugIndex.redirects.seeds;
+const entries = slugIndex.redirects.entries as [string, string][];
+
+/**
+ * False means the page certainly does not exist; true means it probably does
+ */
+export function mightExist(key: string): boolean {
+  const h1 = fnv1a(key);
+  const h2 = (fnv1a(key, SECOND_SEED) | 1) >>> 0;
+  for (let i = 0; i < bloom.hashes; i++) {
+    const pos = (h1 + i * h2) % bloom.bits;
+    if (!(bloomBits[pos >> 3] & (1 << (pos & 7)))) {
+      return false;
+    }
+  }
+  return true;
+}
+
+/**
+ * Canonical key for a legacy key, or null if it is not a known legacy URL
+ */
+export function resolveLegacy(key: string): string | null {
+  if (entries.length === 0) {
+    return null;
+  }
+  const seed = seeds[fnv1a(key) % seeds.length];
+  const [legacy, canonical] = entries[fnv1a(key, seed) % entries.length];
+  return legacy === key ? canonical : null;
+}
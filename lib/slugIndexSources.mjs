@@ -0,0 +1,45 @@
+import { createHash } from 'crypto';
+import fs from 'fs';
+import path from 'path';
+
+/**
+ * Fingerprint of the files lib/slug-index.json is built from, computed the
+ * way sources_fingerprint() in scripts/pipeline/slugindex.py does: the MDX
+ * and video file names and the bytes of the generated datasets.
+ *
+ * Plain JavaScript so next.config.ts can run it at build time and the
+ * pipeline tests can run it with node.
+ */
+
+function contentHash(data) {
+  return createHash('sha256').update(data).digest('hex').slice(0, 16);
+}
+
+function filesWith(directory, suffixes) {
+  if (!fs.existsSync(directory)) {
+    return [];
+  }
+  return fs.readdirSync(directory).filter((name) => suffixes.includes(path.extname(name)));
+}
+
+function stem(name) {
+  return name.slice(0, name.length - path.extname(name).length);
+}
+
+/**
+ * @param {string} root - the project directory
+ * @returns {string}
+ */
+export function sourcesFingerprint(root) {
+  const datasetsDir = path.join(root, 'public/scripts');
+  const lines = [
+    ...filesWith(path.join(root, 'content/articles'), ['.mdx', '.md']).map((name) => `blog/${stem(name)}`),
+    ...filesWith(path.join(root, 'content/videos'), ['.yaml', '.yml']).map((name) => `watch/${stem(name)}`),
+    ...filesWith(datasetsDir, ['.json'])
+      .filter((name) => !name.endsWith('.meta.json'))
+      .map((name) => `${name} ${contentHash(fs.readFileSync(path.join(datasetsDir, name)))}`),
+  ];
+  // Plain comparison like Python's sorted(), not localeCompare
+  lines.sort((a, b) => (a < b ? -1 : a > b ? 1 : 0));
+  return contentHash(lines.join('\n'));
+}
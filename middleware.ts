@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server';
 import type { NextRequest } from 'next/server';
+import { mightExist, resolveLegacy } from '@/lib/slugIndex';
 
 /**
  * Legacy URL patterns that should return 410 (Gone)
@@ -13,6 +14,8 @@ const LEGACY_PATTERNS = [
   /^\/blog\/\d+$/i,        // Numeric blog IDs
 ];
 
+const SLUG_ROUTE = /^\/(blog|watch)\/([^/]+)\/?$/;
+
 /**
  * Check if a path matches any legacy pattern
  */
@@ -20,21 +23,33 @@ function isLegacyUrl(pathname: string): boolean {
   return LEGACY_PATTERNS.some((pattern) => pattern.test(pathname));
 }
 
-export function middleware(request: NextRequest) {
-  const { pathname } = request.nextUrl;
+/**
+ * Slug index key ("blog/<slug>" or "watch/<slug>") for a page path
+ */
+function slugKey(pathname: string): string | null {
+  const match = SLUG_ROUTE.exec(pathname);
+  if (!match) {
+    return null;
+  }
+  try {
+    return `${match[1]}/${decodeURIComponent(match[2])}`;
+  } catch {
+    return null; // malformed escape; let the route handle it
+  }
+}
 
-  // Check if this is a legacy URL
-  if (isLegacyUrl(pathname)) {
-    // Return 410 Gone status
-    return new NextResponse(
-      `
+/**
+ * Styled HTML body for responses the middleware answers itself
+ */
+function statusPage(status: number, heading: string, message: string): string {
+  return `
 <!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
   <meta name="robots" content="noindex, nofollow">
-  <title>410 - Content No Longer Available</title>
+  <title>${status} - ${heading}</title>
   <style>
     body {
       font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
@@ -85,11 +100,10 @@ export function middleware(request: NextRequest) {
 </head>
 <body>
   <div class="container">
-    <h1>410</h1>
-    <h2>Content No Longer Available</h2>
+    <h1>${status}</h1>
+    <h2>${heading}</h2>
     <p>
-      This page has been permanently removed and is no longer available.
-      The content has been reorganized or deleted.
+      ${message}
     </p>
     <div>
       <a href="/">Go Home</a>
@@ -99,7 +113,22 @@ export function middleware(request: NextRequest) {
   </div>
 </body>
 </html>
-      `.trim(),
+  `.trim();
+}
+
+export function middleware(request: NextRequest) {
+  const { pathname } = request.nextUrl;
+
+  // Check if this is a legacy URL
+  if (isLegacyUrl(pathname)) {
+    // Return 410 Gone status
+    return new NextResponse(
+      statusPage(
+        410,
+        'Content No Longer Available',
+        'This page has been permanently removed and is no longer available. ' +
+          'The content has been reorganized or deleted.'
+      ),
       {
         status: 410,
         headers: {
@@ -110,6 +139,32 @@ export function middleware(request: NextRequest) {
     );
   }
 
+  // Blog and video pages: resolve legacy slugs and reject unknown ones
+  // before they reach the data layer
+  const key = slugKey(pathname);
+  if (key) {
+    const canonical = resolveLegacy(key);
+    if (canonical) {
+      return NextResponse.redirect(new URL(`/${canonical}`, request.url), 301);
+    }
+    // Only trust a miss when next.config.ts found the index built from the
+    // deployed content; in development, or with a stale index, new articles
+    // and videos are not in it yet, so let the page's own notFound()
+    // decide. Not cached: the next deploy may add it.
+    if (process.env.NODE_ENV === 'production' && process.env.SLUG_INDEX_CURRENT === '1' && !mightExist(key)) {
+      return new NextResponse(
+        statusPage(404, 'Page Not Found', 'We couldn\'t find the page you were looking for.'),
+        {
+          status: 404,
+          headers: {
+            'Content-Type': 'text/html; charset=utf-8',
+            'Cache-Control': 'no-store',
+          },
+        }
+      );
+    }
+  }
+
   return NextResponse.next();
 }
 
@@ -1,6 +1,23 @@
 import type { NextConfig } from "next";
+import slugIndex from "./lib/slug-index.json";
+import { sourcesFingerprint } from "./lib/slugIndexSources.mjs";
+
+// middleware.ts only answers 404 from the slug index's Bloom filter when the
+// index was built from the content being deployed; a stale index (the
+// prebuild pipeline was skipped) lets every slug through to the page
+const slugIndexCurrent = slugIndex.sources === sourcesFingerprint(process.cwd());
+if (!slugIndexCurrent) {
+  console.warn(
+    "⚠️  lib/slug-index.json does not match content/ and public/scripts/; " +
+      "unknown slugs will not get the middleware 404. Run: python3 scripts/build-slug-index.py"
+  );
+}
 
 const nextConfig: NextConfig = {
+  env: {
+    SLUG_INDEX_CURRENT: slugIndexCurrent ? "1" : "",
+  },
+
   // Performance optimizations
   compress: true,
   poweredByHeader: false,
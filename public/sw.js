@@ -0,0 +1,140 @@
+/**
+ * Offline precache service worker.
+ *
+ * Entries come from /precache-manifest.json (scripts/build-precache-manifest.py),
+ * already sorted by priority and trimmed to the byte budget: article pages,
+ * their hero images and the video catalog shards under /offline/. Each
+ * manifest version gets its own cache; entries whose revision did not change
+ * are copied from the previous cache instead of being downloaded again. A
+ * cache only counts once every entry is stored (marked by COMPLETE_KEY); an
+ * interrupted precache resumes where it stopped on the next install or
+ * refresh, and the last complete cache keeps serving meanwhile.
+ *
+ * Only precached URLs are intercepted. Pages are fetched from the network
+ * first and served from the cache when offline; images and shards are served
+ * cache-first.
+ */
+
+const CACHE_PREFIX = 'precache-';
+const MANIFEST_URL = '/precache-manifest.json';
+const REVISION_HEADER = 'X-Precache-Revision';
+const COMPLETE_KEY = '/__precache-complete__';
+
+// Cache being served and the URLs in it; the fetch handler has to decide
+// synchronously, so these are kept in memory and reloaded when a cache completes
+let activeCacheName = null;
+let precachedUrls = new Set();
+
+async function isComplete(cache) {
+  return Boolean(await cache.match(COMPLETE_KEY));
+}
+
+async function loadActiveCache() {
+  // caches.keys() lists caches in creation order: newest complete one wins
+  const names = (await caches.keys()).filter((name) => name.startsWith(CACHE_PREFIX)).reverse();
+  for (const name of names) {
+    const cache = await caches.open(name);
+    if (await isComplete(cache)) {
+      const requests = await cache.keys();
+      activeCacheName = name;
+      precachedUrls = new Set(
+        requests.map((request) => new URL(request.url).pathname).filter((path) => path !== COMPLETE_KEY)
+      );
+      return;
+    }
+  }
+  activeCacheName = null;
+  precachedUrls = new Set();
+}
+
+async function precache() {
+  let manifest;
+  try {
+    const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+    if (!response.ok) return;
+    manifest = await response.json();
+  } catch (error) {
+    return; // offline: keep whatever is cached
+  }
+
+  const cacheName = CACHE_PREFIX + manifest.version;
+  const cache = await caches.open(cacheName);
+  if (await isComplete(cache)) return;
+
+  // This cache first (entries stored by an interrupted run), then older versions
+  const otherNames = (await caches.keys()).filter((name) => name.startsWith(CACHE_PREFIX) && name !== cacheName);
+  const sources = [cache, ...(await Promise.all(otherNames.map((name) => caches.open(name))))];
+
+  // In manifest order, so the most useful entries land first
+  let complete = true;
+  for (const entry of manifest.entries) {
+    let cached = null;
+    let source = null;
+    for (const candidate of sources) {
+      const response = await candidate.match(entry.url);
+      if (response && response.headers.get(REVISION_HEADER) === entry.revision) {
+        cached = response;
+        source = candidate;
+        break;
+      }
+    }
+    if (cached) {
+      if (source !== cache) await cache.put(entry.url, cached);
+      continue;
+    }
+    try {
+      const response = await fetch(entry.url, { cache: 'no-cache' });
+      if (!response.ok) {
+        complete = false;
+        continue;
+      }
+      const headers = new Headers(response.headers);
+      headers.set(REVISION_HEADER, entry.revision);
+      await cache.put(
+        entry.url,
+        new Response(await response.blob(), { status: response.status, statusText: response.statusText, headers })
+      );
+    } catch (error) {
+      // Network dropped mid-way: keep what we have, the rest is fetched next time
+      complete = false;
+    }
+  }
+  if (!complete) return;
+
+  await cache.put(COMPLETE_KEY, new Response(manifest.version));
+  await Promise.all(otherNames.map((name) => caches.delete(name)));
+  await loadActiveCache();
+}
+
+const activeCacheLoaded = loadActiveCache();
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(Promise.all([self.clients.claim(), activeCacheLoaded]));
+});
+
+// Pages post 'refresh' on load so a rebuilt manifest is picked up without a new sw.js
+self.addEventListener('message', (event) => {
+  if (event.data === 'refresh') {
+    event.waitUntil(precache());
+  }
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET' || !activeCacheName) return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin || url.search || !precachedUrls.has(url.pathname)) return;
+
+  const cacheName = activeCacheName;
+  const fromCache = async () => (await caches.open(cacheName)).match(url.pathname);
+
+  if (request.mode === 'navigate') {
+    event.respondWith(fetch(request).catch(async () => (await fromCache()) || Response.error()));
+    return;
+  }
+  event.respondWith((async () => (await fromCache()) || fetch(request))());
+});
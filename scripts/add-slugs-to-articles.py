@@ -1,46 +1,97 @@
-import json
-import re
-
-def create_slug(title):
-    """Convert title to URL-friendly slug"""
-    # Convert to lowercase
-    slug = title.lower()
-    # Remove special characters and replace spaces with hyphens
-    slug = re.sub(r'[^\w\s-]', '', slug)
-    slug = re.sub(r'[-\s]+', '-', slug)
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
-    # Limit length to 100 characters
-    return slug[:100]
-
-# Process clean rhythm ECG articles
-with open('../public/scripts/ecg-blog-articles-v2.json', 'r', encoding='utf-8') as f:
-    articles = json.load(f)
-
-for article in articles:
-    article['slug'] = create_slug(article['title'])
-
-with open('../public/scripts/ecg-blog-articles-v2.json', 'w', encoding='utf-8') as f:
-    json.dump(articles, f, indent=2, ensure_ascii=False)
-
-print(f"✅ Added slugs to {len(articles)} articles in ecg-blog-articles-v2.json")
-
-# Process best ECG images articles
-with open('../public/scripts/ecg-blog-best-images.json', 'r', encoding='utf-8') as f:
-    articles = json.load(f)
-
-for article in articles:
-    article['slug'] = create_slug(article['title'])
-
-with open('../public/scripts/ecg-blog-best-images.json', 'w', encoding='utf-8') as f:
-    json.dump(articles, f, indent=2, ensure_ascii=False)
-
-print(f"✅ Added slugs to {len(articles)} articles in ecg-blog-best-images.json")
-
-# Show some examples
-with open('../public/scripts/ecg-blog-articles-v2.json', 'r', encoding='utf-8') as f:
-    examples = json.load(f)
-    print("\n📝 Example slugs (first 3):")
-    for i, article in enumerate(examples[:3], 1):
-        print(f"  {i}. {article['title']}")
-        print(f"     → {article['slug']}\n")
+#!/usr/bin/env python3
+"""
+Add a URL slug to every article in generated datasets.
+
+Slugs registered in scripts/slug-registry.json (see build-slug-registry.py)
+win over create_slug, so collisions the registry resolved stay resolved.
+Articles are matched to their registry source by the slug stored on them
+(or the MDX file they were converted to), not by title or position.
+
+Articles are streamed: each one is parsed, given its slug and written to a
+temp file next to the dataset, which then replaces it atomically. Memory
+holds one article at a time, and several datasets are processed in parallel.
+
+Usage:
+    python add-slugs-to-articles.py
+    python add-slugs-to-articles.py ../public/scripts/mi-ecg-articles.json --workers 2
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from pipeline.output import json_array_element, json_array_end, iter_json_array
+from pipeline.slugregistry import REGISTRY_PATH, SlugRegistry
+from pipeline.slugs import create_slug
+from pipeline.telemetry import instrumented, stage
+
+DATASETS = [
+    '../public/scripts/ecg-blog-articles-v2.json',  # clean rhythm ECG articles
+    '../public/scripts/ecg-blog-best-images.json',  # best ECG images articles
+]
+
+EXAMPLES = 3
+
+
+def add_slugs(path, registry=None):
+    """
+    Rewrite one dataset with slugs; returns (article count, examples).
+
+    The output is byte-for-byte what loading the file, setting the slugs
+    and json.dump(..., indent=2, ensure_ascii=False) would write.
+    """
+    count = 0
+    examples = []
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as out:
+            for article in iter_json_array(path):
+                registered = registry and registry.slug_for(registry.article_source(path, article))
+                article['slug'] = registered or create_slug(article['title'])
+                out.write(json_array_element(article, first=count == 0))
+                count += 1
+                if len(examples) < EXAMPLES:
+                    examples.append((article['title'], article['slug']))
+            out.write(json_array_end(count))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return count, examples
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Add URL slugs to generated article datasets")
+    parser.add_argument('datasets', nargs='*', default=DATASETS, help="Article JSON files to update in place")
+    parser.add_argument('--registry', default=REGISTRY_PATH, help="Slug registry to take assigned slugs from")
+    parser.add_argument('--workers', type=int, help="Datasets processed in parallel (default: one per file)")
+    args = parser.parse_args()
+
+    registry = SlugRegistry.load(args.registry)
+    rewrite = partial(add_slugs, registry=registry)
+    workers = args.workers or min(len(args.datasets), os.cpu_count() or 1)
+    with stage('slugs') as stats:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(rewrite, args.datasets))
+        else:
+            results = [rewrite(path) for path in args.datasets]
+
+        for path, (count, _) in zip(args.datasets, results):
+            stats.items += count
+            stats.add_file(path)
+            print(f"✅ Added slugs to {count} articles in {os.path.basename(path)}")
+        stats.extra.update(datasets=len(args.datasets), workers=workers)
+
+    # Show some examples (collected while streaming the first dataset)
+    examples = results[0][1] if results else []
+    print(f"\n📝 Example slugs (first {EXAMPLES}):")
+    for i, (title, slug) in enumerate(examples, 1):
+        print(f"  {i}. {title}")
+        print(f"     → {slug}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Count article and video views from access logs and write them in batches,
+plus a ranking of what is hot right now.
+
+Views are coalesced per time window (one batch per --window seconds of log
+time) and sent to a JSONL file or the Firestore emulator. Where each log was
+read up to and the decaying hot scores are kept in a state file, so re-runs
+over a growing log only count the new lines.
+
+Usage:
+    python aggregate-views.py access.log
+    python aggregate-views.py access.log --follow --window 300
+    python aggregate-views.py access.log --sink firestore   # needs FIRESTORE_EMULATOR_HOST
+    gunzip -c access.log.1.gz | python aggregate-views.py -
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pipeline.hosting import write_json_if_changed
+from pipeline.telemetry import instrumented, stage
+from pipeline.views import (
+    DEFAULT_HALF_LIFE, DEFAULT_WINDOW, FIRESTORE_PROJECT, RANKING_PATH, FirestoreSink, JsonlSink, ViewAggregator,
+    parse_log_line, read_log,
+)
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = SCRIPTS_DIR / 'view-counts.jsonl'
+DEFAULT_STATE = SCRIPTS_DIR / 'view-state.json'
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate page views from access logs")
+    parser.add_argument('logs', nargs='+', help="Access log files ('-' for stdin)")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="Seconds of log time per batch")
+    parser.add_argument('--sink', choices=['jsonl', 'firestore'], default='jsonl', help="Where batches go")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSONL file for --sink jsonl")
+    parser.add_argument('--emulator-host', help="Firestore emulator host:port (default: $FIRESTORE_EMULATOR_HOST)")
+    parser.add_argument('--project', default=FIRESTORE_PROJECT, help="Firestore project id")
+    parser.add_argument('--ranking', default=RANKING_PATH, help="Where to write the hot ranking")
+    parser.add_argument('--top', type=int, default=50, help="Entries in the hot ranking")
+    parser.add_argument('--half-life', type=float, default=DEFAULT_HALF_LIFE / 3600, help="Ranking half-life in hours")
+    parser.add_argument('--state', default=DEFAULT_STATE, help="Read offsets and hot scores")
+    parser.add_argument('--follow', action='store_true', help="Keep reading the (single) log as it grows")
+    args = parser.parse_args()
+
+    if args.follow and len(args.logs) != 1:
+        parser.error("--follow takes exactly one log")
+
+    state_path = Path(args.state)
+    state = {"offsets": {}, "scores": {}}
+    if state_path.exists():
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+
+    if args.sink == 'firestore':
+        sink = FirestoreSink(args.emulator_host, args.project)
+    else:
+        sink = JsonlSink(args.output)
+    aggregator = ViewAggregator(sink, args.window, args.half_life * 3600, state['scores'])
+
+    def save(path=None, offset=None):
+        """Offsets only move past lines whose views have been flushed"""
+        if path and offset is not None:
+            state['offsets'][os.path.abspath(path)] = [os.stat(path).st_ino, offset]
+        aggregator.forget()
+        ranking = [
+            {"route": route, "slug": slug, "score": score}
+            for route, slug, score in aggregator.hot(args.top)
+        ]
+        write_json_if_changed(args.ranking, {
+            "generatedAt": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "halfLifeHours": args.half_life,
+            "entries": ranking,
+        })
+        write_json_if_changed(state_path, state, indent=None)
+
+    with stage('aggregate') as stats:
+        for log in args.logs:
+            position = None    # offset just past the last line read
+            last_line = time.monotonic()
+
+            def on_idle():
+                # Nothing new for a whole window: don't hold the batch back
+                if aggregator.counts and time.monotonic() - last_line >= args.window:
+                    aggregator.flush()
+                    save(log, position)
+
+            for line, offset in read_log(log, state['offsets'], args.follow, on_idle=on_idle):
+                last_line = time.monotonic()
+                view = parse_log_line(line)
+                if view:
+                    flushes = aggregator.flushes
+                    aggregator.add(*view)
+                    if aggregator.flushes != flushes:
+                        save(log, position)
+                position = offset
+            aggregator.flush()
+            save(log, position)
+
+        save()
+        stats.items = aggregator.views
+        stats.extra.update(batches=aggregator.flushes, tracked=len(aggregator.scores))
+
+    print(f"✅ {aggregator.views} views in {aggregator.flushes} batch(es) "
+          f"({'Firestore emulator' if args.sink == 'firestore' else args.output})")
+    top = aggregator.hot(5)
+    if top:
+        print("🔥 Hot right now: " + ', '.join(f"/{route}/{slug}" for route, slug, _ in top))
+    print(f"📁 Ranking: {args.ranking}")
+
+
+if __name__ == "__main__":
+    main()
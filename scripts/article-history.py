@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Keep every generated revision of the article datasets in a local,
+deduplicated history store (.article-history/).
+
+Usage:
+    python article-history.py commit ../public/scripts/*.json -m "regenerate MI articles"
+    python article-history.py log
+    python article-history.py diff 3 5                      # which articles changed
+    python article-history.py diff 3 5 --slug anterior-stemi  # what changed in one
+    python article-history.py show 3 anterior-stemi
+    python article-history.py checkout 3 --output /tmp/snapshot-3   # datasets keep their repo paths
+"""
+
+import argparse
+import json
+import sys
+
+from pipeline.history import (
+    HISTORY_DIR, HistoryStore, checkout_path, dataset_key, diff_revisions, diff_snapshots, revisions_by_slug,
+)
+from pipeline.output import write_json_array
+from pipeline.telemetry import instrumented, stage
+
+
+def commit(store, args):
+    with stage('history-commit') as stats:
+        datasets = {}
+        for path in args.datasets:
+            with open(path, 'r', encoding='utf-8') as f:
+                datasets[dataset_key(path)] = json.load(f)
+        snapshot, counts = store.commit(datasets, args.message)
+        stats.items = counts['articles']
+        stats.cache_hits = counts['articles'] - counts['new_revisions']
+        stats.extra.update(counts)
+
+    print(f"✅ Snapshot {snapshot['number']}: {counts['articles']} articles, "
+          f"{counts['new_revisions']} new revision(s), {counts['objects']} new object(s) "
+          f"({counts['bytes']:,} bytes)")
+
+
+def log(store, args):
+    for number in reversed(store.snapshot_numbers()):
+        snapshot = store.load_snapshot(number)
+        articles = sum(len(entries) for entries in snapshot['datasets'].values())
+        message = f"  {snapshot['message']}" if snapshot['message'] else ''
+        print(f"{number:>5}  {snapshot['time']}  {articles:>4} articles{message}")
+
+
+def diff(store, args):
+    old, new = store.load_snapshot(args.old), store.load_snapshot(args.new)
+    if args.slug:
+        before, after = revisions_by_slug(old), revisions_by_slug(new)
+        if args.slug not in before or args.slug not in after:
+            print(f"⚠️  {args.slug} is not in both snapshots")
+            sys.exit(1)
+        sys.stdout.write(diff_revisions(store, before[args.slug], after[args.slug], args.slug))
+        return
+
+    added, removed, changed = diff_snapshots(old, new)
+    for mark, slugs in (('+', added), ('-', removed), ('~', changed)):
+        for slug in slugs:
+            print(f"{mark} {slug}")
+    print(f"✅ {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+
+
+def show(store, args):
+    for entries in store.load_snapshot(args.snapshot)['datasets'].values():
+        for slug, revision, stamps in entries:
+            if slug == args.slug:
+                print(json.dumps(store.article(revision, stamps), indent=2, ensure_ascii=False))
+                return
+    print(f"⚠️  {args.slug} is not in snapshot {args.snapshot}")
+    sys.exit(1)
+
+
+def checkout(store, args):
+    with stage('history-checkout') as stats:
+        snapshot = store.load_snapshot(args.snapshot)
+        for name, articles in store.checkout(snapshot).items():
+            path = checkout_path(args.output, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stats.items += write_json_array(path, articles)
+            stats.add_file(path)
+
+    print(f"✅ Snapshot {snapshot['number']}: {stats.items} articles in {len(snapshot['datasets'])} dataset(s)")
+    print(f"📁 Saved to: {args.output}")
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Versioned history of generated articles")
+    parser.add_argument('--store', default=HISTORY_DIR, help="History directory")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    commit_parser = sub.add_parser('commit', help="Record a snapshot of generated datasets")
+    commit_parser.add_argument('datasets', nargs='+', help="Generated article JSON files")
+    commit_parser.add_argument('-m', '--message', default='', help="Note to keep with the snapshot")
+    sub.add_parser('log', help="List snapshots, newest first")
+    diff_parser = sub.add_parser('diff', help="Compare two snapshots")
+    diff_parser.add_argument('old', type=int)
+    diff_parser.add_argument('new', type=int)
+    diff_parser.add_argument('--slug', help="Show a unified diff of one article")
+    show_parser = sub.add_parser('show', help="Print one article from a snapshot")
+    show_parser.add_argument('snapshot', type=int)
+    show_parser.add_argument('slug')
+    checkout_parser = sub.add_parser('checkout', help="Write a snapshot's datasets back out")
+    checkout_parser.add_argument('snapshot', type=int, help="Snapshot number (-1 for the latest)")
+    checkout_parser.add_argument('--output', required=True, help="Directory to write the datasets to")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.store)
+    try:
+        {'commit': commit, 'log': log, 'diff': diff, 'show': show, 'checkout': checkout}[args.command](store, args)
+    except LookupError as e:
+        print(f"⛔ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Collect the frontmatter of every content/articles/*.mdx file into
+content/articles-manifest.json, which the blog listing and tag pages read
+instead of parsing each article.
+
+Only files whose mtime, size or hash changed since the last run are parsed.
+
+Usage:
+    python build-article-manifest.py
+    python build-article-manifest.py --full   # ignore the existing manifest
+"""
+
+import argparse
+
+from pipeline.manifest import MANIFEST_PATH, load_manifest, refresh_manifest, write_manifest
+from pipeline.mdx import ARTICLES_DIR
+from pipeline.telemetry import instrumented, stage
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Build the article frontmatter manifest")
+    parser.add_argument('--articles-dir', default=ARTICLES_DIR, help="Directory of .mdx articles")
+    parser.add_argument('--output', default=MANIFEST_PATH, help="Manifest to write")
+    parser.add_argument('--workers', type=int, help="Parallel file readers")
+    parser.add_argument('--full', action='store_true', help="Re-read every file")
+    args = parser.parse_args()
+
+    with stage('manifest') as stats:
+        previous = {} if args.full else load_manifest(args.output)
+        entries, counts = refresh_manifest(previous, args.articles_dir, args.workers)
+        written = write_manifest(entries, args.output)
+        stats.items = len(entries)
+        stats.cache_hits = counts['unchanged'] + counts['touched']
+        stats.extra.update(counts)
+        if written:
+            stats.add_file(args.output)
+
+    print(f"✅ {len(entries)} articles: {counts['parsed']} parsed, {counts['unchanged']} unchanged, "
+          f"{counts['touched']} touched, {counts['removed']} removed")
+    print(f"📁 {'Saved to' if written else 'Up to date'}: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
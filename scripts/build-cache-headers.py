@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Hash every hosted file and write cache header rules into firebase.json:
+immutable for /_next/static, and one glob per top-level directory and file
+type for everything else, with a short TTL (longer once every file in the
+group has been unchanged for a week). Change dates are kept in
+scripts/hosting-hashes.json (gitignored).
+
+Run after the site build (so /_next/static and the exported pages exist) and
+before `firebase deploy`.
+
+Usage:
+    python build-cache-headers.py              # hosting root from firebase.json (out/)
+    python build-cache-headers.py --root ../public
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from pipeline.hosting import header_rules, merge_firebase_headers, write_json_if_changed
+from pipeline.telemetry import instrumented, stage
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG = REPO_DIR / 'firebase.json'
+DEFAULT_STATE = Path(__file__).resolve().parent / 'hosting-hashes.json'
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Generate hosting cache headers from content hashes")
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help="firebase.json to update")
+    parser.add_argument('--root', help="Directory being hosted (default: hosting.public, or public/ if not built)")
+    parser.add_argument('--state', default=DEFAULT_STATE, help="Hash history used to tell stable files from fresh ones")
+    parser.add_argument('--dry-run', action='store_true', help="Print the rules instead of writing them")
+    args = parser.parse_args()
+
+    config_path = Path(args.config)
+    config = json.loads(config_path.read_text(encoding='utf-8'))
+    root = Path(args.root) if args.root else config_path.parent / config['hosting']['public']
+    if not args.root and not root.is_dir():
+        root = REPO_DIR / 'public'
+        print(f"⚠️  {config['hosting']['public']}/ has not been built; using {root}")
+
+    state_path = Path(args.state)
+    state = {"generated": [], "files": {}}
+    if state_path.exists():
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+
+    with stage('headers') as stats:
+        rules, counts = header_rules(root, state['files'])
+        stats.items = counts['immutable'] + counts['mutable']
+        stats.cache_hits = counts['mutable'] - counts['changed']
+        stats.extra.update(counts)
+
+        if args.dry_run:
+            print(json.dumps(rules, indent=2))
+            return
+
+        merge_firebase_headers(config, rules, state['generated'])
+        state['generated'] = [rule['source'] for rule in rules]
+        written = write_json_if_changed(config_path, config)
+        write_json_if_changed(state_path, state, indent=None)
+        if written:
+            stats.add_file(config_path)
+
+    print(f"✅ {len(rules)} header rules: {counts['immutable']} immutable files, {counts['mutable']} mutable "
+          f"in {counts['groups']} groups ({counts['changed']} changed since last run)")
+    print(f"📁 {'Updated' if written else 'Up to date'}: {config_path}")
+
+
+if __name__ == "__main__":
+    main()
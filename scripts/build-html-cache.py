@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Parse every content/articles/*.mdx body, and the Markdown content of the
+generated datasets (generate-ecg-articles.py and friends, public/scripts/),
+once into .markdown-cache/, keyed by content hash and remark versions, so
+lib/articles.ts can use the pre-rendered HTML instead of running remark on
+each build. Unchanged bodies are cache hits; entries for bodies that no
+longer exist are removed. A converted dataset article (convert-json-to-mdx.js)
+whose body is unchanged hits the entry its dataset Markdown produced.
+
+Usage:
+    python build-html-cache.py
+    python build-html-cache.py --full   # re-parse everything
+    python build-html-cache.py --datasets ../public/scripts/ecg-articles-clean-rhythm.json
+"""
+
+import argparse
+import shutil
+from pathlib import Path
+
+from pipeline.generator import published_datasets
+from pipeline.mdx import ARTICLES_DIR, mdx_files, mdx_slug, read_mdx
+from pipeline.output import iter_json_array
+from pipeline.rendercache import CACHE_DIR, prune, render_cached, renderer_id
+from pipeline.slugs import article_slug
+from pipeline.telemetry import instrumented, stage
+
+
+def bodies(articles_dir, datasets):
+    """(label, Markdown body) of every MDX article and generated article"""
+    for path in mdx_files(articles_dir):
+        yield mdx_slug(path), read_mdx(path)[1]
+    for dataset in datasets:
+        for article in iter_json_array(dataset):
+            if isinstance(article.get('content'), str):
+                yield f"{dataset.name}: {article_slug(article)}", article['content']
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render article Markdown into the HTML cache")
+    parser.add_argument('--articles-dir', default=ARTICLES_DIR, help="Directory of .mdx articles")
+    parser.add_argument(
+        '--datasets',
+        nargs='*',
+        default=published_datasets(),
+        help="Generated article datasets (default: public/scripts/*.json)",
+    )
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Where cache entries are written")
+    parser.add_argument('--full', action='store_true', help="Drop the cache and parse every article")
+    args = parser.parse_args()
+
+    if args.full:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+
+    renderer = renderer_id()
+    counts = {"hit": 0, "parsed": 0, "unsupported": 0}
+    unsupported = []
+    keys = set()
+    with stage('render') as stats:
+        for label, body in bodies(args.articles_dir, [Path(d) for d in args.datasets]):
+            status, key = render_cached(body, renderer, args.cache_dir)
+            counts[status] += 1
+            keys.add(key)
+            if status == 'unsupported':
+                unsupported.append(label)
+        removed = prune(keys, args.cache_dir)
+        stats.items = sum(counts.values())
+        stats.cache_hits = counts['hit']
+        stats.extra.update(counts, removed=removed)
+
+    print(f"✅ {stats.items} bodies ({renderer}): {counts['parsed']} parsed, {counts['hit']} cached")
+    if unsupported:
+        print(f"⚠️  {len(unsupported)} use Markdown the cache does not cover (rendered by remark):")
+        for label in unsupported:
+            print(f"   - {label}")
+    if removed:
+        print(f"🧹 Removed {removed} outdated entr{'y' if removed == 1 else 'ies'}")
+    print(f"📁 Cache: {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
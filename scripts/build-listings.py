@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Write pre-sorted listing pages (newest, featured, per category, per tag) of
+article cards to public/listings/, with cursor tokens for paging. Pages whose
+contents did not change are left alone.
+
+Usage:
+    python build-listings.py
+    python build-listings.py --page-size 24
+"""
+
+import argparse
+
+from pipeline.generator import published_datasets
+from pipeline.listings import LISTINGS_DIR, PAGE_SIZE, article_categories, build_lists, write_listings
+from pipeline.manifest import load_manifest, manifest_fingerprint, refresh_manifest
+from pipeline.mdx import ARTICLES_DIR
+from pipeline.telemetry import instrumented, stage
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Build precomputed article listing pages")
+    parser.add_argument('--articles-dir', default=ARTICLES_DIR, help="Directory of .mdx articles")
+    parser.add_argument('--output', default=LISTINGS_DIR, help="Directory to write listing pages to")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help="Cards per page")
+    args = parser.parse_args()
+
+    with stage('listings') as stats:
+        # The frontmatter manifest (if built) saves re-reading unchanged articles
+        entries, _ = refresh_manifest(load_manifest(), args.articles_dir)
+        categories = article_categories(published_datasets())
+        lists = build_lists(entries, categories)
+        counts = write_listings(lists, args.output, args.page_size, manifest_fingerprint(entries))
+        stats.items = counts['written'] + counts['unchanged']
+        stats.cache_hits = counts['unchanged']
+        stats.extra.update(counts, lists=len(lists))
+
+    print(f"✅ {len(lists)} lists from {len(entries)} articles: {counts['written']} page(s) written, "
+          f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+    print(f"📁 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
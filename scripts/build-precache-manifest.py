@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Write the offline video shards and public/precache-manifest.json, the list
+of article pages, images and shards the service worker (public/sw.js) keeps
+for offline reading.
+
+Runs before `next build` (prebuild), so the deployed site carries the
+manifest for the articles it was built from. Articles that are hot in
+scripts/hot-articles.json (aggregate-views.py) are precached first.
+
+Usage:
+    python build-precache-manifest.py
+    python build-precache-manifest.py --budget-mb 4 --ranking hot-articles.json
+"""
+
+import argparse
+import json
+
+from pipeline.generator import published_datasets
+from pipeline.listings import article_categories
+from pipeline.manifest import load_manifest, refresh_manifest
+from pipeline.mdx import ARTICLES_DIR
+from pipeline.output import atomic_open
+from pipeline.precache import (
+    DEFAULT_BUDGET, MANIFEST_PATH, OFFLINE_DIR, ShardWriter, article_candidates, build_manifest, hot_bonuses,
+    select, video_candidates,
+)
+from pipeline.telemetry import instrumented, stage
+from pipeline.views import RANKING_PATH, load_ranking
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Build the service-worker precache manifest")
+    parser.add_argument(
+        '--budget-mb',
+        type=float,
+        default=DEFAULT_BUDGET / 1024 / 1024,
+        help="Maximum bytes to precache, in MB (default: %(default)s)",
+    )
+    parser.add_argument('--articles-dir', default=ARTICLES_DIR, help="Directory of .mdx articles")
+    parser.add_argument('--ranking', default=RANKING_PATH, help="Hot ranking from aggregate-views.py")
+    parser.add_argument('--output', default=MANIFEST_PATH, help="Manifest to write")
+    args = parser.parse_args()
+    budget = int(args.budget_mb * 1024 * 1024)
+
+    with stage('precache') as stats:
+        entries, _ = refresh_manifest(load_manifest(), args.articles_dir)
+        categories = article_categories(published_datasets())
+        ranking = load_ranking(args.ranking)
+        bonuses = hot_bonuses(ranking)
+        video_shards = ShardWriter(OFFLINE_DIR / 'videos')
+
+        candidates = list(article_candidates(entries, categories, bonuses))
+        candidates += video_candidates(video_shards, bonuses)
+        removed = video_shards.prune()
+
+        selected, skipped = select(candidates, budget)
+        manifest = build_manifest(selected, budget)
+        with atomic_open(args.output) as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+
+        stats.items = len(selected)
+        stats.bytes = manifest['bytes']
+        stats.extra.update(skipped=len(skipped), removed_shards=removed, hot=len(ranking))
+
+    kinds = {}
+    for entry in selected:
+        kinds[entry['kind']] = kinds.get(entry['kind'], 0) + 1
+    summary = ', '.join(f"{count} {kind}" for kind, count in sorted(kinds.items()))
+    print(f"✅ Precaching {len(selected)} entries ({summary}): "
+          f"{manifest['bytes'] / 1024 / 1024:.1f} of {budget / 1024 / 1024:.1f} MB")
+    if skipped:
+        print(f"   {len(skipped)} lower-priority entries left out by the budget")
+    if not ranking:
+        print(f"   No hot ranking at {args.ranking}; ranked by featured flag and category only")
+    if removed:
+        print(f"🧹 Removed {removed} outdated shard(s)")
+    print(f"📁 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
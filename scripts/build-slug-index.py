@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Build lib/slug-index.json: a Bloom filter of every valid blog and video
+slug, and a perfect-hash redirect table from legacy blog URLs (the
+canonicalUrl the v2 and best-images generators build from the condition
+name) to the slugs the articles are actually published under.
+
+middleware.ts uses it to 404 unknown slugs and redirect legacy ones without
+reaching the data layer. Re-run after generating articles or adding videos;
+`npm run build` runs this with --check first and fails if the committed
+index is stale. Either way, a legacy URL that two articles claim as their
+canonicalUrl is an error: fix the dataset so only one of them points there.
+
+Usage:
+    python build-slug-index.py
+    python build-slug-index.py --check
+    python build-slug-index.py ../public/scripts/ecg-blog-articles-v2.json --output ../lib/slug-index.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from pipeline.generator import published_datasets
+from pipeline.mdx import ARTICLES_DIR, mdx_files, mdx_slug
+from pipeline.slugindex import (
+    INDEX_PATH, build_slug_index, index_text, perfect_hash_lookup, site_keys, sources_fingerprint,
+)
+from pipeline.telemetry import instrumented, stage
+from pipeline.videos import VIDEOS_DIR
+
+
+def iter_articles(paths):
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+@instrumented
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the slug filter and legacy redirect table")
+    parser.add_argument(
+        'datasets',
+        nargs='*',
+        help="Generated article JSON files (default: public/scripts/*.json)",
+    )
+    parser.add_argument('--output', default=INDEX_PATH, help="Index file read by middleware.ts")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if the index is out of date instead of writing it")
+    args = parser.parse_args(argv)
+
+    datasets = args.datasets or published_datasets()
+
+    with stage('index') as stats:
+        articles = mdx_files(ARTICLES_DIR)
+        videos = sorted(p for p in VIDEOS_DIR.iterdir() if p.suffix in ('.yaml', '.yml'))
+        pages, redirects, conflicts = site_keys(
+            [mdx_slug(p) for p in articles],
+            [p.stem for p in videos],
+            iter_articles(datasets),
+        )
+        for key, kept, other in conflicts:
+            print(f"❌ {key} is claimed by {kept} and {other}")
+        if conflicts:
+            sys.exit(f"❌ {len(conflicts)} legacy URL(s) with two canonicals; point all but one at their own slug")
+
+        index = build_slug_index(pages, redirects, sources_fingerprint(articles, videos, datasets))
+        assert all(perfect_hash_lookup(index['redirects'], k) == v for k, v in redirects.items())
+        stats.items = len(pages) + len(redirects)
+
+        output = Path(args.output)
+        text = index_text(index)
+        stale = not output.exists() or output.read_text(encoding='utf-8') != text
+        if not stale:
+            stats.cache_hits = 1
+            print(f"✓ {output} is up to date")
+        elif not args.check:
+            output.write_text(text, encoding='utf-8')
+            stats.add_file(output)
+
+    if args.check and stale:
+        sys.exit(f"❌ {output} is out of date; run: python scripts/build-slug-index.py")
+    if args.check:
+        return
+
+    bloom = index['bloom']
+    print(f"✅ {len(pages)} pages in a {bloom['bits'] // 8:,}-byte Bloom filter ({bloom['hashes']} hashes)")
+    print(f"🔗 {len(redirects)} legacy redirects in {len(index['redirects']['seeds'])} buckets")
+    print(f"📁 Saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Update scripts/slug-registry.json: every blog and video slug and the source
+that owns it, across the generated datasets, content/articles and
+content/videos.
+
+Slug collisions between sources are resolved deterministically (new sources
+get a numbered suffix) or reported when a file name is involved. Generated
+articles whose stored slug or canonical URL disagrees with the registry are
+reported as drift; add-slugs-to-articles.py writes registered slugs back.
+
+The registry is committed (it records which source won each collision);
+commit it whenever this script changes it.
+
+Usage:
+    python build-slug-registry.py
+    python build-slug-registry.py --check     # exit 1 on clashes or slug drift
+    python build-slug-registry.py --prune     # forget sources that no longer exist
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from pipeline.generator import published_datasets
+from pipeline.manifest import load_manifest, refresh_manifest
+from pipeline.mdx import ARTICLES_DIR
+from pipeline.slugregistry import REGISTRY_PATH, SlugRegistry, dataset_articles, file_claims
+from pipeline.telemetry import instrumented, stage
+from pipeline.videos import VIDEOS_DIR, VideoCatalog
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Update the slug registry and report collisions and drift")
+    parser.add_argument(
+        'datasets',
+        nargs='*',
+        help="Generated article JSON files (default: public/scripts/*.json)",
+    )
+    parser.add_argument('--registry', default=REGISTRY_PATH, help="Registry file")
+    parser.add_argument('--articles-dir', default=ARTICLES_DIR, help="Directory of .mdx articles")
+    parser.add_argument('--videos-dir', default=VIDEOS_DIR, help="Directory of video YAML files")
+    parser.add_argument('--prune', action='store_true', help="Drop sources not found in this run")
+    parser.add_argument('--check', action='store_true', help="Exit 1 on unresolved clashes or slug drift")
+    parser.add_argument('--verbose', '-v', action='store_true', help="List every drifted field")
+    args = parser.parse_args()
+
+    datasets = args.datasets or published_datasets()
+    registry = SlugRegistry.load(args.registry)
+
+    with stage('registry') as stats:
+        entries, _ = refresh_manifest(load_manifest(), args.articles_dir)
+        catalog = VideoCatalog(args.videos_dir)
+        catalog.refresh()
+        claims = file_claims(entries, catalog.videos)
+        articles = list(dataset_articles(datasets))
+
+        changed = registry.resolve(claims, articles)
+        pruned = registry.prune() if args.prune else 0
+
+        drift = []
+        for path, article in articles:
+            source = registry.article_source(path, article)
+            drift += [(Path(path).name, source, article['title'], field, value)
+                      for field, value in registry.drift(source, article)]
+
+        written = registry.save(args.registry)
+        stats.items = len(claims) + len(articles)
+        stats.cache_hits = stats.items - changed
+        stats.extra.update(changed=changed, pruned=pruned, collisions=len(registry.collisions), drift=len(drift))
+        if written:
+            stats.add_file(args.registry)
+
+    for collision in registry.collisions:
+        if collision['assigned']:
+            print(f"🔗 {collision['key']} belongs to {collision['holder']}; "
+                  f"{collision['source']} gets {collision['assigned']}")
+        else:
+            print(f"⛔ {collision['key']} is claimed by {collision['holder']} and {collision['source']}")
+    for source, origins in registry.duplicates:
+        print(f"⚠️  {source} appears in {', '.join(origins)}")
+
+    slug_drift = [d for d in drift if d[3] == 'slug']
+    url_drift = len(drift) - len(slug_drift)
+    for name, source, title, field, value in (drift if args.verbose else slug_drift):
+        print(f"⚠️  {name}: {title!r} has {field} {value!r}, registered {registry.slug_for(source)!r}")
+    if url_drift and not args.verbose:
+        print(f"⚠️  {url_drift} canonical URL(s) differ from the registered slug (-v to list)")
+
+    print(f"✅ {len(registry.sources)} sources, {len(registry.slugs)} slugs: {changed} registered or moved, "
+          f"{len(registry.collisions)} collision(s), {pruned} pruned")
+    print(f"📁 {'Saved to' if written else 'Up to date'}: {args.registry}")
+
+    unresolved = [c for c in registry.collisions if not c['assigned']]
+    if args.check and (unresolved or slug_drift):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
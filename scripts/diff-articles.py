@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compare generated article datasets with the last published snapshot and
+write a minimal Firestore change set as NDJSON.
+
+Usage:
+    python diff-articles.py ../public/scripts/ecg-blog-articles-v2.json ../public/scripts/mi-ecg-articles.json
+    python diff-articles.py ... --commit-snapshot   # after the change set has been applied
+
+Without a snapshot every article is an insert. If the datasets were already
+uploaded through /upload-articles, run once with --commit-snapshot (and
+discard the change set) to start from what is live.
+"""
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+
+from pipeline.changeset import COLLECTION, PROJECT_ID, diff_articles
+from pipeline.telemetry import instrumented, stage
+
+DEFAULT_SNAPSHOT = Path(__file__).resolve().parent / 'published-snapshot.json'
+
+
+def iter_articles(paths):
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Build a minimal Firestore change set for generated articles")
+    parser.add_argument('datasets', nargs='+', help="Generated article JSON files")
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, help="Field-hash snapshot of the last publish")
+    parser.add_argument('--output', default='article-changes.ndjson', help="NDJSON change set to write")
+    parser.add_argument('--project', default=PROJECT_ID, help="Firestore project id used in document names")
+    parser.add_argument('--collection', default=COLLECTION, help="Target collection")
+    parser.add_argument(
+        '--commit-snapshot',
+        action='store_true',
+        help="Save the new snapshot (run once the change set has been applied)",
+    )
+    args = parser.parse_args()
+
+    snapshot_path = Path(args.snapshot)
+    snapshot = {}
+    if snapshot_path.exists():
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+    counts = Counter()
+    articles = Counter()
+
+    def counted(items):
+        for item in items:
+            articles['seen'] += 1
+            yield item
+
+    with stage('diff') as stats, open(args.output, 'w', encoding='utf-8') as out:
+        changes = diff_articles(snapshot, counted(iter_articles(args.datasets)), args.project, args.collection)
+        for op, slug, write in changes:
+            out.write(json.dumps(write, ensure_ascii=False) + '\n')
+            counts[op] += 1
+            print(f"  {op:<6} {slug}")
+        out.flush()
+        stats.items = articles['seen']
+        # Articles that matched the snapshot need no write
+        stats.cache_hits = articles['seen'] - counts['insert'] - counts['update']
+        stats.add_file(args.output)
+        stats.extra.update(counts)
+
+    total = sum(counts.values())
+    print(f"\n✅ {total} writes: {counts['insert']} inserts, {counts['update']} updates, {counts['delete']} deletes")
+    print(f"📁 Saved to: {args.output}")
+
+    if args.commit_snapshot:
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        print(f"📌 Snapshot updated: {snapshot_path}")
+
+
+if __name__ == "__main__":
+    main()
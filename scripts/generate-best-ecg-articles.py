@@ -4,9 +4,14 @@ Generates comprehensive, beautifully formatted articles with ECG images
 Author: Dr. Raj K, Emergency Medicine Physician
 """
 
-import json
 from datetime import datetime
 
+from pipeline.generator import ArticleTally, build_parser, load_catalog, write_articles
+from pipeline.records import ECG_CONDITION_FIELDS
+from pipeline.scripts import load_script
+from pipeline.slugs import create_slug
+from pipeline.telemetry import instrumented
+
 # All ECG conditions from best_ecg_images folder
 ecg_conditions = [
     {
@@ -454,13 +459,28 @@ def generate_comprehensive_content(ecg):
     
     return content
 
-def generate_all_articles():
-    """Generate all articles as JSON with rich snippets for SEO"""
-    articles = []
-    
-    for ecg in ecg_conditions:
+def v2_page_urls():
+    """Legacy /blog/<condition> URLs generate-ecg-articles-v2.py already points at"""
+    v2 = load_script('generate-ecg-articles-v2.py')
+    return {f"https://ecgkid.com/blog/{ecg['name'].lower().replace(' ', '-')}" for ecg in v2.ecg_conditions}
+
+def canonical_url(ecg, title, claimed):
+    """
+    Canonical URL: the legacy /blog/<condition> URL, unless the v2 article on
+    the same condition owns it; a legacy URL redirects to a single page
+    (build-slug-index.py --check fails otherwise).
+    """
+    legacy = f"https://ecgkid.com/blog/{ecg['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}"
+    return f"https://ecgkid.com/blog/{create_slug(title)}" if legacy in claimed else legacy
+
+def generate_articles(conditions):
+    """Generate articles one at a time, with rich snippets for SEO"""
+    claimed = v2_page_urls()
+    for ecg in conditions:
+        title = f"{ecg['name']}: Advanced ECG Recognition and Emergency Management"
+        url = canonical_url(ecg, title, claimed)
         article = {
-            "title": f"{ecg['name']}: Advanced ECG Recognition and Emergency Management",
+            "title": title,
             "excerpt": f"Comprehensive expert guide to {ecg['name']} by Dr. Raj K. Learn diagnostic ECG criteria, emergency management, clinical pitfalls, and evidence-based treatment strategies.",
             "content": generate_comprehensive_content(ecg),
             "imageUrl": f"/best_ecg_images/{ecg['filename']}",
@@ -497,7 +517,7 @@ def generate_all_articles():
                 "image": f"https://ecgkid.com/best_ecg_images/{ecg['filename']}",
                 "mainEntityOfPage": {
                     "@type": "WebPage",
-                    "@id": f"https://ecgkid.com/blog/{ecg['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}"
+                    "@id": url
                 },
                 "about": {
                     "@type": "MedicalCondition",
@@ -528,7 +548,7 @@ def generate_all_articles():
                 "metaTitle": f"{ecg['name']}: Expert ECG Guide | Dr. Raj K | E-PulsePoints",
                 "metaDescription": f"Expert emergency medicine guide to {ecg['name']} by Dr. Raj K. ECG criteria, emergency protocols, treatment algorithms, and clinical pearls.",
                 "keywords": ecg['tags'],
-                "canonicalUrl": f"https://ecgkid.com/blog/{ecg['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}",
+                "canonicalUrl": url,
                 "ogTitle": f"{ecg['name']}: Advanced ECG & Emergency Management",
                 "ogDescription": f"Expert guide by Dr. Raj K: {ecg['significance'][:150]}",
                 "ogImage": f"https://ecgkid.com/best_ecg_images/{ecg['filename']}",
@@ -538,18 +558,27 @@ def generate_all_articles():
                 "twitterImage": f"https://ecgkid.com/best_ecg_images/{ecg['filename']}"
             }
         }
-        articles.append(article)
-    
-    return articles
+        yield article
 
-if __name__ == "__main__":
-    articles = generate_all_articles()
+def generate_all_articles():
+    """Generate all articles for the built-in catalog as a list"""
+    return list(generate_articles(ecg_conditions))
+
+def builtin_records():
+    """Built-in condition catalog"""
+    return iter(ecg_conditions)
+
+@instrumented
+def main(argv=None):
+    """Generate the dataset and print a summary"""
+    args = build_parser("Generate ECG blog articles from the best_ecg_images folder", "ecg-blog-best-images.json").parse_args(argv)
+    conditions, errors = load_catalog(args, builtin_records(), ECG_CONDITION_FIELDS)
     
-    output_file = "ecg-blog-best-images.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
+    output_file = args.output
+    tally = ArticleTally()
+    article_count = write_articles(args, tally.track(generate_articles(conditions)))
     
-    print(f"\n✓ Generated {len(articles)} comprehensive ECG blog articles from best_ecg_images folder")
+    print(f"\n✓ Generated {article_count} comprehensive ECG blog articles from best_ecg_images folder")
     print(f"✓ Saved to: {output_file}")
     print(f"\nAll articles authored by Dr. Raj K, Emergency Medicine Physician")
     print(f"\nEach article includes:")
@@ -564,6 +593,11 @@ if __name__ == "__main__":
     print(f"  - Common pitfalls and how to avoid them")
     print(f"  - Detailed patient education guidance")
     print(f"\nReady for Firebase 'blog' collection upload!")
-    print(f"\nCategories: {len(set([article['category'] for article in articles]))} unique (Clinical, Education)")
-    print(f"Tags: {len(set([tag for article in articles for tag in article['tags']]))} unique tags for filtering")
+    print(f"\nCategories: {len(tally.categories)} unique (Clinical, Education)")
+    print(f"Tags: {len(tally.tags)} unique tags for filtering")
     print(f"\nFeatured articles: AFib RVR, AWMI, Monomorphic VT, WPW Syndrome")
+    if errors.count:
+        print(f"\n⚠️  Skipped {errors.count} malformed catalog rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Generate "X vs Y" comparison articles for the conditions learners confuse most.
+
+Every ECG condition and MI type in the other generators' catalogs is scored
+against the rest by shared features, tags and listed differentials; only the
+top-k partners of each entry get a page, so output grows with the catalog
+instead of with the number of possible pairs.
+"""
+
+import html
+import re
+from datetime import datetime
+
+from pipeline.generator import build_parser, load_catalog, positive_int, write_articles
+from pipeline.records import ECG_CONDITION_FIELDS
+from pipeline.scripts import load_script
+from pipeline.similarity import mention_links, term_counts, tfidf_vectors, tokenize, top_k_pairs
+from pipeline.slugs import create_slug
+from pipeline.telemetry import instrumented, stage
+
+DEFAULT_TOP_K = 3
+DEFAULT_MIN_SCORE = 0.12
+DIFFERENTIAL_BONUS = 0.25
+
+# Field weights for the similarity vectors
+FEATURE_WEIGHT = 2
+TAG_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+NAME_WORD = re.compile(r"\w+")
+
+AUTHOR = {
+    "name": "Dr. Raj K",
+    "title": "Emergency Medicine Physician",
+    "avatar": "https://ui-avatars.com/api/?name=Dr+Raj+K&background=dc2626&color=fff&size=200&bold=true"
+}
+
+
+def base_name(name):
+    """Condition name without its parenthetical abbreviation"""
+    return re.sub(r'\s*\([^)]*\)', '', name).strip()
+
+
+def rhythm_profile(ecg, image_dir, differentials=""):
+    name = base_name(ecg['name'])
+    abbreviations = re.findall(r'\(([^)]+)\)', ecg['name'])
+    return {
+        "key": name.lower(),
+        "name": name,
+        "image": f"/{image_dir}/{ecg['filename']}",
+        "aliases": [name] + [a for a in abbreviations if len(a) > 1],
+        "features": ecg['features'],
+        "tags": ecg['tags'],
+        "rows": [
+            ("Heart rate", ecg['rate']),
+            ("Key ECG features", ecg['features']),
+            ("Clinical significance", ecg['significance']),
+            ("Management", ecg['management']),
+        ],
+        "text": ' '.join([ecg['significance'], ecg['management'], differentials]),
+    }
+
+
+def mi_profile(mi_type, mi_data, image):
+    name = mi_data['title_base']
+    return {
+        "key": name.lower(),
+        "name": name,
+        "image": f"/MI_ecg_database/{mi_type}/{image}",
+        "aliases": [name, mi_data['short_name']],
+        "features": mi_data['ecg_criteria'],
+        "tags": [mi_data['short_name'], "STEMI", "myocardial infarction", mi_data['artery']],
+        "rows": [
+            ("Leads", mi_data['leads']),
+            ("Culprit artery", mi_data['artery']),
+            ("Key ECG features", mi_data['ecg_criteria']),
+            ("Complications", mi_data['complications']),
+            ("Management", mi_data['emergency_management']),
+            ("Mortality", mi_data['mortality']),
+        ],
+        "text": ' '.join([mi_data['description'], mi_data['significance'], mi_data['complications']]),
+    }
+
+
+def differential_text(name, modules):
+    """Differentials the rhythm generators list for a condition (HTML or Markdown)"""
+    clean_rhythm, v2 = modules
+    return ' '.join([clean_rhythm.get_differentials(name), v2.generate_differentials({"name": name})])
+
+
+def load_profiles(args):
+    """Profiles for every condition, de-duplicated by name (first catalog wins)"""
+    clean_rhythm = load_script('generate-ecg-articles.py')
+    v2 = load_script('generate-ecg-articles-v2.py')
+    best = load_script('generate-best-ecg-articles.py')
+    mi = load_script('generate-mi-articles.py')
+
+    sources = []
+    if args.input:
+        records, errors = load_catalog(args, [], ECG_CONDITION_FIELDS)
+        sources.append((records, 'clean_rhythm_ecg'))
+    else:
+        errors = None
+        sources.append((best.builtin_records(), 'best_ecg_images'))
+        sources.append((v2.builtin_records(), 'clean_rhythm_ecg'))
+
+    profiles = {}
+    for records, image_dir in sources:
+        for ecg in records:
+            profile = rhythm_profile(ecg, image_dir, differential_text(base_name(ecg['name']), (clean_rhythm, v2)))
+            profiles.setdefault(profile['key'], profile)
+
+    for record in mi.builtin_records():
+        images = record['images'] or mi.folder_images(record['mi_type'])
+        if images:
+            profile = mi_profile(record['mi_type'], record, images[0])
+            profiles.setdefault(profile['key'], profile)
+
+    return profiles, errors
+
+
+def is_variant(a, b):
+    """
+    True if one name is the other plus qualifiers, word for word: "Atrial
+    Fibrillation" vs "Atrial Fibrillation with RVR" is not a comparison, but
+    "Mobitz Type I" vs "Mobitz Type II" and "Ventricular Tachycardia" vs
+    "Supraventricular Tachycardia" are.
+    """
+    short, long = sorted((NAME_WORD.findall(a.lower()), NAME_WORD.findall(b.lower())), key=len)
+    return any(long[i:i + len(short)] == short for i in range(len(long) - len(short) + 1))
+
+
+def confusable_pairs(profiles, k, min_score):
+    """Top-k most similar partners of every profile, best pairs first"""
+    documents = {
+        key: term_counts(
+            [(feature, FEATURE_WEIGHT) for feature in p['features']]
+            + [(tag, TAG_WEIGHT) for tag in p['tags']]
+            + [(p['name'], TEXT_WEIGHT)]
+        )
+        for key, p in profiles.items()
+    }
+    links = mention_links(
+        {key: p['text'] for key, p in profiles.items()},
+        {key: p['aliases'] for key, p in profiles.items()},
+        DIFFERENTIAL_BONUS,
+    )
+
+    pairs = top_k_pairs(tfidf_vectors(documents), k, min_score, links, lambda a, b: not is_variant(a, b))
+    return sorted(pairs.items(), key=lambda item: (-item[1], item[0]))
+
+
+def as_html(value):
+    if isinstance(value, list):
+        return '<ul style="margin: 0; padding-left: 1.25rem;">' + ''.join(
+            f"<li>{html.escape(item)}</li>" for item in value) + '</ul>'
+    return html.escape(value)
+
+
+def split_features(a, b):
+    """(shared, only in a, only in b) by word overlap between feature lines"""
+    def words(feature):
+        return set(tokenize(feature))
+
+    shared, only_a = [], []
+    for feature in a['features']:
+        match = max(b['features'], key=lambda other: len(words(feature) & words(other)), default=None)
+        overlap = words(feature) & words(match) if match else set()
+        if match and len(overlap) * 2 >= min(len(words(feature)), len(words(match))) > 0:
+            shared.append(feature)
+        else:
+            only_a.append(feature)
+    shared_words = set().union(*map(words, shared)) if shared else set()
+    only_b = [f for f in b['features'] if not words(f) <= shared_words]
+    return shared, only_a, only_b
+
+
+def comparison_table(a, b):
+    labels = list(dict.fromkeys([label for label, _ in a['rows']] + [label for label, _ in b['rows']]))
+    values_a, values_b = dict(a['rows']), dict(b['rows'])
+    rows = ''.join(
+        f"""
+        <tr>
+            <th style="text-align: left; padding: 0.75rem; background: #f1f5f9; vertical-align: top;">{label}</th>
+            <td style="padding: 0.75rem; vertical-align: top;">{as_html(values_a.get(label, '—'))}</td>
+            <td style="padding: 0.75rem; vertical-align: top;">{as_html(values_b.get(label, '—'))}</td>
+        </tr>"""
+        for label in labels
+    )
+    return f"""
+<table style="width: 100%; border-collapse: collapse; margin: 1.5rem 0; border: 1px solid #cbd5e1;">
+    <thead>
+        <tr style="background: #1e40af; color: white;">
+            <th style="padding: 0.75rem;"></th>
+            <th style="padding: 0.75rem;">{html.escape(a['name'])}</th>
+            <th style="padding: 0.75rem;">{html.escape(b['name'])}</th>
+        </tr>
+    </thead>
+    <tbody>{rows}
+    </tbody>
+</table>"""
+
+
+def generate_comparison_content(a, b):
+    shared, only_a, only_b = split_features(a, b)
+    shared_html = as_html(shared) if shared else "<p>No ECG criteria overlap directly; the confusion usually comes from the clinical picture.</p>"
+
+    return f"""
+<div class="ecg-article">
+
+<div class="ecg-image-container" style="display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 1rem; background: linear-gradient(135deg, #1e40af 0%, #7e22ce 50%, #be185d 100%); padding: 2rem; border-radius: 1.5rem; margin-bottom: 2rem;">
+    <figure style="margin: 0;">
+        <img src="{a['image']}" alt="{html.escape(a['name'])} ECG Example" style="width: 100%; border-radius: 1rem; box-shadow: 0 20px 50px rgba(0,0,0,0.3);" />
+        <figcaption style="text-align: center; color: white; margin-top: 0.75rem; font-size: 0.875rem; font-weight: 600;">Figure 1: {html.escape(a['name'])}</figcaption>
+    </figure>
+    <figure style="margin: 0;">
+        <img src="{b['image']}" alt="{html.escape(b['name'])} ECG Example" style="width: 100%; border-radius: 1rem; box-shadow: 0 20px 50px rgba(0,0,0,0.3);" />
+        <figcaption style="text-align: center; color: white; margin-top: 0.75rem; font-size: 0.875rem; font-weight: 600;">Figure 2: {html.escape(b['name'])}</figcaption>
+    </figure>
+</div>
+
+<h2>Why These Two Get Confused</h2>
+
+<p>{html.escape(a['name'])} and {html.escape(b['name'])} share enough ECG findings that they are easy to mix up on a busy shift, yet the management of each is different. Work through the comparison below before committing to a diagnosis.</p>
+
+<h2>Side-by-Side Comparison</h2>
+{comparison_table(a, b)}
+
+<h2>What They Have in Common</h2>
+
+<div class="key-points-box" style="background: linear-gradient(135deg, #dbeafe 0%, #e0e7ff 100%); border-left: 4px solid #2563eb; padding: 1.5rem; border-radius: 1rem; margin: 1.5rem 0; color: #1e40af;">
+    {shared_html}
+</div>
+
+<h2>How to Tell Them Apart</h2>
+
+<div class="differential-box" style="background: #f8fafc; border: 2px solid #cbd5e1; padding: 1.5rem; border-radius: 1rem; margin: 1.5rem 0;">
+    <h3 style="color: #0f172a; font-weight: 700; margin-bottom: 1rem;">🔍 Points toward {html.escape(a['name'])}</h3>
+    {as_html(only_a or a['features'])}
+    <h3 style="color: #0f172a; font-weight: 700; margin: 1.5rem 0 1rem;">🔍 Points toward {html.escape(b['name'])}</h3>
+    {as_html(only_b or b['features'])}
+</div>
+
+<h2>Clinical Bottom Line</h2>
+
+<div class="summary-box" style="background: linear-gradient(135deg, #dc2626 0%, #991b1b 50%, #7f1d1d 100%); padding: 2rem; border-radius: 1rem; color: white; margin: 2rem 0;">
+    <p style="margin-bottom: 1rem;">Use a systematic approach - rate, rhythm, P waves, PR interval, QRS width and ST-T changes - and look specifically for the distinguishing findings above.</p>
+    <p style="margin: 0;">When the tracing is equivocal, compare with old ECGs, correlate with the clinical presentation and involve cardiology early.</p>
+</div>
+
+<h2>About the Author</h2>
+
+<div class="author-bio" style="background: #f8fafc; border-left: 4px solid #3b82f6; padding: 1.5rem; border-radius: 1rem; margin-top: 2rem;">
+    <h3 style="color: #1e40af; font-weight: 800; margin-bottom: 0.5rem;">Dr. Raj K</h3>
+    <p style="color: #475569; font-weight: 600; margin-bottom: 1rem;">Emergency Medicine Physician</p>
+    <p style="color: #64748b; margin: 0;">Dr. Raj K is a board-certified Emergency Medicine physician who teaches practical ECG interpretation through E-PulsePoints.</p>
+</div>
+
+</div>
+"""
+
+
+def generate_articles(pairs, profiles):
+    """Generate one comparison article per pair, one at a time"""
+    for (key_a, key_b), _ in pairs:
+        a, b = profiles[key_a], profiles[key_b]
+        title = f"{a['name']} vs {b['name']}: Key ECG Differences"
+        # create_slug cuts at 100 characters, which can leave a trailing hyphen
+        slug = create_slug(title).rstrip('-')
+        description = f"Side-by-side ECG comparison of {a['name']} and {b['name']}: shared findings, distinguishing criteria and management differences."
+        tags = list(dict.fromkeys(
+            [a['name'], b['name'], "ECG comparison", "differential diagnosis"]
+            + [t for t in a['tags'] if t in b['tags']]
+        ))
+        yield {
+            "title": title,
+            "slug": slug,
+            "excerpt": description,
+            "content": generate_comparison_content(a, b),
+            "imageUrl": a['image'],
+            "category": "education",
+            "tags": tags,
+            "author": AUTHOR,
+            "publishedAt": datetime.now().isoformat(),
+            "updatedAt": datetime.now().isoformat(),
+            "views": 0,
+            "featured": False,
+            "schema": {
+                "@context": "https://schema.org",
+                "@type": "MedicalWebPage",
+                "name": title,
+                "description": description,
+                "image": f"https://ecgkid.com{a['image']}",
+                "author": {
+                    "@type": "Person",
+                    "name": AUTHOR['name'],
+                    "jobTitle": AUTHOR['title']
+                },
+                "about": [
+                    {"@type": "MedicalCondition", "name": a['name']},
+                    {"@type": "MedicalCondition", "name": b['name']}
+                ],
+                "mainEntityOfPage": {
+                    "@type": "WebPage",
+                    "@id": f"https://ecgkid.com/blog/{slug}"
+                }
+            },
+            "seo": {
+                "metaTitle": f"{a['name']} vs {b['name']} | E-PulsePoints",
+                "metaDescription": description[:155],
+                "keywords": tags,
+                "canonicalUrl": f"https://ecgkid.com/blog/{slug}",
+                "ogTitle": title,
+                "ogDescription": description,
+                "ogImage": f"https://ecgkid.com{a['image']}",
+                "twitterCard": "summary_large_image",
+                "twitterTitle": f"{a['name']} vs {b['name']}",
+                "twitterDescription": description[:120],
+                "twitterImage": f"https://ecgkid.com{a['image']}"
+            }
+        }
+
+
+@instrumented
+def main(argv=None):
+    parser = build_parser("Generate X vs Y ECG comparison articles", "ecg-comparison-articles.json")
+    parser.add_argument('--top-k', type=positive_int, default=DEFAULT_TOP_K, help="Comparisons per condition")
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE, help="Minimum similarity for a pair")
+    args = parser.parse_args(argv)
+
+    with stage('pairs') as stats:
+        profiles, errors = load_profiles(args)
+        pairs = confusable_pairs(profiles, args.top_k, args.min_score)
+        stats.items = len(pairs)
+
+    all_pairs = len(profiles) * (len(profiles) - 1) // 2
+    print(f"🔍 {len(profiles)} conditions: {len(pairs)} of {all_pairs} possible pairs selected (top {args.top_k})")
+    for (a, b), score in pairs[:10]:
+        print(f"   {score:.2f}  {profiles[a]['name']} vs {profiles[b]['name']}")
+
+    article_count = write_articles(args, generate_articles(pairs, profiles))
+
+    print(f"\n✓ Generated {article_count} comparison articles")
+    print(f"✓ Saved to: {args.output}")
+    if errors and errors.count:
+        print(f"\n⚠️  Skipped {errors.count} malformed catalog rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,12 @@ Generates comprehensive, beautifully formatted articles with ECG images
 Author: Dr. Raj K, Emergency Medicine Physician
 """
 
-import json
 from datetime import datetime
 
+from pipeline.generator import ArticleTally, build_parser, load_catalog, write_articles
+from pipeline.records import ECG_CONDITION_FIELDS
+from pipeline.telemetry import instrumented
+
 # All ECG conditions from clean_rhythm_ecg folder
 ecg_conditions = [
     {
@@ -433,11 +436,9 @@ def generate_pitfalls(ecg):
     }
     return pitfalls.get(ecg['name'], "<li>Failing to correlate ECG with clinical presentation</li><li>Missing underlying reversible causes</li><li>Not consulting cardiology when uncertain</li>")
 
-def generate_all_articles():
-    """Generate all articles as JSON with rich snippets for SEO"""
-    articles = []
-    
-    for ecg in ecg_conditions:
+def generate_articles(conditions):
+    """Generate articles one at a time, with rich snippets for SEO"""
+    for ecg in conditions:
         article = {
             "title": f"{ecg['name']}: ECG Recognition and Emergency Management",
             "excerpt": f"Comprehensive guide to recognizing and managing {ecg['name']}. Learn ECG criteria, clinical significance, evidence-based treatment, and common pitfalls. Written by Dr. Raj K, Emergency Medicine Physician.",
@@ -517,18 +518,27 @@ def generate_all_articles():
                 "twitterImage": f"https://ecgkid.com/clean_rhythm_ecg/{ecg['filename']}"
             }
         }
-        articles.append(article)
-    
-    return articles
+        yield article
 
-if __name__ == "__main__":
-    articles = generate_all_articles()
+def generate_all_articles():
+    """Generate all articles for the built-in catalog as a list"""
+    return list(generate_articles(ecg_conditions))
+
+def builtin_records():
+    """Built-in condition catalog"""
+    return iter(ecg_conditions)
+
+@instrumented
+def main(argv=None):
+    """Generate the dataset and print a summary"""
+    args = build_parser("Generate ECG blog articles with enhanced formatting", "ecg-blog-articles-v2.json").parse_args(argv)
+    conditions, errors = load_catalog(args, builtin_records(), ECG_CONDITION_FIELDS)
     
-    output_file = "ecg-blog-articles-v2.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
+    output_file = args.output
+    tally = ArticleTally()
+    article_count = write_articles(args, tally.track(generate_articles(conditions)))
     
-    print(f"\n✓ Generated {len(articles)} comprehensive ECG blog articles with enhanced formatting")
+    print(f"\n✓ Generated {article_count} comprehensive ECG blog articles with enhanced formatting")
     print(f"✓ Saved to: {output_file}")
     print(f"\nAll articles authored by Dr. Raj K, Emergency Medicine Physician")
     print(f"\nEach article includes:")
@@ -544,4 +554,9 @@ if __name__ == "__main__":
     print(f"  - Patient education guidance")
     print(f"\nReady for Firebase 'blog' collection upload!")
     print(f"\nCategories: Clinical, Education, Technology")
-    print(f"Tags: {len(set([tag for article in articles for tag in article['tags']]))} unique tags for filtering")
+    print(f"Tags: {len(tally.tags)} unique tags for filtering")
+    if errors.count:
+        print(f"\n⚠️  Skipped {errors.count} malformed catalog rows")
+
+if __name__ == "__main__":
+    main()
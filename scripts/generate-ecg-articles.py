@@ -3,9 +3,12 @@ ECG Article Generator for E-PulsePoints
 Generates comprehensive, SEO-optimized articles for all ECG conditions
 """
 
-import json
 from datetime import datetime
 
+from pipeline.generator import build_parser, load_catalog, write_articles
+from pipeline.records import ECG_CONDITION_FIELDS
+from pipeline.telemetry import instrumented
+
 # All ECG conditions from clean_rhythm_ecg folder
 ecg_conditions = [
     {
@@ -517,12 +520,12 @@ def get_author_for_condition(condition):
         "bio": "Board-certified Emergency Medicine Physician with expertise in ECG interpretation and acute cardiac care"
     }
 
-# Generate all articles as JSON
-def generate_all_articles():
-    articles = []
+# Generate articles one at a time so large catalogs stream straight to disk.
+# start is the catalog position of the first condition (the first 5 are featured).
+def generate_articles(conditions, start=0):
     timestamp = datetime.now().isoformat()
     
-    for i, ecg in enumerate(ecg_conditions):
+    for i, ecg in enumerate(conditions, start):
         article = {
             "title": f"{ecg['name']}: ECG Recognition and Clinical Management",
             "excerpt": f"Comprehensive guide to recognizing {ecg['name']} on ECG, understanding its clinical significance, and implementing evidence-based management strategies.",
@@ -536,19 +539,27 @@ def generate_all_articles():
             "featured": i < 5,  # First 5 are featured
             "author": get_author_for_condition(ecg['name']),
         }
-        articles.append(article)
-    
-    return articles
+        yield article
+
+# Generate all articles for the built-in catalog as a list
+def generate_all_articles():
+    return list(generate_articles(ecg_conditions))
+
+def builtin_records():
+    """Built-in condition catalog"""
+    return iter(ecg_conditions)
 
 # Save to JSON file
-if __name__ == "__main__":
-    articles = generate_all_articles()
+@instrumented
+def main(argv=None):
+    """Generate the dataset and print a summary"""
+    args = build_parser("Generate SEO-optimized ECG articles in Markdown", "ecg-articles-clean-rhythm.json").parse_args(argv)
+    conditions, errors = load_catalog(args, builtin_records(), ECG_CONDITION_FIELDS)
     
-    with open('ecg-articles-clean-rhythm.json', 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
+    article_count = write_articles(args, generate_articles(conditions))
     
-    print(f"✓ Generated {len(articles)} comprehensive ECG articles")
-    print("✓ Saved to: ecg-articles-clean-rhythm.json")
+    print(f"✓ Generated {article_count} comprehensive ECG articles")
+    print(f"✓ Saved to: {args.output}")
     print("\nYou can import this JSON file directly into Firebase Firestore!")
     print("Each article includes:")
     print("  - Comprehensive medical content (2000+ words)")
@@ -556,3 +567,8 @@ if __name__ == "__main__":
     print("  - Clinical significance and management")
     print("  - Evidence-based guidelines")
     print("  - Case scenarios and teaching points")
+    if errors.count:
+        print(f"\n⚠️  Skipped {errors.count} malformed catalog rows")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
-import json
 import os
 from datetime import datetime
+from pathlib import Path
+
+from pipeline.generator import build_parser, load_catalog, write_articles
+from pipeline.records import MI_TYPE_FIELDS
+from pipeline.slugs import create_slug
+from pipeline.telemetry import instrumented
 
 # MI Types with their folder paths and descriptions
 mi_types = {
@@ -84,12 +89,14 @@ mi_types = {
     }
 }
 
-def create_slug(title):
-    """Convert title to URL-friendly slug"""
-    slug = title.lower()
-    slug = slug.replace(':', '').replace('(', '').replace(')', '').replace(',', '')
-    slug = slug.replace(' ', '-').replace('--', '-')
-    return slug.strip('-')[:100]
+MI_IMAGE_DIR = Path(__file__).resolve().parent.parent / 'public' / 'MI_ecg_database'
+
+def folder_images(mi_type):
+    """Images on disk for an MI type, used when the catalog lists none"""
+    folder = MI_IMAGE_DIR / mi_type
+    if not folder.is_dir():
+        return []
+    return sorted(p.name for p in folder.iterdir() if p.suffix.lower() in ('.png', '.jpg', '.jpeg', '.webp'))
 
 def create_mi_article(mi_type, mi_data, article_num):
     """Create a comprehensive MI article"""
@@ -103,7 +110,7 @@ def create_mi_article(mi_type, mi_data, article_num):
     title = mi_data['title_base'] + title_suffix
     
     # Select images for this article
-    available_images = mi_data['images']
+    available_images = mi_data['images'] or folder_images(mi_type)
     if article_num == 1 and len(available_images) >= 3:
         selected_images = available_images[:3]
     elif article_num == 2 and len(available_images) >= 3:
@@ -454,30 +461,47 @@ def create_mi_article(mi_type, mi_data, article_num):
     
     return article
 
-# Generate articles
-all_articles = []
-
-print("🚨 Generating MI ECG Articles...\n")
-
-for mi_type, mi_data in mi_types.items():
-    print(f"📊 Creating 2 articles for {mi_data['short_name']}...")
-    
-    for i in range(1, 3):  # Create 2 articles per MI type
-        article = create_mi_article(mi_type, mi_data, i)
-        all_articles.append(article)
-        print(f"   ✅ Article {i}: {article['title'][:60]}...")
-
-# Save to JSON file
-output_file = '../public/scripts/mi-ecg-articles.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(all_articles, f, indent=2, ensure_ascii=False)
-
-print(f"\n✅ Successfully generated {len(all_articles)} MI articles!")
-print(f"📁 Saved to: {output_file}")
-print(f"\n📈 Summary:")
-print(f"   • Total articles: {len(all_articles)}")
-print(f"   • MI types covered: {len(mi_types)}")
-print(f"   • Articles per type: 2")
-print(f"\n🎯 MI Types Covered:")
-for mi_type, mi_data in mi_types.items():
-    print(f"   • {mi_data['short_name']}")
+def builtin_records():
+    """Built-in MI catalog as flat records (mi_type is the image folder)"""
+    return ({"mi_type": mi_type, **mi_data} for mi_type, mi_data in mi_types.items())
+
+def generate_articles(records):
+    """Generate 2 articles per MI type, one at a time"""
+    for record in records:
+        for i in range(1, 3):
+            yield create_mi_article(record['mi_type'], record, i)
+
+@instrumented
+def main(argv=None):
+    args = build_parser("Generate MI ECG articles", '../public/scripts/mi-ecg-articles.json').parse_args(argv)
+    records, errors = load_catalog(args, builtin_records(), MI_TYPE_FIELDS)
+    covered = []
+
+    def render():
+        for record in records:
+            print(f"📊 Creating 2 articles for {record['short_name']}...")
+            covered.append(record['short_name'])
+            for i, article in enumerate(generate_articles([record]), 1):
+                print(f"   ✅ Article {i}: {article['title'][:60]}...")
+                yield article
+
+    print("🚨 Generating MI ECG Articles...\n")
+
+    # Save to JSON file
+    output_file = args.output
+    article_count = write_articles(args, render())
+
+    print(f"\n✅ Successfully generated {article_count} MI articles!")
+    print(f"📁 Saved to: {output_file}")
+    print(f"\n📈 Summary:")
+    print(f"   • Total articles: {article_count}")
+    print(f"   • MI types covered: {len(covered)}")
+    print(f"   • Articles per type: 2")
+    print(f"\n🎯 MI Types Covered:")
+    for short_name in covered:
+        print(f"   • {short_name}")
+    if errors.count:
+        print(f"\n⚠️  Skipped {errors.count} malformed catalog rows")
+
+if __name__ == "__main__":
+    main()
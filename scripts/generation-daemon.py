@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Resident generation daemon and its thin client.
+
+Start the daemon once per editing session:
+    python generation-daemon.py serve
+
+Then forward commands to it instead of starting a new interpreter each time:
+    python generation-daemon.py generate mi -- --chunked --metadata
+    python generation-daemon.py article v2 "Atrial Flutter"
+    python generation-daemon.py slug "Atrial Flutter: ECG Recognition"
+    python generation-daemon.py recategorize [--apply]
+    python generation-daemon.py reload | ping | stop
+
+The client only imports the standard library it needs to talk to the socket;
+the generators, catalogs and video corpus live in the daemon process.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+DEFAULT_SOCKET = os.environ.get(
+    'PIPELINE_SOCKET',
+    os.path.join(tempfile.gettempdir(), f"epulsepoints-pipeline-{os.getuid()}.sock"),
+)
+
+
+def send(socket_path, request):
+    """Send one request and return the decoded response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident content generation daemon")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Unix socket path")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('serve', help="Run the daemon in the foreground")
+    generate = sub.add_parser('generate', help="Run a generator as if from the command line")
+    generate.add_argument('generator')
+    generate.add_argument('argv', nargs=argparse.REMAINDER, help="Arguments for the generator (after --)")
+    article = sub.add_parser('article', help="Render one catalog entry and print it as JSON")
+    article.add_argument('generator')
+    article.add_argument('name')
+    slug = sub.add_parser('slug', help="Print the slug for a title")
+    slug.add_argument('title')
+    recategorize = sub.add_parser('recategorize', help="Apply video category rules to the warm corpus")
+    recategorize.add_argument('--apply', action='store_true', help="Write changes (default is a dry run)")
+    sub.add_parser('reload', help="Re-import scripts and re-read catalogs")
+    sub.add_parser('ping', help="Check that the daemon is running")
+    sub.add_parser('stop', help="Shut the daemon down")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        from pipeline.daemon import serve
+        try:
+            serve(args.socket)
+        except RuntimeError as e:
+            sys.exit(f"❌ {e}")
+        return
+
+    request = {'cmd': 'shutdown' if args.command == 'stop' else args.command}
+    if args.command == 'generate':
+        argv = args.argv[1:] if args.argv[:1] == ['--'] else args.argv
+        request.update(generator=args.generator, argv=argv, cwd=os.getcwd())
+    elif args.command == 'article':
+        request.update(generator=args.generator, name=args.name)
+    elif args.command == 'slug':
+        request.update(title=args.title)
+    elif args.command == 'recategorize':
+        request.update(apply=args.apply)
+
+    try:
+        response = send(args.socket, request)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"No daemon listening on {args.socket} (start one with: python generation-daemon.py serve)")
+
+    if not response['ok']:
+        sys.exit(f"❌ {response['error']}")
+
+    if args.command == 'generate':
+        sys.stdout.write(response['stdout'])
+    elif args.command == 'article':
+        for title, errors in response['errors'].items():
+            print(f"⛔ {title}: {'; '.join(errors)}", file=sys.stderr)
+        print(json.dumps(response['articles'], indent=2, ensure_ascii=False))
+    elif args.command == 'slug':
+        print(response['slug'])
+    elif args.command == 'recategorize':
+        for change in response['changes']:
+            print(f"✓ {change['video']}: {change['from']} → {change['to']} ({change['reason']})")
+        verb = "applied" if response['applied'] else "pending (dry run)"
+        print(f"\nTotal fixes {verb}: {len(response['changes'])}")
+    elif args.command in ('ping', 'reload'):
+        print(f"🟢 Daemon up: {', '.join(response['generators'])}; {response['videos']} videos loaded")
+    print(f"⏱  {response['ms']} ms in daemon", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Convert generated article datasets to JSONL with a slug -> byte offset
+index, or read single articles back out of one. (Generators write the same
+files directly with --jsonl.)
+
+Usage:
+    python jsonl-articles.py ../public/scripts/ecg-blog-articles-v2.json ../public/scripts/mi-ecg-articles.json
+    python jsonl-articles.py --read ../public/scripts/mi-ecg-articles.jsonl --get anterior-wall-stemi
+    python jsonl-articles.py --read ../public/scripts/mi-ecg-articles.jsonl --list
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from pipeline.jsonl import JsonlReader, JsonlWriter, index_path
+from pipeline.output import iter_json_array
+from pipeline.telemetry import instrumented, stage
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Write or read indexed JSONL article datasets")
+    parser.add_argument('datasets', nargs='*', help="Generated article JSON files to convert")
+    parser.add_argument('--output-dir', help="Where to write the .jsonl files (default: next to each dataset)")
+    parser.add_argument('--read', metavar='JSONL', help="Indexed JSONL file to read from")
+    parser.add_argument('--get', metavar='SLUG', help="Print one article")
+    parser.add_argument('--list', action='store_true', help="List the slugs in the index")
+    args = parser.parse_args()
+
+    if args.read:
+        with JsonlReader(args.read) as reader:
+            if args.list:
+                print('\n'.join(reader.slugs()))
+            elif not args.get:
+                parser.error("--read needs --get SLUG or --list")
+            elif args.get not in reader:
+                sys.exit(f"❌ No article '{args.get}' in {args.read}")
+            else:
+                print(json.dumps(reader.get(args.get), indent=2, ensure_ascii=False))
+        return
+
+    if not args.datasets:
+        parser.error("give at least one dataset to convert (or --read)")
+
+    for path in map(Path, args.datasets):
+        output = Path(args.output_dir or path.parent) / f"{path.stem}.jsonl"
+        with stage(f"jsonl:{path.name}") as stats:
+            with JsonlWriter(output) as writer:
+                for article in iter_json_array(path):
+                    writer.write(article)
+            stats.items = len(writer.records)
+            stats.add_file(output)
+            stats.add_file(index_path(output))
+
+        print(f"✅ {len(writer.records)} articles from {path.name} → {output.name} ({index_path(output).name})")
+        if writer.duplicates:
+            print(f"⚠️  Duplicate slug(s), only the first is indexed: {', '.join(writer.duplicates)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pack generated article datasets into a dictionary-compressed store, or read
+single articles back out of one.
+
+Usage:
+    python pack-articles.py ../public/scripts/ecg-blog-articles-v2.json ../public/scripts/mi-ecg-articles.json
+    python pack-articles.py --store articles.store --get ventricular-tachycardia-ecg-interpretation
+    python pack-articles.py --store articles.store --list
+"""
+
+import argparse
+import json
+import sys
+
+from pipeline.dictstore import CODEC_ZLIB, CODEC_ZSTD, DEFAULT_DICT_SIZE, ArticleStore, build_store
+from pipeline.telemetry import instrumented, stage
+
+
+def iter_articles(paths):
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description="Pack articles into a dictionary-compressed store")
+    parser.add_argument('datasets', nargs='*', help="Generated article JSON files to pack")
+    parser.add_argument('--store', default='articles.store', help="Store file to write or read")
+    parser.add_argument('--dict-size', type=int, default=DEFAULT_DICT_SIZE, help="Dictionary size in bytes")
+    parser.add_argument('--codec', choices=['zstd', 'zlib'], help="Force a codec (default: zstd if installed)")
+    parser.add_argument('--get', metavar='SLUG', help="Print one article from the store")
+    parser.add_argument('--list', action='store_true', help="List the slugs in the store")
+    args = parser.parse_args()
+
+    if args.get or args.list:
+        with ArticleStore(args.store) as store:
+            if args.list:
+                print('\n'.join(store.slugs()))
+            elif args.get not in store:
+                sys.exit(f"❌ No article '{args.get}' in {args.store}")
+            else:
+                print(json.dumps(store.get(args.get), indent=2, ensure_ascii=False))
+        return
+
+    if not args.datasets:
+        parser.error("give at least one dataset to pack (or --get/--list)")
+
+    codec = {'zstd': CODEC_ZSTD, 'zlib': CODEC_ZLIB}.get(args.codec)
+    with stage('pack') as stats:
+        sizes = build_store(args.store, iter_articles(args.datasets), args.dict_size, codec)
+        stats.items = sizes['articles']
+        stats.add_file(args.store)
+
+    ratio = sizes['raw_bytes'] / max(sizes['store_bytes'], 1)
+    print(f"✅ Packed {sizes['articles']} articles with {sizes['codec']}")
+    print(f"   {sizes['raw_bytes']:,} bytes → {sizes['store_bytes']:,} bytes ({ratio:.1f}x)")
+    print(f"   dictionary: {sizes['dictionary_bytes']:,} bytes, records: {sizes['records_bytes']:,} bytes")
+    if sizes['codec'] == 'zlib':
+        print("   zlib dictionaries are capped at 32 KiB; install 'zstandard' for a much smaller store")
+    print(f"📁 Saved to: {args.store}")
+    if sizes['duplicates']:
+        print(f"⚠️  Duplicate slug(s), only the first is stored: {', '.join(sizes['duplicates'])}")
+
+
+if __name__ == "__main__":
+    main()
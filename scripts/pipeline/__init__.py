@@ -0,0 +1,6 @@
+"""
+Shared helpers for the E-PulsePoints content generation scripts.
+
+The generator scripts in scripts/ are run directly (python generate-*.py),
+so this package is importable from them without any install step.
+"""
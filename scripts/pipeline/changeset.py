@@ -0,0 +1,114 @@
+"""
+Minimal Firestore change sets from freshly generated articles.
+
+Each article is reduced to a per-field hash and compared, by slug, with the
+snapshot taken at the last publish. Documents are addressed as blog/{slug},
+the ID the uploaders (app/upload-articles, upload-ecg-articles.ts) store
+articles under. Only inserted, changed or deleted
+documents produce writes, and updates carry just the fields that changed.
+
+Writes are emitted in the Firestore REST "Write" shape (update + updateMask,
+or delete), one per line, so batches of lines can be posted straight to the
+emulator's documents:batchWrite endpoint or replayed with the Admin SDK.
+"""
+
+import json
+import math
+from datetime import datetime
+
+from .hashing import content_hash
+from .slugs import article_slug
+
+COLLECTION = 'blog'
+PROJECT_ID = 'epulsepoints-website'
+
+# Fields stamped with datetime.now() on every run or owned by Firestore
+VOLATILE_FIELDS = {'publishedAt', 'updatedAt', 'views'}
+VOLATILE_KEYS = {'datePublished', 'dateModified'}
+
+
+def _stable(value):
+    """Drop run-time timestamps nested inside schema/seo blocks"""
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(v) for v in value]
+    return value
+
+
+def field_hashes(article):
+    """Hash of every comparable top-level field"""
+    return {
+        field: content_hash(json.dumps(_stable(value), sort_keys=True, ensure_ascii=False))
+        for field, value in article.items()
+        if field not in VOLATILE_FIELDS
+    }
+
+
+def to_firestore_value(value):
+    """Encode a JSON value as a Firestore REST typed value"""
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value if math.isfinite(value) else str(value)}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [to_firestore_value(v) for v in value]}}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": {k: to_firestore_value(v) for k, v in value.items()}}}
+    raise TypeError(f"Cannot encode {type(value).__name__} for Firestore")
+
+
+def document_name(slug, project_id=PROJECT_ID, collection=COLLECTION):
+    return f"projects/{project_id}/databases/(default)/documents/{collection}/{slug}"
+
+
+def diff_articles(snapshot, articles, project_id=PROJECT_ID, collection=COLLECTION):
+    """
+    Yield (op, slug, write) for every article that differs from the snapshot.
+
+    snapshot maps slug -> field hashes and is updated in place, so after the
+    change set is published it can be saved as the next snapshot.
+    """
+    now = datetime.now().isoformat()
+    seen = set()
+
+    for article in articles:
+        slug = article_slug(article)
+        seen.add(slug)
+        hashes = field_hashes(article)
+        previous = snapshot.get(slug)
+        name = document_name(slug, project_id, collection)
+
+        if previous is None:
+            fields = dict(article, slug=slug)
+            write = {
+                "update": {"name": name, "fields": to_firestore_value(fields)["mapValue"]["fields"]},
+                "currentDocument": {"exists": False},
+            }
+            op = 'insert'
+        else:
+            changed = [f for f, h in hashes.items() if previous.get(f) != h]
+            removed = [f for f in previous if f not in hashes]
+            if not changed and not removed:
+                continue
+            fields = {f: article[f] for f in changed}
+            fields['updatedAt'] = now
+            write = {
+                "update": {"name": name, "fields": to_firestore_value(fields)["mapValue"]["fields"]},
+                "updateMask": {"fieldPaths": sorted(changed + removed + ['updatedAt'])},
+                "currentDocument": {"exists": True},
+            }
+            op = 'update'
+
+        snapshot[slug] = hashes
+        yield op, slug, write
+
+    for slug in sorted(set(snapshot) - seen):
+        del snapshot[slug]
+        yield 'delete', slug, {"delete": document_name(slug, project_id, collection)}
@@ -0,0 +1,85 @@
+"""
+Split article content into sections for progressive loading.
+
+Content is cut at every <h2> (or "## " line for Markdown bodies). Chunk 0 is
+everything above the first section heading - the ECG image and key points
+box - so it is small and can be rendered immediately. Concatenating the
+chunks' html in index order reproduces the original content exactly.
+"""
+
+import json
+import re
+
+from .hashing import content_hash
+from .output import atomic_open
+
+SECTION_START = re.compile(r'<h2[\s>]|^## ', re.MULTILINE)
+TAG = re.compile(r'<[^>]+>')
+
+
+def _heading(section):
+    """Plain-text heading of a section, or None for the lead chunk"""
+    if section.startswith('## '):
+        return section[3:].split('\n', 1)[0].strip()
+    if section.startswith('<h2'):
+        end = section.find('</h2>')
+        return TAG.sub('', section[:end if end != -1 else None]).strip()
+    return None
+
+
+def split_content(content):
+    """Return the ordered list of content chunks with size and hash"""
+    starts = [m.start() for m in SECTION_START.finditer(content)]
+    bounds = [0] + [s for s in starts if s > 0] + [len(content)]
+
+    chunks = []
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        html = content[start:end]
+        chunks.append({
+            "index": index,
+            "heading": _heading(html),
+            "bytes": len(html.encode('utf-8')),
+            "hash": content_hash(html),
+            "html": html,
+        })
+    return chunks
+
+
+class ChunkWriter:
+    """
+    Write chunk bodies to a JSONL file and replace article content with a manifest.
+
+    Each line is {"hash", "bytes", "html"}; identical chunks shared between
+    articles (author bio, disclaimers) are written once per run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.seen = set()
+        self.file = None
+        self._output = atomic_open(path)
+
+    def __enter__(self):
+        self.file = self._output.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._output.__exit__(*exc)
+
+    def split(self, article):
+        chunks = split_content(article['content'])
+        for chunk in chunks:
+            if chunk['hash'] not in self.seen:
+                self.seen.add(chunk['hash'])
+                line = {"hash": chunk['hash'], "bytes": chunk['bytes'], "html": chunk['html']}
+                self.file.write(json.dumps(line, ensure_ascii=False) + '\n')
+            del chunk['html']
+
+        chunked = {}
+        for key, value in article.items():
+            if key == 'content':
+                chunked['contentChunks'] = chunks
+                chunked['contentBytes'] = sum(chunk['bytes'] for chunk in chunks)
+            else:
+                chunked[key] = value
+        return chunked
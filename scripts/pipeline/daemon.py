@@ -0,0 +1,184 @@
+"""
+Resident generation server.
+
+Keeps the generator modules (catalogs and compiled templates), the parsed
+video corpus and the slug helpers loaded, and answers requests over a local
+Unix socket. One request per connection: a JSON object on a single line in,
+a JSON object on a single line out.
+
+Commands:
+    ping                              liveness check
+    generate {generator, argv, cwd}   run a generator's main() as the CLI would
+    article {generator, name}         render matching articles without writing
+    slug {title}                      slug for a title
+    recategorize {apply}              run the video category rules on the warm corpus
+    reload                            re-import scripts and drop cached state
+    shutdown                          stop the server
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import time
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+from .scripts import GENERATORS, VIDEO_CATEGORIES_SCRIPT, load_script, render_records
+from .slugs import create_slug
+from .validators import validate_article
+from .videos import VideoCatalog
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"epulsepoints-pipeline-{os.getuid()}.sock")
+
+
+@contextmanager
+def working_directory(path):
+    """os.chdir for the duration of a request (contextlib.chdir needs 3.11)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def socket_in_use(socket_path):
+    """True if a server answers on socket_path (a leftover file does not count)"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+class PipelineState:
+    """Everything the daemon keeps warm between requests"""
+
+    def __init__(self):
+        self.load()
+
+    def load(self):
+        self.generators = {key: load_script(spec['script']) for key, spec in GENERATORS.items()}
+        self.video_rules = load_script(VIDEO_CATEGORIES_SCRIPT)
+        self.catalogs = {key: list(module.builtin_records()) for key, module in self.generators.items()}
+        self.videos = VideoCatalog()
+        self.videos.refresh()
+
+    def generator(self, key):
+        if key not in self.generators:
+            raise ValueError(f"Unknown generator '{key}' (choose from: {', '.join(GENERATORS)})")
+        return self.generators[key]
+
+    def cmd_ping(self, request):
+        return {"generators": list(self.generators), "videos": len(self.videos.videos)}
+
+    def cmd_generate(self, request):
+        module = self.generator(request['generator'])
+        output = io.StringIO()
+        with working_directory(request.get('cwd') or os.getcwd()), redirect_stdout(output), redirect_stderr(output):
+            try:
+                module.main(request.get('argv', []))
+            except SystemExit as e:
+                # argparse errors and --help exit; report them instead of stopping the daemon
+                if e.code:
+                    raise ValueError(output.getvalue().strip() or f"exit status {e.code}")
+        return {"stdout": output.getvalue()}
+
+    def cmd_article(self, request):
+        key = request['generator']
+        module = self.generator(key)
+        name_field = GENERATORS[key]['name_field']
+        wanted = request['name'].lower()
+        matches = [
+            (position, r) for position, r in enumerate(self.catalogs[key])
+            if wanted in (r[name_field].lower(), r.get('mi_type', '').lower())
+        ]
+        if not matches:
+            raise ValueError(f"No {key} catalog entry named '{request['name']}'")
+        articles = [
+            article
+            for position, record in matches
+            for article in render_records(module, [record], start=position)
+        ]
+        return {
+            "articles": articles,
+            "errors": {a['title']: errs for a in articles if (errs := validate_article(a))},
+        }
+
+    def cmd_slug(self, request):
+        return {"slug": create_slug(request['title'])}
+
+    def cmd_recategorize(self, request):
+        self.videos.refresh()
+        changes = []
+        for stem, data in sorted(self.videos.videos.items()):
+            if not data:
+                continue
+            original = data.get('category', '')
+            category, reason = self.video_rules.categorize(stem, data)
+            if category and category != original:
+                changes.append({"video": stem, "from": original, "to": category, "reason": reason})
+                if request.get('apply'):
+                    self.videos.save(stem, dict(data, category=category))
+        return {"changes": changes, "applied": bool(request.get('apply'))}
+
+    def cmd_reload(self, request):
+        self.load()
+        return self.cmd_ping(request)
+
+    def cmd_shutdown(self, request):
+        return {}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        started = time.perf_counter()
+        line = self.rfile.readline()
+        if not line:
+            # socket_in_use() connects and hangs up without a request
+            return
+        try:
+            request = json.loads(line)
+            command = getattr(self.server.state, f"cmd_{request.get('cmd')}", None)
+            if command is None:
+                raise ValueError(f"Unknown command '{request.get('cmd')}'")
+            response = {"ok": True, **command(request)}
+            if request.get('cmd') == 'shutdown':
+                self.server.stopping = True
+        except Exception as e:
+            response = {"ok": False, "error": str(e), "traceback": traceback.format_exc()}
+        response['ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+
+
+class PipelineServer(socketserver.UnixStreamServer):
+    """Sequential server: requests share warm state, so they run one at a time"""
+
+    def __init__(self, socket_path, state):
+        self.state = state
+        self.stopping = False
+        super().__init__(socket_path, _Handler)
+
+
+def serve(socket_path=DEFAULT_SOCKET):
+    """Load everything once, then answer requests until shutdown"""
+    if socket_in_use(socket_path):
+        raise RuntimeError(f"A daemon is already listening on {socket_path}")
+    started = time.perf_counter()
+    state = PipelineState()
+
+    # Left behind by a daemon that did not shut down cleanly
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with PipelineServer(socket_path, state) as server:
+        print(f"🟢 Pipeline daemon ready in {(time.perf_counter() - started) * 1000:.0f} ms on {socket_path}")
+        try:
+            while not server.stopping:
+                server.handle_request()
+        finally:
+            os.unlink(socket_path)
+    print("🔴 Pipeline daemon stopped")
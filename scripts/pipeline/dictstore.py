@@ -0,0 +1,218 @@
+"""
+Dictionary-compressed article store.
+
+Generated articles share most of their markup and phrasing, so compressing
+each one on its own wastes that redundancy. A dictionary is trained on the
+whole corpus and every article is compressed against it as an independent
+record, giving close to whole-corpus ratios while any single article can
+still be decompressed on its own.
+
+Uses zstd (the optional `zstandard` package) when installed, otherwise
+zlib's preset-dictionary support; the codec is recorded in the file.
+
+Only zstd gets near whole-corpus ratios. A deflate dictionary is capped at
+its 32 KiB window, so the zlib fallback falls well short: on the four
+generated datasets (68 articles, 1.04 MB) it packs 5.2x, against 16.6x for
+zlib over the concatenated corpus and 3.1x for each article compressed
+alone. Install `zstandard` where the store's size matters.
+
+File layout (integers little-endian):
+
+    b'EPAS' | version u8 | codec u8 | dict length u32 | dictionary
+    record bytes ...
+    index (zlib-compressed JSON: slug -> [offset, length, raw length, hash])
+    index offset u64 | index length u32 | b'EPAS'
+"""
+
+import json
+import os
+import re
+import struct
+import zlib
+from collections import Counter
+
+from .hashing import content_hash
+from .slugs import article_slug
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to zlib preset dictionaries
+    zstandard = None
+
+MAGIC = b'EPAS'
+VERSION = 1
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {CODEC_ZLIB: 'zlib', CODEC_ZSTD: 'zstd'}
+
+HEADER = struct.Struct('<4sBBI')
+FOOTER = struct.Struct('<QI4s')
+
+ZLIB_MAX_DICT = 32 * 1024   # deflate window size
+DEFAULT_DICT_SIZE = 64 * 1024
+ZSTD_LEVEL = 19
+
+# A line of a compact JSON record: up to and including an escaped newline
+LINE = re.compile(rb'(?:(?!\\n).)+(?:\\n)?', re.S)
+
+
+def encode_article(article):
+    return json.dumps(article, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def shared_segments_dictionary(samples, size):
+    """
+    Build a raw-content dictionary from lines that recur across samples.
+
+    Samples are compact JSON, so lines end at escaped newlines. Lines are scored
+    by (documents containing them x length); the best ones go at the end of the
+    dictionary, where back-references are cheapest.
+    """
+    document_frequency = Counter()
+    for sample in samples:
+        document_frequency.update(set(LINE.findall(sample)))
+
+    shared = [(count * len(line), line) for line, count in document_frequency.items() if count > 1]
+    shared.sort()
+
+    picked, used = [], 0
+    for _, line in reversed(shared):
+        if used + len(line) > size:
+            continue
+        picked.append(line)
+        used += len(line)
+    return b''.join(reversed(picked))
+
+
+def train_dictionary(samples, size=DEFAULT_DICT_SIZE, codec=None):
+    """Return (codec, dictionary bytes) for the given samples"""
+    codec = codec or (CODEC_ZSTD if zstandard else CODEC_ZLIB)
+    if codec == CODEC_ZLIB:
+        return codec, shared_segments_dictionary(samples, min(size, ZLIB_MAX_DICT))
+    if zstandard is None:
+        raise RuntimeError("zstd codec requested but the 'zstandard' package is not installed")
+    try:
+        return codec, zstandard.train_dictionary(size, samples).as_bytes()
+    except zstandard.ZstdError:
+        # Too few samples for the trainer; a raw-content dictionary still helps
+        return codec, shared_segments_dictionary(samples, size)
+
+
+class _Codec:
+    def __init__(self, codec, dictionary):
+        self.codec = codec
+        self.dictionary = dictionary
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("This store uses zstd; install the 'zstandard' package to read it")
+            data = zstandard.ZstdCompressionDict(dictionary)
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=data)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=data)
+
+    def compress(self, raw):
+        if self.codec == CODEC_ZSTD:
+            return self._compressor.compress(raw)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+        return compressor.compress(raw) + compressor.flush()
+
+    def decompress(self, data):
+        if self.codec == CODEC_ZSTD:
+            return self._decompressor.decompress(data)
+        decompressor = zlib.decompressobj(-15, zdict=self.dictionary)
+        return decompressor.decompress(data) + decompressor.flush()
+
+
+def build_store(path, articles, dict_size=DEFAULT_DICT_SIZE, codec=None):
+    """
+    Train a dictionary on the articles and write them as an indexed store.
+
+    A slug seen twice keeps its first article; the repeats are not stored
+    and are listed in the result's "duplicates". Returns a dict of sizes
+    for reporting.
+    """
+    records = []
+    slugs = set()
+    duplicates = []
+    for article in articles:
+        slug = article_slug(article)
+        if slug in slugs:
+            duplicates.append(slug)
+            continue
+        slugs.add(slug)
+        records.append((slug, encode_article(article)))
+    codec, dictionary = train_dictionary([raw for _, raw in records], dict_size, codec)
+    compressor = _Codec(codec, dictionary)
+
+    index = {}
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, codec, len(dictionary)))
+        f.write(dictionary)
+        for slug, raw in records:
+            data = compressor.compress(raw)
+            index[slug] = [f.tell(), len(data), len(raw), content_hash(raw)]
+            f.write(data)
+        index_offset = f.tell()
+        index_data = zlib.compress(json.dumps(index, separators=(',', ':')).encode('utf-8'), 9)
+        f.write(index_data)
+        f.write(FOOTER.pack(index_offset, len(index_data), MAGIC))
+    os.replace(tmp, path)
+
+    return {
+        "codec": CODEC_NAMES[codec],
+        "articles": len(records),
+        "raw_bytes": sum(len(raw) for _, raw in records),
+        "dictionary_bytes": len(dictionary),
+        "store_bytes": os.path.getsize(path),
+        "records_bytes": sum(entry[1] for entry in index.values()),
+        "duplicates": duplicates,
+    }
+
+
+class ArticleStore:
+    """Read articles from a store one at a time, by slug"""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        magic, version, codec, dict_length = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an article store (or an unsupported version)")
+        dictionary = self.file.read(dict_length)
+
+        self.file.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, index_length, end_magic = FOOTER.unpack(self.file.read(FOOTER.size))
+        if end_magic != MAGIC:
+            raise ValueError(f"{path} is truncated")
+        self.file.seek(index_offset)
+        self.index = json.loads(zlib.decompress(self.file.read(index_length)))
+        self.codec = _Codec(codec, dictionary)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def __contains__(self, slug):
+        return slug in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def slugs(self):
+        return list(self.index)
+
+    def get_bytes(self, slug):
+        offset, length, raw_length, digest = self.index[slug]
+        self.file.seek(offset)
+        raw = self.codec.decompress(self.file.read(length))
+        if len(raw) != raw_length or content_hash(raw) != digest:
+            raise ValueError(f"Corrupt record for '{slug}'")
+        return raw
+
+    def get(self, slug):
+        """Decompress and decode one article"""
+        return json.loads(self.get_bytes(slug))
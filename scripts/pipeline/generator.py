@@ -0,0 +1,222 @@
+"""
+Command-line plumbing shared by the generate-*.py scripts.
+"""
+
+import argparse
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+
+from .chunks import ChunkWriter
+from .jsonl import JsonlWriter, encode_line
+from .metadata import MetadataCollector
+from .output import atomic_open, json_array_end, json_array_item, json_array_separator
+from .records import RowErrors, stream_records
+from .slugs import article_slug
+from .stages import DEFAULT_DEPTH, StagedPipeline
+from .telemetry import stage
+from .validators import PUBLIC_DIR, Rejections, public_file_exists
+
+DATASETS_DIR = PUBLIC_DIR / 'scripts'   # the published article datasets
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser(description, default_output):
+    """Argument parser with the options every generator accepts"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--input',
+        help="CSV or JSONL catalog to stream records from (defaults to the built-in list)",
+    )
+    parser.add_argument(
+        '--output',
+        default=default_output,
+        help=f"JSON file to write (default: {default_output})",
+    )
+    parser.add_argument(
+        '--chunked',
+        action='store_true',
+        help="Split content at <h2> boundaries; chunk bodies go to <output>.chunks.jsonl",
+    )
+    parser.add_argument(
+        '--metadata',
+        action='store_true',
+        help="Write reading time, word counts, headings and images to <output>.meta.json",
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help="Also write a gzip-compressed copy of the dataset to <output>.gz",
+    )
+    parser.add_argument(
+        '--jsonl',
+        action='store_true',
+        help="Also write one article per line to <output>.jsonl, indexed by slug in <output>.index.json",
+    )
+    parser.add_argument(
+        '--queue-depth',
+        type=positive_int,
+        default=DEFAULT_DEPTH,
+        help=f"Articles each pipeline stage may run ahead of the next (default: {DEFAULT_DEPTH})",
+    )
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        default=1,
+        help="Processes serializing articles to JSON; worth it for catalogs of hundreds of articles "
+             "(default: 1, serialize in this process)",
+    )
+    return parser
+
+
+def load_catalog(args, builtin, fields):
+    """
+    Return (records, errors) for a generator run.
+
+    With --input the records are streamed from disk and validated row by row;
+    otherwise the script's built-in catalog is used as-is. A catalog that
+    cannot be opened stops the run before any output is touched.
+    """
+    errors = RowErrors()
+    if args.input:
+        try:
+            return stream_records(args.input, fields, on_error=errors), errors
+        except (OSError, ValueError) as e:
+            sys.exit(f"❌ Cannot read catalog {args.input}: {e}")
+    return iter(builtin), errors
+
+
+def sidecar_path(output, suffix):
+    """Path next to the dataset, e.g. mi-ecg-articles.json -> mi-ecg-articles.chunks.jsonl"""
+    output = Path(output)
+    return output.with_name(output.stem + suffix)
+
+
+def published_datasets(directory=DATASETS_DIR):
+    """Article datasets in a directory, leaving out the .meta.json sidecars written next to them"""
+    return sorted(p for p in Path(directory).glob('*.json') if not p.name.endswith('.meta.json'))
+
+
+def serialize_article(article, jsonl):
+    """Dataset element (without its separator) and JSONL (slug, line) of an article; picklable for --workers"""
+    line = (article_slug(article), encode_line(article)) if jsonl else None
+    return json_array_item(article), line
+
+
+def write_articles(args, articles):
+    """
+    Apply the output options selected on the command line and write the dataset.
+
+    Rendering, post-processing (validation, metadata, chunking), JSON (and
+    JSONL) serialization, optional gzip compression and writing run as stages
+    with bounded queues between them (see stages.StagedPipeline), so memory
+    stays bounded by --queue-depth. The stages are threads: compression and
+    writes overlap with the rest, but the Python work shares one core unless
+    --workers moves serialization, the costliest step, to a process pool.
+    """
+    rejections = Rejections()
+    metadata = MetadataCollector() if args.metadata else None
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31) if args.gzip else None
+    hits_before = public_file_exists.cache_info().hits
+
+    with stage('generate') as stats, ExitStack() as stack:
+        chunks = None
+        if args.chunked:
+            chunks_file = sidecar_path(args.output, '.chunks.jsonl')
+            chunks = stack.enter_context(ChunkWriter(chunks_file))
+
+        def postprocess(article):
+            article = rejections.check(article)
+            if article is None:
+                return None
+            if metadata:
+                article = metadata.observe(article)
+            return chunks.split(article) if chunks else article
+
+        serialize = partial(serialize_article, jsonl=args.jsonl)
+        compressed_count = 0
+
+        def compress(item):
+            nonlocal compressed_count
+            text, line = item
+            data = compressor.compress((json_array_separator(compressed_count == 0) + text).encode('utf-8'))
+            compressed_count += 1
+            return text, line, data
+
+        pool = None
+        if args.workers > 1:
+            try:
+                pool = stack.enter_context(ProcessPoolExecutor(args.workers))
+            except (OSError, NotImplementedError):
+                pass   # e.g. no /dev/shm in a sandbox; serialize in the stage thread
+        steps = [('postprocess', postprocess), ('serialize', serialize, pool) if pool else ('serialize', serialize)]
+        if compressor:
+            steps.append(('compress', compress))
+        pipeline = StagedPipeline(articles, steps, depth=args.queue_depth)
+
+        count = 0
+        # Every output is written to a temp file and only replaces the previous
+        # one once the whole run has succeeded (JsonlWriter does the same)
+        output = stack.enter_context(atomic_open(args.output))
+        compressed = stack.enter_context(atomic_open(f"{args.output}.gz", 'wb')) if compressor else None
+        jsonl = stack.enter_context(JsonlWriter(sidecar_path(args.output, '.jsonl'))) if args.jsonl else None
+        for text, line, *data in pipeline:
+            if compressed:
+                compressed.write(data[0])
+            if jsonl:
+                jsonl.add(*line)
+            output.write(json_array_separator(count == 0) + text)
+            count += 1
+        output.write(json_array_end(count))
+        if compressed:
+            compressed.write(compressor.compress(json_array_end(count).encode('utf-8')) + compressor.flush())
+        stack.close()
+
+        if metadata:
+            metadata.write(sidecar_path(args.output, '.meta.json'))
+            stats.add_file(sidecar_path(args.output, '.meta.json'))
+        if args.chunked:
+            stats.add_file(chunks_file)
+        if compressor:
+            stats.add_file(f"{args.output}.gz")
+        if jsonl:
+            stats.add_file(jsonl.path)
+        stats.add_file(args.output)
+        stats.items = count
+        stats.cache_hits = public_file_exists.cache_info().hits - hits_before
+        stats.extra['rejected'] = rejections.count
+        stats.extra['workers'] = args.workers if pool else 1
+        stats.extra['stages'] = {
+            name: {key: round(value, 4) for key, value in timing.items()}
+            for name, timing in pipeline.timings.items()
+        }
+
+    if rejections.count:
+        print(f"⛔ {rejections.count} article(s) failed validation and were not written")
+    if args.jsonl and jsonl.duplicates:
+        print(f"⚠️  Duplicate slug(s) in {jsonl.path.name}, only the first is indexed: {', '.join(jsonl.duplicates)}")
+    return count
+
+
+class ArticleTally:
+    """Collect summary counts while articles stream past"""
+
+    def __init__(self):
+        self.tags = set()
+        self.categories = set()
+
+    def track(self, articles):
+        for article in articles:
+            self.tags.update(article['tags'])
+            self.categories.add(article['category'])
+            yield article
@@ -0,0 +1,23 @@
+"""
+Content hashing shared by the pipeline stages.
+"""
+
+import hashlib
+
+HASH_LENGTH = 16
+
+
+def content_hash(data):
+    """Short, stable SHA-256 hex digest of a string or bytes"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def file_hash(path, block_size=1 << 20):
+    """content_hash of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
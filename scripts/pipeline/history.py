@@ -0,0 +1,313 @@
+"""
+Local version history for generated articles.
+
+Every `commit` records a snapshot of the datasets. Storage is
+content-addressed and deduplicated at three levels:
+
+    chunk      a piece of an article body, cut at content-defined boundaries
+    revision   an article's fields plus the list of its body's chunk hashes
+    snapshot   for each dataset, the (slug, revision, stamps) of its articles
+
+Datasets are named by their path relative to the repository (see
+dataset_key), so two files with the same name in different directories
+stay separate.
+
+Bodies are cut after lines whose CRC has its low CHUNK_BITS bits clear
+(within a minimum and maximum chunk size), so a boundary depends only on
+the text around it. An edit changes the one or two chunks it touches, and
+every other chunk is shared with the previous revision. Timestamps that change
+on every run (publishedAt, updatedAt, schema dates) are kept as per-snapshot
+"stamps" instead of inside the revision. So a regenerated but otherwise
+unchanged article reuses its previous revision and costs no new objects.
+
+Checking out a snapshot reads its file, then each listed revision and its
+chunks directly. The cost does not depend on how many snapshots came before
+it, because nothing is replayed. Diffs compare chunk hash lists first and
+only load and line-diff the chunks that differ.
+
+Layout (HISTORY_DIR):
+
+    objects/<2 hex>/<rest of hash>   zlib-compressed chunk and revision blobs
+    snapshots/<number>.json          one per commit
+"""
+
+import difflib
+import json
+import os
+import re
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .changeset import VOLATILE_FIELDS, VOLATILE_KEYS
+from .hashing import content_hash
+from .slugs import article_slug
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HISTORY_DIR = REPO_ROOT / '.article-history'
+
+CHUNK_BITS = 3          # a boundary every 8 lines on average
+MIN_CHUNK = 256         # characters
+MAX_CHUNK = 8192        # characters; longer runs (or lines) are cut here
+
+
+def dataset_key(path):
+    """Name a dataset by its path relative to the repository (absolute if outside it)"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def checkout_path(output, key):
+    """Where checkout writes a dataset under output, keeping its directories"""
+    key = Path(key)
+    return Path(output) / key.relative_to(key.anchor) if key.anchor else Path(output) / key
+
+
+def chunk_text(text):
+    """Split text into content-defined chunks; ''.join(chunks) == text"""
+    chunks = []
+    start = 0
+    mask = (1 << CHUNK_BITS) - 1
+    position = 0
+    for line in text.splitlines(keepends=True):
+        end = position + len(line)
+        while end - start > MAX_CHUNK:
+            chunks.append(text[start:start + MAX_CHUNK])
+            start += MAX_CHUNK
+        if end - start >= MIN_CHUNK and zlib.crc32(line.encode('utf-8')) & mask == 0:
+            chunks.append(text[start:end])
+            start = end
+        position = end
+    if start < len(text):
+        chunks.append(text[start:])
+    return chunks
+
+
+def split_stamps(article):
+    """
+    (article with run-time timestamps blanked, stamps to put them back).
+
+    stamps is a list of [path, value] with path a list of keys/indexes.
+    """
+    stamps = []
+
+    def walk(value, path, top):
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                if (top and key in VOLATILE_FIELDS) or key in VOLATILE_KEYS:
+                    stamps.append([path + [key], item])
+                    result[key] = None
+                else:
+                    result[key] = walk(item, path + [key], False)
+            return result
+        if isinstance(value, list):
+            return [walk(item, path + [index], False) for index, item in enumerate(value)]
+        return value
+
+    return walk(article, [], True), stamps
+
+
+def apply_stamps(article, stamps):
+    for path, value in stamps:
+        target = article
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+    return article
+
+
+class HistoryStore:
+    """Content-addressed article history under a directory"""
+
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = Path(directory)
+        self.objects = self.directory / 'objects'
+        self.snapshots = self.directory / 'snapshots'
+        self.written = {"objects": 0, "bytes": 0}
+
+    # -- objects -----------------------------------------------------------
+
+    def _object_path(self, key):
+        return self.objects / key[:2] / key[2:]
+
+    def put(self, data):
+        """Store bytes (once) and return their hash"""
+        key = content_hash(data)
+        path = self._object_path(key)
+        if not path.exists():
+            packed = zlib.compress(data, 9)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(packed)
+            os.replace(tmp, path)
+            self.written['objects'] += 1
+            self.written['bytes'] += len(packed)
+        return key
+
+    def get(self, key):
+        with open(self._object_path(key), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    # -- revisions ---------------------------------------------------------
+
+    def put_revision(self, article):
+        """Store an article (timestamps already blanked); returns its revision id"""
+        fields = dict(article)
+        record = {"fields": fields}
+        if isinstance(fields.get('content'), str):
+            # Left in place as None so the field order round-trips
+            chunks = chunk_text(fields['content'])
+            record['chunks'] = [self.put(chunk.encode('utf-8')) for chunk in chunks]
+            record['lines'] = [chunk.count('\n') for chunk in chunks]
+            fields['content'] = None
+        return self.put(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+
+    def revision(self, key):
+        return json.loads(self.get(key))
+
+    def body(self, record):
+        return ''.join(self.get(chunk).decode('utf-8') for chunk in record.get('chunks', []))
+
+    def article(self, key, stamps=()):
+        """Rebuild an article from its revision id (and stamps)"""
+        record = self.revision(key)
+        article = dict(record['fields'])
+        if 'chunks' in record:
+            article['content'] = self.body(record)
+        return apply_stamps(article, stamps)
+
+    # -- snapshots ---------------------------------------------------------
+
+    def snapshot_numbers(self):
+        if not self.snapshots.is_dir():
+            return []
+        return sorted(int(path.stem) for path in self.snapshots.glob('*.json'))
+
+    def load_snapshot(self, number=None):
+        """A snapshot by number (negative counts back from the latest)"""
+        numbers = self.snapshot_numbers()
+        if not numbers:
+            raise LookupError("no snapshots yet")
+        if number is None:
+            number = -1
+        if -len(numbers) <= number < 0:
+            number = numbers[number]
+        elif number not in numbers:
+            raise LookupError(f"no snapshot {number}")
+        with open(self.snapshots / f"{number:06d}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def commit(self, datasets, message=''):
+        """
+        Record a snapshot of datasets ({name: [articles]}).
+
+        Returns (snapshot, counts) with counts of articles, new revisions
+        and new objects/bytes written.
+        """
+        numbers = self.snapshot_numbers()
+        previous = self.load_snapshot() if numbers else None
+        known = set()
+        if previous:
+            for entries in previous['datasets'].values():
+                known.update(entry[1] for entry in entries)
+
+        self.written = {"objects": 0, "bytes": 0}
+        snapshot = {
+            "number": (numbers[-1] + 1) if numbers else 1,
+            "time": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "message": message,
+            "datasets": {},
+        }
+        counts = {"articles": 0, "new_revisions": 0}
+        for name, articles in datasets.items():
+            entries = snapshot['datasets'][name] = []
+            for article in articles:
+                stable, stamps = split_stamps(article)
+                revision = self.put_revision(stable)
+                entries.append([article_slug(article), revision, stamps])
+                counts['articles'] += 1
+                counts['new_revisions'] += revision not in known
+
+        self.snapshots.mkdir(parents=True, exist_ok=True)
+        path = self.snapshots / f"{snapshot['number']:06d}.json"
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+        counts.update(self.written)
+        return snapshot, counts
+
+    def checkout(self, snapshot):
+        """{dataset name: [articles]} exactly as committed"""
+        return {
+            name: [self.article(revision, stamps) for _, revision, stamps in entries]
+            for name, entries in snapshot['datasets'].items()
+        }
+
+
+def revisions_by_slug(snapshot):
+    return {slug: revision for entries in snapshot['datasets'].values() for slug, revision, _ in entries}
+
+
+def diff_snapshots(old, new):
+    """(added, removed, changed) slugs between two snapshots, without reading any article"""
+    before, after = revisions_by_slug(old), revisions_by_slug(new)
+    added = sorted(set(after) - set(before))
+    removed = sorted(set(before) - set(after))
+    changed = sorted(slug for slug in set(before) & set(after) if before[slug] != after[slug])
+    return added, removed, changed
+
+
+_HUNK = re.compile(r'^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@')
+
+
+def _shift_hunk(match, offset_a, offset_b):
+    start_a, length_a, start_b, length_b = match.groups()
+    return f"@@ -{int(start_a) + offset_a}{length_a or ''} +{int(start_b) + offset_b}{length_b or ''} @@"
+
+
+def diff_revisions(store, old, new, label='article'):
+    """
+    Unified diff of two revisions.
+
+    Fields are compared as JSON; bodies are compared chunk list to chunk
+    list, so only chunks that differ are read and diffed line by line.
+    """
+    if old == new:
+        return ''
+    a, b = store.revision(old), store.revision(new)
+    lines = []
+    fields_a, fields_b = a['fields'], b['fields']
+    for field in sorted(set(fields_a) | set(fields_b)):
+        if fields_a.get(field) != fields_b.get(field):
+            lines.extend(difflib.unified_diff(
+                json.dumps(fields_a.get(field), indent=2, ensure_ascii=False).splitlines(keepends=True),
+                json.dumps(fields_b.get(field), indent=2, ensure_ascii=False).splitlines(keepends=True),
+                f"a/{label}/{field}", f"b/{label}/{field}",
+            ))
+
+    chunks_a, chunks_b = a.get('chunks', []), b.get('chunks', [])
+    lines_a, lines_b = a.get('lines', []), b.get('lines', [])
+    matcher = difflib.SequenceMatcher(None, chunks_a, chunks_b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        text_a = ''.join(store.get(key).decode('utf-8') for key in chunks_a[i1:i2])
+        text_b = ''.join(store.get(key).decode('utf-8') for key in chunks_b[j1:j2])
+        hunks = difflib.unified_diff(
+            text_a.splitlines(keepends=True),
+            text_b.splitlines(keepends=True),
+            f"a/{label}/content", f"b/{label}/content",
+        )
+        # Hunk line numbers are relative to the chunks; shift them to the body
+        offset_a, offset_b = sum(lines_a[:i1]), sum(lines_b[:j1])
+        lines.extend(
+            _HUNK.sub(lambda m: _shift_hunk(m, offset_a, offset_b), line) if line.startswith('@@') else line
+            for line in hunks
+        )
+    return ''.join(line if line.endswith('\n') else line + '\n' for line in lines)
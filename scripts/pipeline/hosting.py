@@ -0,0 +1,153 @@
+"""
+Firebase Hosting cache headers derived from content hashes.
+
+Rules are globs, one per group of files that share a policy, so firebase.json
+grows with the kinds of files hosted rather than with every file:
+
+    /_next/static/**                  immutable, 1 year (content-hashed names)
+    **/*.html                         short TTL, must-revalidate
+    /<top-level dir>/**/*.<ext>       short TTL, or longer once every file in
+    /*.<ext>                          the group has been unchanged STABLE_AFTER
+
+Every file is hashed and when each last changed is kept in a small local
+state file (scripts/hosting-hashes.json, gitignored). Validators (ETag,
+Last-Modified) are left to Hosting, which already sets them.
+
+Generated rules replace the ones from the previous run in firebase.json;
+rules added by hand are kept, ahead of the generated ones.
+"""
+
+import json
+import os
+import re
+from datetime import date, timedelta
+from pathlib import Path, PurePosixPath
+
+from .hashing import file_hash
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+MUTABLE_TTL = 300
+STABLE_TTL = 3600
+STABLE_AFTER = timedelta(days=7)
+HTML_CACHE = f"public, max-age={MUTABLE_TTL}, must-revalidate"
+
+# Next.js emits content-hashed bundles here
+FINGERPRINTED_DIRS = ('_next/static/',)
+
+# Pages are matched by pattern instead of by group
+PAGE_SUFFIXES = ('.html',)
+PAGE_RULE = "**/*.html"
+STATIC_RULE = "/_next/static/**"
+
+IGNORED = re.compile(r'(^|/)\.')
+GLOB_SPECIAL = re.compile(r'([][(){}*?!+@\\])')
+
+
+def glob_escape(name):
+    """Hosting sources are globs; match names like 'best images (1)' literally"""
+    return GLOB_SPECIAL.sub(r'\\\1', name)
+
+
+def scan(root):
+    """Yield (url, path) for every file under the hosting root"""
+    root = Path(root)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            url = '/' + path.relative_to(root).as_posix()
+            if not IGNORED.search(url):
+                yield url, path
+
+
+def rule_group(url):
+    """
+    Glob for the group a file's policy is set by: its top-level directory
+    and extension. None for files without an extension, which keep
+    Hosting's defaults (a group glob for them would cover every file).
+    """
+    suffix = PurePosixPath(url).suffix
+    if not suffix:
+        return None
+    top, _, rest = url.lstrip('/').partition('/')
+    if not rest:
+        return f"/*{glob_escape(suffix)}"
+    return f"/{glob_escape(top)}/**/*{glob_escape(suffix)}"
+
+
+def header_rules(root, state, today=None):
+    """
+    Hosting header rules for the files under root; updates state in place.
+
+    state maps url -> [hash, date it last changed]. Returns (rules, counts)
+    with counts of immutable, mutable and changed files and of groups.
+    """
+    today = today or date.today()
+    counts = {"immutable": 0, "mutable": 0, "changed": 0, "groups": 0}
+    seen = set()
+    stable = {}
+    for url, path in scan(root):
+        if url.lstrip('/').startswith(FINGERPRINTED_DIRS):
+            counts['immutable'] += 1
+            continue
+        if url.endswith(PAGE_SUFFIXES):
+            continue
+        group = rule_group(url)
+        if group is None:
+            continue
+        hashed = file_hash(path)
+        previous = state.get(url)
+        if previous and previous[0] == hashed:
+            changed = date.fromisoformat(previous[1])
+        else:
+            changed = today
+            counts['changed'] += 1
+        state[url] = [hashed, changed.isoformat()]
+        seen.add(url)
+        counts['mutable'] += 1
+        # A group is only as stable as its most recently changed file
+        stable[group] = stable.get(group, True) and today - changed >= STABLE_AFTER
+
+    for url in set(state) - seen:
+        del state[url]
+
+    rules = [
+        {"source": STATIC_RULE, "headers": [{"key": "Cache-Control", "value": IMMUTABLE}]},
+        {"source": PAGE_RULE, "headers": [{"key": "Cache-Control", "value": HTML_CACHE}]},
+    ]
+    for group, is_stable in sorted(stable.items()):
+        ttl = STABLE_TTL if is_stable else MUTABLE_TTL
+        rules.append({
+            "source": group,
+            "headers": [{"key": "Cache-Control", "value": f"public, max-age={ttl}, must-revalidate"}],
+        })
+    counts['groups'] = len(stable)
+    return rules, counts
+
+
+def merge_firebase_headers(config, rules, generated):
+    """
+    Put rules into config['hosting']['headers'].
+
+    generated is the list of sources written last time; those rules are
+    dropped, anything else already in the config is kept first.
+    """
+    hosting = config['hosting']
+    previous = set(generated)
+    kept = [rule for rule in hosting.get('headers', []) if rule.get('source') not in previous]
+    hosting['headers'] = kept + rules
+    return config
+
+
+def write_json_if_changed(path, data, indent=2):
+    """Write JSON (2-space, like firebase.json) unless the file already matches"""
+    text = json.dumps(data, indent=indent, ensure_ascii=False) + '\n'
+    try:
+        if Path(path).read_text(encoding='utf-8') == text:
+            return False
+    except OSError:
+        pass
+    tmp = f"{path}.tmp"
+    Path(tmp).write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,137 @@
+"""
+JSONL article datasets with a byte-offset index.
+
+Each article is one line of compact JSON, so bulk consumers can stream the
+file line by line. A sidecar index (<name>.index.json) maps every slug to
+the [offset, length] of its line; JsonlReader memory-maps the file and
+decodes only the line it is asked for.
+
+The index records the size of the file it was built for, and a reader
+refuses a file that has changed since. Both files are written to a temp
+path first and swapped in, so a reader never sees a half-written dataset.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+
+from .slugs import article_slug
+
+INDEX_VERSION = 1
+
+
+def encode_line(article):
+    """One JSONL line (newlines inside strings are escaped by json.dumps)"""
+    return (json.dumps(article, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def index_path(path):
+    """mi-ecg-articles.jsonl -> mi-ecg-articles.index.json"""
+    path = Path(path)
+    return path.with_name(path.stem + '.index.json')
+
+
+class JsonlWriter:
+    """
+    Write articles as JSONL lines and their index.
+
+    A slug seen twice keeps its first line in the index; the repeats are
+    listed in duplicates.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp = f"{self.path}.tmp"
+        self.file = open(self.tmp, 'wb')
+        self.records = {}
+        self.duplicates = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            os.remove(self.tmp)
+
+    def add(self, slug, line):
+        """Append an encoded line (see encode_line)"""
+        if slug in self.records:
+            self.duplicates.append(slug)
+        else:
+            self.records[slug] = [self.file.tell(), len(line)]
+        self.file.write(line)
+
+    def write(self, article):
+        self.add(article_slug(article), encode_line(article))
+
+    def close(self):
+        if self.file.closed:
+            return
+        size = self.file.tell()
+        self.file.close()
+        index = {"version": INDEX_VERSION, "size": size, "records": self.records}
+        index_file = index_path(self.path)
+        index_tmp = f"{index_file}.tmp"
+        with open(index_tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        # Data first: an old index over a new file fails the size check
+        # instead of returning the wrong records
+        os.replace(self.tmp, self.path)
+        os.replace(index_tmp, index_file)
+
+
+class JsonlReader:
+    """Read articles from a JSONL dataset one at a time, by slug"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(index_path(self.path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path(self.path)}: unsupported index version")
+        self.index = index['records']
+        self.file = open(self.path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        if size != index['size']:
+            self.file.close()
+            raise ValueError(f"{self.path} changed since its index was written")
+        # mmap cannot map an empty file
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __contains__(self, slug):
+        return slug in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def slugs(self):
+        return list(self.index)
+
+    def get_bytes(self, slug):
+        offset, length = self.index[slug]
+        return self.data[offset:offset + length]
+
+    def get(self, slug):
+        """Decode one article"""
+        return json.loads(self.get_bytes(slug))
+
+    def __iter__(self):
+        """Every article in file order (bulk consumers)"""
+        with open(self.path, 'rb') as f:
+            for line in f:
+                yield json.loads(line)
@@ -0,0 +1,81 @@
+"""
+Multi-keyword matching in one pass over the text (Aho-Corasick).
+
+The keywords are compiled once into a trie with failure links, so finding
+every occurrence of every keyword costs one walk over the text however many
+keywords there are. Matching is case-insensitive and whole-word: a keyword
+only counts when it is not part of a longer word ("mi" matches "acute MI",
+not "semi" or "mitral").
+"""
+
+from collections import Counter, deque
+
+
+def _is_word(char):
+    # Same characters as \w in a str regex
+    return char.isalnum() or char == '_'
+
+
+class KeywordAutomaton:
+    """Find whole-word occurrences of a fixed set of keywords"""
+
+    def __init__(self, keywords):
+        # Surrounding spaces were a boundary hack ("mi "); boundaries are checked here
+        self.keywords = list(dict.fromkeys(k.strip().lower() for k in keywords if k.strip()))
+        self.goto = [{}]
+        self.fail = [0]         # longest proper suffix that is also a trie state
+        self.output = [[]]      # keyword indexes ending at each state, longest first
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(index)
+
+        # Resolve failure links into a full transition table (a DFA), so the
+        # scan is one dict lookup per character with no backtracking. States
+        # are visited breadth first, so a state's failure target is complete
+        # before the state itself.
+        self.delta = [dict(self.goto[0])] + [None] * (len(self.goto) - 1)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = self.fail[state]
+            self.delta[state] = {**self.delta[fallback], **self.goto[state]}
+            self.output[state] = self.output[state] + self.output[fallback]
+            for char, child in self.goto[state].items():
+                self.fail[child] = self.delta[fallback].get(char, 0)
+                queue.append(child)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def finditer(self, text):
+        """Yield (start, keyword) for every whole-word match, in text order of their ends"""
+        text = text.lower()
+        delta, output, keywords = self.delta, self.output, self.keywords
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if not output[state]:
+                continue
+            for index in output[state]:
+                keyword = keywords[index]
+                start = end - len(keyword)
+                if start > 0 and _is_word(text[start - 1]) and _is_word(keyword[0]):
+                    continue
+                if end < len(text) and _is_word(text[end]) and _is_word(keyword[-1]):
+                    continue
+                yield start, keyword
+
+    def counts(self, *texts):
+        """Counter of keyword -> whole-word hits across texts (matched separately)"""
+        hits = Counter()
+        for text in texts:
+            hits.update(keyword for _, keyword in self.finditer(text or ''))
+        return hits
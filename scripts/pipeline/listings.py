@@ -0,0 +1,168 @@
+"""
+Pre-sorted, fixed-size article listing pages.
+
+Every listing the site shows (newest, featured, per category, per tag) is
+written ahead of time as pages of PAGE_SIZE article cards under
+public/listings/<list>/<page>.json, so a listing page reads one small file
+instead of loading and filtering every article.
+
+Each page carries opaque next/prev cursor tokens that name the file to read
+directly. A page is only rewritten when its contents change, so adding one
+article touches the first pages of the lists it belongs to (and the pages
+whose members shifted), not the whole tree.
+
+index.json records the fingerprint of the article manifest the pages were
+built from; lib/articles.ts ignores the pages unless it matches the current,
+up-to-date manifest. `npm run build` rebuilds them first (prebuild). Its
+lists and page counts also say which files the previous build wrote, and
+those are the only files a rebuild deletes: anything else under the output
+directory is left alone.
+"""
+
+import base64
+import json
+import os
+from pathlib import Path
+
+from .slugs import article_slug, create_slug
+from .validators import PUBLIC_DIR
+
+LISTINGS_DIR = PUBLIC_DIR / 'listings'
+PAGE_SIZE = 12   # the blog index shows 12 cards per page
+
+CARD_FIELDS = ('title', 'slug', 'excerpt', 'tags', 'publishedAt', 'featured', 'imageUrl')
+
+
+def encode_cursor(name, page):
+    return base64.urlsafe_b64encode(f"{name}~{page}".encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """(list name, page number) for a cursor token"""
+    padded = token + '=' * (-len(token) % 4)
+    name, _, page = base64.urlsafe_b64decode(padded).decode('utf-8').rpartition('~')
+    return name, int(page)
+
+
+def article_categories(datasets):
+    """slug -> category from the generated datasets (MDX frontmatter has none)"""
+    categories = {}
+    for path in datasets:
+        with open(path, 'r', encoding='utf-8') as f:
+            for article in json.load(f):
+                categories.setdefault(article_slug(article), article.get('category'))
+    return categories
+
+
+def card(entry, category):
+    """The fields a listing card shows"""
+    fields = {field: entry.get(field) for field in CARD_FIELDS}
+    fields['category'] = category
+    return fields
+
+
+def build_lists(entries, categories):
+    """
+    list name -> cards, newest first.
+
+    entries are article manifest entries (already newest first); categories
+    maps slug -> category for the articles the generators produced.
+    """
+    lists = {"newest": [], "featured": []}
+    for entry in entries:
+        category = categories.get(entry['slug'])
+        item = card(entry, category)
+        lists['newest'].append(item)
+        if item['featured']:
+            lists['featured'].append(item)
+        if category:
+            lists.setdefault(f"category/{create_slug(category)}", []).append(item)
+        for tag in {create_slug(tag) for tag in entry.get('tags') or []}:
+            if tag:
+                lists.setdefault(f"tag/{tag}", []).append(item)
+    return lists
+
+
+def paginate(name, cards, page_size=PAGE_SIZE):
+    """Page documents for one list"""
+    pages = max(1, -(-len(cards) // page_size))
+    for number in range(1, pages + 1):
+        yield {
+            "list": name,
+            "page": number,
+            "pages": pages,
+            "pageSize": page_size,
+            "total": len(cards),
+            "articles": cards[(number - 1) * page_size:number * page_size],
+            "next": encode_cursor(name, number + 1) if number < pages else None,
+            "prev": encode_cursor(name, number - 1) if number > 1 else None,
+        }
+
+
+def page_path(directory, name, number):
+    return Path(directory) / name / f"{number}.json"
+
+
+def indexed_pages(directory, index):
+    """Page files a listing index says were written, within directory"""
+    root = Path(directory).resolve()
+    pages = set()
+    for name, info in (index or {}).get('lists', {}).items():
+        for number in range(1, info.get('pages', 0) + 1):
+            path = page_path(directory, name, number)
+            if root in path.resolve().parents:
+                pages.add(path)
+    return pages
+
+
+def write_listings(lists, directory=LISTINGS_DIR, page_size=PAGE_SIZE, fingerprint=None):
+    """
+    Write every page (and index.json) that changed and delete the pages the
+    previous index listed that no longer exist. fingerprint identifies the
+    manifest the lists came from. Returns counts of written, unchanged and
+    removed pages.
+    """
+    directory = Path(directory)
+    counts = {"written": 0, "unchanged": 0, "removed": 0}
+    index_path = directory / 'index.json'
+    try:
+        previous = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        previous = None
+    keep = set()
+    index = {"pageSize": page_size, "manifest": fingerprint, "lists": {}}
+
+    for name, cards in sorted(lists.items()):
+        for page in paginate(name, cards, page_size):
+            path = page_path(directory, name, page['page'])
+            keep.add(path)
+            counts['written' if _write_if_changed(path, page) else 'unchanged'] += 1
+        index['lists'][name] = {"total": len(cards), "pages": page['pages'], "first": encode_cursor(name, 1)}
+
+    _write_if_changed(index_path, index)
+
+    for path in sorted(indexed_pages(directory, previous) - keep):
+        if not path.is_file():
+            continue
+        path.unlink()
+        counts['removed'] += 1
+        # Folders of lists that are gone, up to (not including) directory
+        folder = path.parent
+        while folder != directory and not any(folder.iterdir()):
+            folder.rmdir()
+            folder = folder.parent
+    return counts
+
+
+def _write_if_changed(path, data):
+    text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    Path(tmp).write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,140 @@
+"""
+Frontmatter manifest for content/articles.
+
+Listing and tag pages only need each article's frontmatter, so it is
+collected into one compact file (content/articles-manifest.json) that
+lib/articles.ts reads instead of opening every MDX file.
+
+Refreshes are incremental: a file whose mtime and size match its manifest
+entry is not opened; one that was touched but hashes the same is not
+re-parsed. Changed files are read in parallel.
+
+lib/articles.ts only trusts the manifest while it lists exactly the current
+files with the mtimes and sizes recorded here; otherwise it parses the files
+itself. `npm run build` refreshes it first (prebuild).
+"""
+
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .hashing import content_hash
+from .mdx import ARTICLES_DIR, mdx_files, mdx_slug, parse_mdx
+
+MANIFEST_PATH = ARTICLES_DIR.parent / 'articles-manifest.json'
+MANIFEST_VERSION = 2   # must match lib/articles.ts
+
+# Frontmatter fields copied into the manifest, with their defaults
+SUMMARY_FIELDS = {
+    "title": "",
+    "slug": None,
+    "excerpt": "",
+    "tags": [],
+    "publishedAt": "",
+    "updatedAt": "",
+    "featured": False,
+    "imageUrl": "",
+}
+
+
+def _json_value(value):
+    # Unquoted YAML dates load as date objects; gray-matter loads them as
+    # JS Dates, so store what Date.toISOString() gives for the same value
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+    if isinstance(value, datetime.date):
+        return f"{value.isoformat()}T00:00:00.000Z"
+    return value
+
+
+def published_key(value):
+    """Sort key for publishedAt, the same string lib/articles.ts compares"""
+    return '' if value is None else str(_json_value(value))
+
+
+def manifest_fingerprint(entries):
+    """Hash of the files (and their contents) behind a list of entries, in order"""
+    return content_hash(json.dumps([[entry['file'], entry['hash']] for entry in entries]))
+
+
+def summary_entry(path, data, stat):
+    """Manifest entry for an article file given its raw bytes"""
+    frontmatter, _ = parse_mdx(data.decode('utf-8'))
+    entry = {}
+    for field, default in SUMMARY_FIELDS.items():
+        entry[field] = _json_value(frontmatter.get(field, default))
+    entry['slug'] = entry['slug'] or mdx_slug(path)
+    entry['file'] = path.name
+    entry['hash'] = content_hash(data)
+    entry['mtime'] = stat.st_mtime_ns
+    entry['size'] = stat.st_size
+    return entry
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Entries of an existing manifest keyed by file name ({} if missing or stale)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return {entry['file']: entry for entry in manifest['articles']}
+
+
+def refresh_manifest(previous, articles_dir=ARTICLES_DIR, workers=None):
+    """
+    Bring manifest entries up to date with the article files.
+
+    Returns (entries newest first, counts) where counts has unchanged,
+    touched (same hash, new mtime), parsed and removed.
+    """
+    counts = {"unchanged": 0, "touched": 0, "parsed": 0, "removed": 0}
+
+    def refresh(path):
+        stat = path.stat()
+        old = previous.get(path.name)
+        if old and old['mtime'] == stat.st_mtime_ns and old['size'] == stat.st_size:
+            return 'unchanged', old
+        data = path.read_bytes()
+        if old and old['hash'] == content_hash(data):
+            return 'touched', dict(old, mtime=stat.st_mtime_ns, size=stat.st_size)
+        return 'parsed', summary_entry(path, data, stat)
+
+    files = mdx_files(articles_dir)
+    with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) + 4)) as pool:
+        results = list(pool.map(refresh, files))
+
+    entries = []
+    for status, entry in results:
+        counts[status] += 1
+        entries.append(entry)
+    counts['removed'] = len(set(previous) - {path.name for path in files})
+
+    # Same order as getAllArticles(): newest first, file order for ties
+    entries.sort(key=lambda e: published_key(e['publishedAt']), reverse=True)
+    return entries, counts
+
+
+def write_manifest(entries, path=MANIFEST_PATH):
+    """Write the manifest if it changed; returns True if the file was written"""
+    text = json.dumps(
+        {"version": MANIFEST_VERSION, "fingerprint": manifest_fingerprint(entries), "articles": entries},
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return True
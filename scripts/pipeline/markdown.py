@@ -0,0 +1,656 @@
+"""
+Markdown to mdast and HTML, matching what lib/articles.ts renders.
+
+lib/articles.ts turns article bodies into HTML with remark + remark-gfm +
+remark-html. This module parses the Markdown the articles actually use
+(headings, paragraphs, nested lists, thematic breaks, emphasis, strong,
+strikethrough, inline code, links and images) into the same mdast node
+types and serializes them the way remark-html does, so the HTML can be
+built once here and read back by the site.
+
+Anything outside that subset (block quotes, tables, code blocks, raw HTML,
+autolinks, footnotes, reference definitions, tabs) raises Unsupported;
+those bodies are left to remark.
+"""
+
+import html
+import re
+import unicodedata
+from urllib.parse import quote
+
+# JavaScript's \s, so clean_body() matches the String.replace/trim calls in lib/articles.ts
+JS_SPACE = '\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff'
+EXCESS_INDENT = re.compile(f'\n[{JS_SPACE}]{{4,}}')
+EXCESS_NEWLINES = re.compile(r'\n{3,}')
+JS_TRIM = re.compile(f'^[{JS_SPACE}]+|[{JS_SPACE}]+$')
+
+ATX_HEADING = re.compile(r'^(#{1,6})(?:[ ]+(.*?))?(?:[ ]+#+)?[ ]*$')
+THEMATIC_BREAK = re.compile(r'^(?:(?:\*[ ]*){3,}|(?:-[ ]*){3,}|(?:_[ ]*){3,})$')
+SETEXT_UNDERLINE = re.compile(r'^(=+|-+)[ ]*$')
+BULLET = re.compile(r'^([-+*])( +|$)')
+ORDERED = re.compile(r'^(\d{1,9})([.)])( +|$)')
+TABLE_DELIMITER = re.compile(r'^\|?[ ]*:?-+:?[ ]*(\|[ ]*:?-+:?[ ]*)*\|?$')
+UNSUPPORTED_BLOCK = re.compile(r'^(?:>|<|```|~~~|\[[^\]]+\]:|\[\^)')
+TASK_ITEM = re.compile(r'^\[[ xX]\](?:[ ]|$)')
+
+ENTITY = re.compile(r'&(?:#[0-9]{1,7}|#[xX][0-9a-fA-F]{1,6}|[A-Za-z][A-Za-z0-9]{0,31});')
+# GFM autolink literals and e-mail addresses would become links
+AUTOLINK_LITERAL = re.compile(r'(?i)(?:https?://|www\.|mailto:|xmpp:)|[\w.+-]+@[\w-]+\.[\w.-]*[a-z]')
+ASCII_PUNCTUATION = set('!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~')
+
+# micromark-util-sanitize-uri leaves these as they are
+URI_SAFE = "!#$&'()*+,-./:;=?@_~"
+
+
+class Unsupported(ValueError):
+    """The Markdown uses syntax this renderer does not reproduce"""
+
+
+def clean_body(body):
+    """The whitespace clean-up lib/articles.ts applies before rendering"""
+    body = EXCESS_INDENT.sub('\n', body)
+    body = EXCESS_NEWLINES.sub('\n\n', body)
+    return JS_TRIM.sub('', body)
+
+
+# ---------------------------------------------------------------------------
+# Blocks
+# ---------------------------------------------------------------------------
+
+def _indent(line):
+    return len(line) - len(line.lstrip(' '))
+
+
+def _list_marker(text):
+    """(ordered, marker, start, width of marker + spaces) for a list item line, or None"""
+    match = BULLET.match(text)
+    if match:
+        ordered, marker, start = False, match.group(1), None
+    else:
+        match = ORDERED.match(text)
+        if not match:
+            return None
+        ordered, marker, start = True, match.group(2), int(match.group(1))
+    spaces = len(match.group(match.lastindex))
+    if spaces == 0:
+        raise Unsupported("empty list item")
+    if spaces > 4:
+        raise Unsupported("indented code in list item")
+    return ordered, marker, start, match.end()
+
+
+def _starts_block(text, in_paragraph):
+    """Whether a (de-indented) line starts a new block instead of continuing a paragraph"""
+    if ATX_HEADING.match(text) or THEMATIC_BREAK.match(text) or UNSUPPORTED_BLOCK.match(text):
+        return True
+    try:
+        marker = _list_marker(text)
+    except Unsupported:
+        return False
+    if not marker:
+        return False
+    # Only lists starting at 1 may interrupt a paragraph
+    return not in_paragraph or not marker[0] or marker[2] == 1
+
+
+def _paragraph_or_heading(lines):
+    """A paragraph, or a setext heading when its last line is an underline"""
+    if len(lines) > 1 and '|' in lines[0] and TABLE_DELIMITER.match(lines[1].strip()):
+        raise Unsupported("table")
+    text = '\n'.join(line.lstrip(' ') for line in lines).rstrip(' ')
+    return {"type": "paragraph", "children": parse_inline(text)}
+
+
+def parse_blocks(lines):
+    """
+    Parse lines into mdast block nodes.
+
+    Returns (nodes, spread) where spread tells whether a blank line separates
+    two of the nodes, which makes an enclosing list item loose.
+    """
+    nodes, spread = [], False
+    blank_before = False
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            blank_before = bool(nodes)
+            i += 1
+            continue
+        if '\t' in line[:_indent(line) + 1]:
+            raise Unsupported("tab indentation")
+        if _indent(line) >= 4:
+            raise Unsupported("indented code")
+        spread = spread or blank_before
+        blank_before = False
+        text = line.lstrip(' ')
+
+        if UNSUPPORTED_BLOCK.match(text):
+            raise Unsupported(f"block starting {text[:3]!r}")
+
+        heading = ATX_HEADING.match(text)
+        if heading:
+            content = (heading.group(2) or '').strip()
+            if re.fullmatch(r'#+', content):
+                content = ''
+            nodes.append({"type": "heading", "depth": len(heading.group(1)), "children": parse_inline(content)})
+            i += 1
+            continue
+
+        if THEMATIC_BREAK.match(text):
+            nodes.append({"type": "thematicBreak"})
+            i += 1
+            continue
+
+        if _list_marker(text):
+            node, i = _parse_list(lines, i)
+            nodes.append(node)
+            continue
+
+        # Paragraph: runs until a blank line or a line that starts another block
+        paragraph = [line]
+        i += 1
+        while i < len(lines) and lines[i].strip():
+            text = lines[i].lstrip(' ')
+            underline = SETEXT_UNDERLINE.match(text) if _indent(lines[i]) < 4 else None
+            if underline:
+                node = _paragraph_or_heading(paragraph)
+                nodes.append({
+                    "type": "heading",
+                    "depth": 1 if underline.group(1)[0] == '=' else 2,
+                    "children": node['children'],
+                })
+                paragraph = None
+                i += 1
+                break
+            if _indent(lines[i]) < 4 and _starts_block(text, in_paragraph=True):
+                break
+            paragraph.append(lines[i])
+            i += 1
+        if paragraph:
+            nodes.append(_paragraph_or_heading(paragraph))
+    return nodes, spread
+
+
+def _parse_list(lines, i):
+    """Parse the list starting at lines[i]; returns (list node, next line index)"""
+    first = _list_marker(lines[i].lstrip(' '))
+    ordered, marker, start = first[0], first[1], first[2]
+    items, loose = [], False
+
+    while i < len(lines):
+        line = lines[i]
+        text = line.lstrip(' ')
+        found = _list_marker(text) if _indent(line) < 4 else None
+        if not found or found[0] != ordered or found[1] != marker:
+            break
+        content_column = _indent(line) + found[3]
+        item_lines = [text[found[3]:]]
+        i += 1
+        blanks = 0
+        while i < len(lines):
+            line = lines[i]
+            if not line.strip():
+                blanks += 1
+                i += 1
+                continue
+            if _indent(line) >= content_column:
+                item_lines.extend([''] * blanks)
+                item_lines.append(line[content_column:])
+            elif (
+                not blanks
+                and _indent(line) < 4
+                and not _starts_block(line.lstrip(' '), in_paragraph=False)
+                and _continues_paragraph(item_lines)
+            ):
+                # Lazy continuation of the item's last paragraph
+                item_lines.append(line.lstrip(' '))
+            else:
+                break
+            blanks = 0
+            i += 1
+
+        if TASK_ITEM.match(item_lines[0]):
+            raise Unsupported("task list item")
+        children, item_spread = parse_blocks(item_lines)
+        items.append({"type": "listItem", "spread": item_spread, "children": children})
+        loose = loose or item_spread
+
+        if blanks:
+            # Blank lines between items make the list loose; trailing ones end it
+            following = lines[i] if i < len(lines) else ''
+            follows = _list_marker(following.lstrip(' ')) if following and _indent(following) < 4 else None
+            if follows and follows[0] == ordered and follows[1] == marker:
+                loose = True
+            else:
+                i -= blanks
+                break
+
+    for item in items:
+        item['spread'] = loose
+    node = {"type": "list", "ordered": ordered, "start": start, "spread": loose, "children": items}
+    return node, i
+
+
+def _continues_paragraph(item_lines):
+    """Whether the last line collected for a list item is paragraph text"""
+    last = item_lines[-1] if item_lines else ''
+    if not last.strip():
+        return False
+    text = last.lstrip(' ')
+    while True:
+        # A paragraph inside a nested item: look past the nested markers
+        marker = _list_marker(text) if _indent(text) < 4 else None
+        if not marker:
+            break
+        text = text[marker[3]:].lstrip(' ')
+    return bool(text) and not ATX_HEADING.match(text) and not THEMATIC_BREAK.match(text)
+
+
+# ---------------------------------------------------------------------------
+# Inlines
+# ---------------------------------------------------------------------------
+
+def _classify(char):
+    """micromark's classifyCharacter: 1 whitespace, 2 punctuation, None otherwise"""
+    if char is None or char.isspace():
+        return 1
+    if char in ASCII_PUNCTUATION or unicodedata.category(char)[0] in 'PS':
+        return 2
+    return None
+
+
+def _text(value):
+    return {"type": "text", "value": value}
+
+
+def _find(nodes, target):
+    for index, node in enumerate(nodes):
+        if node is target:
+            return index
+    raise LookupError(target)
+
+
+def _link_destination(s, i):
+    """Parse '(dest "title")' starting at s[i] == '('; returns (url, title, end) or None"""
+    n = len(s)
+    j = i + 1
+
+    def skip_space(j):
+        newlines = 0
+        while j < n and s[j] in ' \n':
+            newlines += s[j] == '\n'
+            if newlines > 1:
+                return None
+            j += 1
+        return j
+
+    j = skip_space(j)
+    if j is None:
+        return None
+    url = ''
+    if j < n and s[j] == '<':
+        end = j + 1
+        while end < n and s[end] not in '<>\n':
+            end += 2 if s[end] == '\\' and end + 1 < n else 1
+        if end >= n or s[end] != '>':
+            return None
+        url, j = s[j + 1:end], end + 1
+    else:
+        depth, start = 0, j
+        while j < n and not s[j].isspace() and ord(s[j]) >= 0x20:
+            if s[j] == '\\' and j + 1 < n and s[j + 1] in ASCII_PUNCTUATION:
+                j += 2
+                continue
+            if s[j] == '(':
+                depth += 1
+            elif s[j] == ')':
+                if depth == 0:
+                    break
+                depth -= 1
+            j += 1
+        if depth:
+            return None
+        url = s[start:j]
+
+    title = None
+    k = skip_space(j)
+    if k is None:
+        return None
+    if k > j and k < n and s[k] in '"\'(':
+        close = ')' if s[k] == '(' else s[k]
+        end = k + 1
+        while end < n and s[end] != close:
+            end += 2 if s[end] == '\\' else 1
+        if end >= n:
+            return None
+        title, k = s[k + 1:end], skip_space(end + 1)
+        if k is None:
+            return None
+    if k >= n or s[k] != ')':
+        return None
+    title = _decode(title) if title is not None else None
+    return _decode(url), title, k + 1
+
+
+def _decode(value):
+    """Resolve backslash escapes and character references"""
+    value = re.sub(r'\\([!-/:-@\[-`{-~])', r'\1', value)
+    return ENTITY.sub(lambda m: html.unescape(m.group(0)), value)
+
+
+def parse_inline(s):
+    """Parse paragraph or heading text into mdast phrasing nodes"""
+    if AUTOLINK_LITERAL.search(s):
+        raise Unsupported("autolink literal")
+    if '\r' in s:
+        raise Unsupported("carriage return")
+
+    nodes = []        # text and phrasing nodes, in order
+    delimiters = []   # emphasis/strikethrough runs: dicts pointing at their text node
+    brackets = []     # '[' and '![' openers
+    buffer = []
+
+    def flush():
+        if buffer:
+            nodes.append(_text(''.join(buffer)))
+            buffer.clear()
+
+    n = len(s)
+    i = 0
+    while i < n:
+        c = s[i]
+        if c == '\\' and i + 1 < n and s[i + 1] == '\n':
+            flush()
+            nodes.append({"type": "break"})
+            i += 2
+            while i < n and s[i] == ' ':
+                i += 1
+        elif c == '\\' and i + 1 < n and s[i + 1] in ASCII_PUNCTUATION:
+            buffer.append(s[i + 1])
+            i += 2
+        elif c == '\n':
+            # Two or more trailing spaces make a hard break; otherwise they are dropped
+            text = ''.join(buffer)
+            buffer[:] = [text.rstrip(' ')]
+            if len(text) - len(buffer[0]) >= 2:
+                flush()
+                nodes.append({"type": "break"})
+            else:
+                buffer.append('\n')
+            i += 1
+            while i < n and s[i] == ' ':
+                i += 1
+        elif c == '`':
+            run = len(s[i:]) - len(s[i:].lstrip('`'))
+            close = re.compile(r'(?<!`)' + '`' * run + r'(?!`)')
+            match = close.search(s, i + run)
+            if not match:
+                buffer.append('`' * run)
+                i += run
+                continue
+            value = s[i + run:match.start()].replace('\n', ' ')
+            if len(value) > 2 and value[0] == ' ' and value[-1] == ' ' and value.strip(' '):
+                value = value[1:-1]
+            flush()
+            nodes.append({"type": "inlineCode", "value": value})
+            i = match.end()
+        elif c == '&':
+            match = ENTITY.match(s, i)
+            if match:
+                buffer.append(html.unescape(match.group(0)))
+                i = match.end()
+            else:
+                buffer.append(c)
+                i += 1
+        elif c == '<':
+            if i + 1 < n and (s[i + 1].isalpha() or s[i + 1] in '/!?'):
+                raise Unsupported("raw HTML or autolink")
+            buffer.append(c)
+            i += 1
+        elif c == '[' or (c == '!' and i + 1 < n and s[i + 1] == '['):
+            if s.startswith('[^', i):
+                raise Unsupported("footnote")
+            flush()
+            width = 1 if c == '[' else 2
+            node = _text(s[i:i + width])
+            nodes.append(node)
+            brackets.append({"node": node, "image": c == '!', "active": True, "bottom": len(delimiters)})
+            i += width
+        elif c == ']':
+            flush()
+            opener = brackets.pop() if brackets else None
+            link = _link_destination(s, i + 1) if opener and opener['active'] and s[i + 1:i + 2] == '(' else None
+            if not link:
+                nodes.append(_text(']'))
+                i += 1
+                continue
+            url, title, end = link
+            start = _find(nodes, opener['node'])
+            inner = nodes[start + 1:]
+            del nodes[start:]
+            _process_emphasis(inner, delimiters, opener['bottom'])
+            inner = _merge_text(inner)
+            if opener['image']:
+                nodes.append({"type": "image", "url": url, "title": title, "alt": _plain_text(inner)})
+            else:
+                nodes.append({"type": "link", "url": url, "title": title, "children": inner})
+                for earlier in brackets:
+                    if not earlier['image']:
+                        earlier['active'] = False
+            i = end
+        elif c in '*_~':
+            run = len(s[i:]) - len(s[i:].lstrip(c))
+            flush()
+            node = _text(c * run)
+            nodes.append(node)
+            before = _classify(s[i - 1] if i else None)
+            after = _classify(s[i + run] if i + run < n else None)
+            if c == '~' and run > 2:
+                i += run
+                continue
+            can_open = not after or (after == 2 and bool(before)) or (c != '~' and s[i + run:i + run + 1] == '~')
+            can_close = not before or (before == 2 and bool(after)) or (c != '~' and i and s[i - 1] == '~')
+            if c == '_':
+                can_open, can_close = can_open and (bool(before) or not can_close), can_close and (bool(after) or not can_open)
+            delimiters.append({"char": c, "node": node, "count": run, "open": can_open, "close": can_close})
+            i += run
+        else:
+            buffer.append(c)
+            i += 1
+    flush()
+
+    _process_emphasis(nodes, delimiters, 0)
+    return _merge_text(nodes)
+
+
+def _process_emphasis(nodes, delimiters, bottom):
+    """
+    Resolve emphasis, strong and strikethrough among delimiters[bottom:]
+    (the CommonMark delimiter algorithm, with GFM's same-length tilde rule).
+
+    Matched runs are replaced in nodes (a list that contains every delimiter
+    node above bottom); unmatched ones stay as text.
+    """
+    closer_index = bottom
+    while closer_index < len(delimiters):
+        closer = delimiters[closer_index]
+        if not closer['close']:
+            closer_index += 1
+            continue
+
+        opener_index = None
+        for index in range(closer_index - 1, bottom - 1, -1):
+            opener = delimiters[index]
+            if opener['char'] != closer['char'] or not opener['open']:
+                continue
+            if closer['char'] == '~':
+                if opener['count'] != closer['count']:
+                    continue
+            elif (opener['close'] or closer['open']) and (opener['count'] + closer['count']) % 3 == 0 \
+                    and not (opener['count'] % 3 == 0 and closer['count'] % 3 == 0):
+                continue
+            opener_index = index
+            break
+
+        if opener_index is None:
+            closer_index += 1
+            continue
+
+        opener = delimiters[opener_index]
+        if closer['char'] == '~':
+            use, kind = opener['count'], "delete"
+        else:
+            use = 2 if opener['count'] >= 2 and closer['count'] >= 2 else 1
+            kind = "strong" if use == 2 else "emphasis"
+
+        start = _find(nodes, opener['node'])
+        end = _find(nodes, closer['node'])
+        wrapped = {"type": kind, "children": _merge_text(nodes[start + 1:end])}
+        opener['count'] -= use
+        closer['count'] -= use
+        opener['node']['value'] = opener['node']['value'][:opener['count']]
+        closer['node']['value'] = closer['node']['value'][use:]
+        nodes[start + 1:end] = [wrapped]
+
+        # Delimiters inside the new node can no longer match anything
+        del delimiters[opener_index + 1:closer_index]
+        closer_index = opener_index + 1
+        if opener['count'] == 0:
+            nodes.pop(_find(nodes, opener['node']))
+            del delimiters[opener_index]
+            closer_index -= 1
+        if closer['count'] == 0:
+            nodes.pop(_find(nodes, closer['node']))
+            del delimiters[closer_index]
+
+    del delimiters[bottom:]
+
+
+def _merge_text(nodes):
+    """Join adjacent text nodes and drop empty ones, as mdast does"""
+    merged = []
+    for node in nodes:
+        if node['type'] == 'text':
+            if not node['value']:
+                continue
+            if merged and merged[-1]['type'] == 'text':
+                merged[-1] = _text(merged[-1]['value'] + node['value'])
+                continue
+        merged.append(node)
+    return merged
+
+
+def _plain_text(nodes):
+    """mdast-util-to-string, used for image alt text"""
+    parts = []
+    for node in nodes:
+        if 'value' in node:
+            parts.append(node['value'])
+        elif node['type'] == 'image':
+            parts.append(node['alt'])
+        elif 'children' in node:
+            parts.append(_plain_text(node['children']))
+    return ''.join(parts)
+
+
+def parse(markdown):
+    """mdast root for a Markdown document; raises Unsupported"""
+    children, _ = parse_blocks(markdown.split('\n'))
+    return {"type": "root", "children": children}
+
+
+# ---------------------------------------------------------------------------
+# HTML (mdast-util-to-hast + hast-util-to-html, as configured by remark-html)
+# ---------------------------------------------------------------------------
+
+def _escape_text(value):
+    return value.replace('&', '&#x26;').replace('<', '&#x3C;')
+
+
+def _escape_attribute(value):
+    return value.replace('&', '&#x26;').replace('"', '&#x22;')
+
+
+def normalize_uri(url):
+    """micromark-util-sanitize-uri normalizeUri: percent-encode unsafe characters"""
+    out = []
+    i = 0
+    while i < len(url):
+        c = url[i]
+        if c == '%' and re.match(r'[0-9A-Fa-f]{2}', url[i + 1:i + 3]):
+            out.append(url[i:i + 3])
+            i += 3
+            continue
+        if c.isascii() and (c.isalnum() or c in URI_SAFE):
+            out.append(c)
+        else:
+            out.append(quote(c, safe='', errors='replace'))
+        i += 1
+    return ''.join(out)
+
+
+def _attributes(pairs):
+    return ''.join(f' {name}="{_escape_attribute(str(value))}"' for name, value in pairs if value is not None)
+
+
+def _render_inline(nodes):
+    parts = []
+    for node in nodes:
+        kind = node['type']
+        if kind == 'text':
+            parts.append(_escape_text(node['value']))
+        elif kind == 'break':
+            parts.append('<br>\n')
+        elif kind == 'inlineCode':
+            parts.append(f"<code>{_escape_text(node['value'])}</code>")
+        elif kind in ('emphasis', 'strong', 'delete'):
+            tag = {"emphasis": "em", "strong": "strong", "delete": "del"}[kind]
+            parts.append(f"<{tag}>{_render_inline(node['children'])}</{tag}>")
+        elif kind == 'link':
+            attrs = _attributes([('href', normalize_uri(node['url'])), ('title', node['title'])])
+            parts.append(f"<a{attrs}>{_render_inline(node['children'])}</a>")
+        elif kind == 'image':
+            attrs = _attributes([('src', normalize_uri(node['url'])), ('alt', node['alt']), ('title', node['title'])])
+            parts.append(f"<img{attrs}>")
+        else:
+            raise Unsupported(kind)
+    return ''.join(parts)
+
+
+def _render_block(node):
+    kind = node['type']
+    if kind == 'heading':
+        return f"<h{node['depth']}>{_render_inline(node['children'])}</h{node['depth']}>"
+    if kind == 'paragraph':
+        return f"<p>{_render_inline(node['children'])}</p>"
+    if kind == 'thematicBreak':
+        return '<hr>'
+    if kind == 'list':
+        tag = 'ol' if node['ordered'] else 'ul'
+        start = f' start="{node["start"]}"' if node['ordered'] and node['start'] != 1 else ''
+        items = '\n'.join(_render_item(item, node['spread']) for item in node['children'])
+        return f"<{tag}{start}>\n{items}\n</{tag}>"
+    raise Unsupported(kind)
+
+
+def _render_item(item, loose):
+    parts = []
+    children = item['children']
+    for index, child in enumerate(children):
+        paragraph = child['type'] == 'paragraph'
+        if loose or index or not paragraph:
+            parts.append('\n')
+        if paragraph and not loose:
+            parts.append(_render_inline(child['children']))
+        else:
+            parts.append(_render_block(child))
+    if children and (loose or children[-1]['type'] != 'paragraph'):
+        parts.append('\n')
+    return f"<li>{''.join(parts)}</li>"
+
+
+def to_html(tree):
+    """Serialize an mdast root the way remark-html does"""
+    result = '\n'.join(_render_block(node) for node in tree['children'])
+    return result + '\n' if result and result[-1] not in '\r\n' else result
@@ -0,0 +1,43 @@
+"""
+Reading content/articles/*.mdx files (YAML frontmatter + Markdown body).
+"""
+
+from pathlib import Path
+
+import yaml
+
+ARTICLES_DIR = Path(__file__).resolve().parents[2] / 'content' / 'articles'
+
+
+def split_frontmatter(text):
+    """Split a document into (frontmatter text, body) the way gray-matter does"""
+    if not text.startswith('---'):
+        return '', text
+    end = text.find('\n---', 3)
+    if end == -1:
+        return '', text
+    body_start = text.find('\n', end + 4)
+    body = text[body_start + 1:] if body_start != -1 else ''
+    return text[3:end].strip('\n'), body
+
+
+def parse_mdx(text):
+    """Return (frontmatter dict, Markdown body) for an article's text"""
+    frontmatter, body = split_frontmatter(text)
+    return (yaml.safe_load(frontmatter) or {}), body
+
+
+def read_mdx(path):
+    """Return (frontmatter dict, Markdown body) for an article file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_mdx(f.read())
+
+
+def mdx_files(articles_dir=ARTICLES_DIR):
+    """Article files in a stable order (.mdx and .md, like lib/articles.ts)"""
+    return sorted(p for p in Path(articles_dir).iterdir() if p.suffix in ('.mdx', '.md'))
+
+
+def mdx_slug(path):
+    """URL slug of an article file (lib/articles.ts routes by file name)"""
+    return Path(path).stem
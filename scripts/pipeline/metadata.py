@@ -0,0 +1,85 @@
+"""
+Per-article metadata computed once at generation time.
+
+Reading time, word count, table-of-contents headings and image lists are
+derived from the article body here so listing pages and TableOfContents
+can read a small sidecar instead of parsing every body.
+"""
+
+import json
+import math
+import re
+
+from .output import atomic_open
+from .slugs import article_slug
+
+WORDS_PER_MINUTE = 200
+
+HTML_HEADING = re.compile(r'<h([23])[^>]*>(.*?)</h\1>', re.IGNORECASE | re.DOTALL)
+MD_HEADING = re.compile(r'^(#{2,3})\s+(.+?)\s*#*\s*$', re.MULTILINE)
+HTML_IMAGE = re.compile(r'<img\b[^>]*?\bsrc="([^"]+)"', re.IGNORECASE)
+MD_IMAGE = re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)')
+MD_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+STYLE_OR_SCRIPT = re.compile(r'<(style|script)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+TAG = re.compile(r'<[^>]+>')
+MD_MARKUP = re.compile(r'[*_`~>#|]')
+WORD = re.compile(r"[^\W_]+(?:['’-][^\W_]+)*")
+
+
+def plain_text(content):
+    """Strip HTML tags and Markdown markup, leaving the readable text"""
+    text = STYLE_OR_SCRIPT.sub(' ', content)
+    text = TAG.sub(' ', text)
+    text = MD_LINK.sub(r'\1', text)
+    return MD_MARKUP.sub(' ', text)
+
+
+def heading_id(text):
+    """Anchor id, matching the rule in app/components/blog/TableOfContents.tsx"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def extract_headings(content):
+    """h2/h3 headings in document order, from HTML or Markdown bodies"""
+    found = [(m.start(), int(m.group(1)), m.group(2)) for m in HTML_HEADING.finditer(content)]
+    found += [(m.start(), len(m.group(1)), m.group(2)) for m in MD_HEADING.finditer(content)]
+
+    headings = []
+    for _, level, raw in sorted(found):
+        text = ' '.join(plain_text(raw).split())
+        if text:
+            headings.append({"id": heading_id(text), "text": text, "level": level})
+    return headings
+
+
+def extract_images(content):
+    """Image sources in document order, without duplicates"""
+    found = [(m.start(), m.group(1)) for m in HTML_IMAGE.finditer(content)]
+    found += [(m.start(), m.group(1)) for m in MD_IMAGE.finditer(content)]
+    return list(dict.fromkeys(src for _, src in sorted(found)))
+
+
+def content_metadata(content):
+    """Reading time, word count, headings and images for one article body"""
+    word_count = len(WORD.findall(plain_text(content)))
+    return {
+        "wordCount": word_count,
+        "readingTime": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+        "headings": extract_headings(content),
+        "images": extract_images(content),
+    }
+
+
+class MetadataCollector:
+    """Compute metadata for articles as they stream past, keyed by slug"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def observe(self, article):
+        self.entries[article_slug(article)] = content_metadata(article['content'])
+        return article
+
+    def write(self, path):
+        with atomic_open(path) as f:
+            json.dump(self.entries, f, ensure_ascii=False, separators=(',', ':'))
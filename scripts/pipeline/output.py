@@ -0,0 +1,129 @@
+"""
+Readers and writers for generated article datasets.
+"""
+
+import json
+import os
+import textwrap
+from contextlib import contextmanager
+
+READ_BLOCK = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def write_json_array(path, records):
+    """
+    Write records to a JSON array file one element at a time.
+
+    The output is byte-for-byte what json.dump(list(records), f, indent=2,
+    ensure_ascii=False) would produce, but only one record is held in memory.
+    The file is replaced atomically (see atomic_open). Returns the number of
+    records written.
+    """
+    count = 0
+    with atomic_open(path) as f:
+        for record in records:
+            f.write(json_array_element(record, first=count == 0))
+            count += 1
+        f.write(json_array_end(count))
+    return count
+
+
+@contextmanager
+def atomic_open(path, mode='w'):
+    """
+    Open a temp file next to path for writing; it replaces path when the
+    block exits normally and is removed if it raises, so a failed run leaves
+    the previous file untouched instead of truncated or half-written.
+    """
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def json_array_item(record):
+    """One element of write_json_array's output, without the separator"""
+    return textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), '  ')
+
+
+def json_array_separator(first):
+    """What write_json_array writes before an element"""
+    return '[\n' if first else ',\n'
+
+
+def json_array_element(record, first):
+    """One element of write_json_array's output, with the separator before it"""
+    return json_array_separator(first) + json_array_item(record)
+
+
+def json_array_end(count):
+    """What write_json_array writes after count elements"""
+    return '\n]' if count else '[]'
+
+
+def iter_json_array(path, block_size=READ_BLOCK):
+    """
+    Yield the elements of a JSON array file one at a time.
+
+    The file is read in blocks and each element is decoded as soon as it is
+    complete, so memory holds one element (plus a block) however large the
+    file is. Raises ValueError if the file is not a JSON array.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+
+        def fill():
+            nonlocal buffer, position, eof
+            block = f.read(block_size)
+            buffer = buffer[position:] + block
+            position = 0
+            eof = not block
+
+        def skip(expected=None):
+            """Skip whitespace and return the next character (consumed if expected)"""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    position += 1
+                if position < len(buffer) or eof:
+                    break
+                fill()
+            char = buffer[position] if position < len(buffer) else ''
+            if expected is not None and char in expected:
+                position += 1
+            return char
+
+        if skip('[') != '[':
+            raise ValueError(f"{path}: expected a JSON array")
+        if skip(']') == ']':
+            return
+        while True:
+            skip()
+            while True:
+                try:
+                    value, end = _decoder.raw_decode(buffer, position)
+                    # A number cut off by the block edge ("22." of "22.5")
+                    # still decodes, so wait until a delimiter follows it
+                    if eof or (end < len(buffer) and buffer[end] in _DELIMITERS):
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+            position = end
+            yield value
+            separator = skip(',]')
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"{path}: expected ',' or ']' after element")
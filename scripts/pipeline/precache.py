@@ -0,0 +1,186 @@
+"""
+Offline precache manifest for the service worker (public/sw.js).
+
+Candidates are the article pages (/blog/<slug>, one per article manifest
+entry), each article's hero ECG image, and the video catalog written as
+small JSON shards under public/offline/videos/ with content hashes in their
+file names (the offline copy of the catalog the /videos page lists). Every
+candidate gets a priority score from its featured flag, category and place
+in the hot ranking (scripts/hot-articles.json, from aggregate-views.py); the
+manifest lists the highest-priority candidates that fit in the byte budget,
+in priority order, so the service worker fetches the most useful content
+first and never more than the budget.
+
+The manifest is written before `next build` (prebuild), so pages are known
+by their source rather than their HTML: a page's revision is the hash of its
+MDX file, and its size an estimate from the MDX size.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from .hashing import content_hash, file_hash
+from .slugs import create_slug
+from .validators import PUBLIC_DIR
+from .videos import VIDEOS_DIR, load_yaml_files
+
+OFFLINE_DIR = PUBLIC_DIR / 'offline'
+MANIFEST_PATH = PUBLIC_DIR / 'precache-manifest.json'
+DEFAULT_BUDGET = 8 * 1024 * 1024
+
+FEATURED_BONUS = 3.0
+HOT_BONUS = 4.0      # the hottest entry of the ranking; the rest in proportion
+IMAGE_FACTOR = 0.8   # an article's image ranks just below the article itself
+
+# Estimated size of a rendered article page: the layout and scripts, plus
+# the body twice over (the HTML and the RSC payload carrying it)
+PAGE_BASE_BYTES = 48 * 1024
+PAGE_BYTES_PER_SOURCE_BYTE = 3
+
+ARTICLE_CATEGORY_PRIORITY = {
+    "clinical": 2.0,
+    "education": 1.5,
+    "technology": 1.0,
+}
+VIDEO_CATEGORY_PRIORITY = {
+    "ECG Fundamentals": 3.0,
+    "ECG Interpretation": 2.5,
+    "Arrhythmias": 2.5,
+    "Conduction Blocks": 2.0,
+    "STEMI & MI": 2.0,
+    "ECG Education": 1.5,
+    "Emergency Medicine": 1.0,
+    "Case Studies": 1.0,
+}
+DEFAULT_PRIORITY = 1.0
+
+VIDEO_FIELDS = ('videoId', 'title', 'description', 'thumbnailUrl', 'duration', 'publishedAt', 'category')
+
+SHARD_NAME = re.compile(r'^(.+)\.[0-9a-f]{16}\.json$')
+
+
+class ShardWriter:
+    """Write content-addressed JSON shards and delete the ones no longer produced"""
+
+    def __init__(self, directory, root=PUBLIC_DIR):
+        self.directory = Path(directory)
+        self.root = Path(root)   # served as /
+        self.written = set()
+
+    def write(self, name, data):
+        """Write <name>.<hash>.json (unless it exists); returns (url, hash, size)"""
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        hashed = content_hash(text)
+        path = self.directory / f"{name}.{hashed}.json"
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding='utf-8')
+        self.written.add(path.name)
+        url = '/' + path.relative_to(self.root).as_posix()
+        return url, hashed, path.stat().st_size
+
+    def prune(self):
+        removed = 0
+        if self.directory.is_dir():
+            for path in self.directory.glob('*.json'):
+                if SHARD_NAME.match(path.name) and path.name not in self.written:
+                    path.unlink()
+                    removed += 1
+        return removed
+
+
+def hot_bonuses(ranking):
+    """(route, slug) -> bonus from a hot ranking ({(route, slug): score}), relative to its top score"""
+    top = max(ranking.values(), default=0)
+    if top <= 0:
+        return {}
+    return {key: round(HOT_BONUS * score / top, 3) for key, score in ranking.items()}
+
+
+def page_size(source_size):
+    return PAGE_BASE_BYTES + PAGE_BYTES_PER_SOURCE_BYTE * source_size
+
+
+def article_candidates(entries, categories, bonuses, public_dir=PUBLIC_DIR):
+    """Yield the page entry of every article manifest entry, and its hero image entry"""
+    for entry in entries:
+        slug = entry['slug']
+        category = categories.get(slug, 'education')
+        priority = ARTICLE_CATEGORY_PRIORITY.get(category, DEFAULT_PRIORITY)
+        if entry.get('featured'):
+            priority += FEATURED_BONUS
+        priority += bonuses.get(('blog', slug), 0.0)
+
+        yield {
+            "url": f"/blog/{slug}",
+            "revision": entry['hash'],
+            "size": page_size(entry['size']),
+            "kind": "page",
+            "priority": priority,
+        }
+
+        image = entry.get('imageUrl') or ''
+        image_path = Path(public_dir) / image.lstrip('/')
+        if image.startswith('/') and image_path.is_file():
+            yield {
+                "url": image,
+                "revision": file_hash(image_path),
+                "size": image_path.stat().st_size,
+                "kind": "image",
+                "priority": round(priority * IMAGE_FACTOR, 3),
+            }
+
+
+def video_candidates(shards, bonuses, videos_dir=VIDEOS_DIR):
+    """One catalog shard per video category, ranked by the category and its hottest video"""
+    by_category = {}
+    paths = sorted(Path(videos_dir).glob('*.yaml'))
+    for path, data in zip(paths, load_yaml_files(paths)):
+        if not data:
+            continue
+        video = {field: data.get(field) for field in VIDEO_FIELDS}
+        video['slug'] = path.stem
+        by_category.setdefault(data.get('category') or 'Uncategorized', []).append(video)
+
+    for category, videos in sorted(by_category.items()):
+        url, hashed, size = shards.write(create_slug(category), {"category": category, "videos": videos})
+        hottest = max(bonuses.get(('watch', video['slug']), 0.0) for video in videos)
+        yield {
+            "url": url,
+            "revision": hashed,
+            "size": size,
+            "kind": "videos",
+            "priority": VIDEO_CATEGORY_PRIORITY.get(category, DEFAULT_PRIORITY) + hottest,
+        }
+
+
+def select(candidates, budget):
+    """
+    Highest priority first, skipping anything that no longer fits the budget.
+
+    Returns (selected, skipped); duplicates (an image used by two articles)
+    keep their highest priority.
+    """
+    best = {}
+    for entry in candidates:
+        if entry['url'] not in best or entry['priority'] > best[entry['url']]['priority']:
+            best[entry['url']] = entry
+
+    selected, skipped, used = [], [], 0
+    for entry in sorted(best.values(), key=lambda e: (-e['priority'], e['size'], e['url'])):
+        if used + entry['size'] <= budget:
+            selected.append(entry)
+            used += entry['size']
+        else:
+            skipped.append(entry)
+    return selected, skipped
+
+
+def build_manifest(selected, budget):
+    return {
+        "version": content_hash(json.dumps([[e['url'], e['revision']] for e in selected])),
+        "budget": budget,
+        "bytes": sum(e['size'] for e in selected),
+        "entries": selected,
+    }
@@ -0,0 +1,158 @@
+"""
+Streaming readers for condition catalogs stored as CSV or JSONL.
+
+Records are read and validated one at a time, so catalogs of any size can be
+fed to the generators without loading the whole file into memory. Malformed
+rows are reported and skipped instead of aborting the run.
+
+CSV list fields (features, tags, ecg_criteria, images) use "|" between items.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+LIST_SEPARATOR = "|"
+
+# Field name -> expected type for an ECG condition record
+ECG_CONDITION_FIELDS = {
+    "name": str,
+    "filename": str,
+    "rate": str,
+    "features": list,
+    "significance": str,
+    "management": str,
+    "tags": list,
+    "category": str,
+    "difficulty": str,
+}
+
+# Field name -> expected type for an MI type record (mi_type is the image folder)
+MI_TYPE_FIELDS = {
+    "mi_type": str,
+    "title_base": str,
+    "short_name": str,
+    "description": str,
+    "significance": str,
+    "leads": str,
+    "artery": str,
+    "complications": str,
+    "ecg_criteria": list,
+    "emergency_management": str,
+    "mortality": str,
+    "images": list,
+}
+
+# Fields that may legitimately be empty (MI types without their own images)
+EMPTY_ALLOWED = {"images"}
+
+# Allowed values for fields that drive template branches
+FIELD_CHOICES = {
+    "category": {"clinical", "education", "technology"},
+    "difficulty": {"beginner", "intermediate", "advanced"},
+}
+
+
+class RecordError(ValueError):
+    """Raised when a catalog row is missing fields or has the wrong shape"""
+
+
+class RowErrors:
+    """Default error handler: print each malformed row and keep a count"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, source, line_no, error):
+        self.count += 1
+        print(f"⚠️  Skipping {source}:{line_no}: {error}")
+
+
+def split_list(value):
+    """Split a CSV cell into list items"""
+    return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+
+
+def validate_record(raw, fields):
+    """Check a raw row against a field spec and return a clean record"""
+    if not isinstance(raw, dict):
+        raise RecordError(f"expected an object, got {type(raw).__name__}")
+
+    record = {}
+    for name, kind in fields.items():
+        value = raw.get(name)
+        if value is None:
+            raise RecordError(f"missing field '{name}'")
+
+        if kind is list:
+            if isinstance(value, str):
+                value = split_list(value)
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise RecordError(f"field '{name}' must be a list of strings")
+        elif not isinstance(value, str):
+            raise RecordError(f"field '{name}' must be a string")
+        else:
+            value = value.strip()
+
+        if not value and name not in EMPTY_ALLOWED:
+            raise RecordError(f"field '{name}' is empty")
+        if name in FIELD_CHOICES and value not in FIELD_CHOICES[name]:
+            allowed = ", ".join(sorted(FIELD_CHOICES[name]))
+            raise RecordError(f"field '{name}' is '{value}' (expected one of: {allowed})")
+
+        record[name] = value
+
+    return record
+
+
+def _read_csv(f, path, on_error):
+    with f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if None in row:
+                on_error(path, reader.line_num, RecordError(f"{len(row[None])} extra value(s) in row"))
+                continue
+            yield reader.line_num, row
+
+
+def _read_jsonl(f, path, on_error):
+    with f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                on_error(path, line_no, RecordError(f"invalid JSON: {e.msg}"))
+
+
+def stream_records(path, fields, on_error=None):
+    """
+    Yield validated records from a .csv or .jsonl catalog, one row at a time.
+
+    on_error(source, line_no, error) is called for every malformed row; the
+    row is skipped and reading continues. The format is checked and the file
+    opened before this returns, so an unsupported or missing catalog fails
+    here rather than on the first record (after the output was opened).
+    """
+    path = Path(path)
+    on_error = on_error or RowErrors()
+
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        read = _read_csv
+    elif suffix in ('.jsonl', '.ndjson'):
+        read = _read_jsonl
+    else:
+        raise ValueError(f"Unsupported catalog format '{path.suffix}' (expected .csv or .jsonl)")
+
+    rows = read(open(path, 'r', encoding='utf-8', newline=''), path, on_error)
+    return _validated(rows, path, fields, on_error)
+
+
+def _validated(rows, path, fields, on_error):
+    for line_no, raw in rows:
+        try:
+            yield validate_record(raw, fields)
+        except RecordError as e:
+            on_error(path, line_no, e)
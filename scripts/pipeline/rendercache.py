@@ -0,0 +1,103 @@
+"""
+On-disk cache of parsed article bodies, keyed by content hash.
+
+Each article body is cleaned the way lib/articles.ts does it, hashed, and
+parsed once into mdast plus the HTML remark-html would produce. The result
+lives in .markdown-cache/<hash>.json; lib/articles.ts hashes the same
+cleaned text and uses the cached HTML instead of running remark, so only
+new or edited articles are ever parsed again.
+
+The hash also covers the remark, remark-gfm and remark-html versions locked
+in package-lock.json: the cached HTML stands in for what those versions
+render, so upgrading any of them misses every entry until the cache is
+rebuilt (and the parity test has checked the new output).
+
+Bodies the renderer does not cover (see markdown.Unsupported) get no entry
+and are rendered by remark as before.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from .hashing import content_hash
+from .markdown import Unsupported, clean_body, parse, to_html
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = ROOT / '.markdown-cache'
+PACKAGE_LOCK = ROOT / 'package-lock.json'
+RENDER_PACKAGES = ('remark', 'remark-gfm', 'remark-html')   # as listed in lib/articles.ts
+# Bump when the parser or HTML output changes so old entries are rebuilt
+# (and in lib/articles.ts, which ignores entries of any other version)
+RENDERER_VERSION = 1
+
+
+def renderer_id(lock_path=PACKAGE_LOCK):
+    """
+    "remark@15.0.1 remark-gfm@4.0.1 remark-html@16.0.1" from package-lock.json,
+    as computed by lib/articles.ts (an empty version for a missing package)
+    """
+    try:
+        with open(lock_path, 'r', encoding='utf-8') as f:
+            packages = json.load(f).get('packages', {})
+    except (OSError, ValueError):
+        packages = {}
+    return ' '.join(
+        f"{name}@{(packages.get(f'node_modules/{name}') or {}).get('version', '')}" for name in RENDER_PACKAGES
+    )
+
+
+def markdown_key(markdown, renderer):
+    """Cache key of cleaned Markdown rendered by the given renderer_id()"""
+    return content_hash(f"{renderer}\n{markdown}")
+
+
+def cache_key(body, renderer=None):
+    """Key of an article body, as computed by lib/articles.ts"""
+    return markdown_key(clean_body(body), renderer_id() if renderer is None else renderer)
+
+
+def load_entry(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('version') == RENDERER_VERSION else None
+
+
+def render_cached(body, renderer, cache_dir=CACHE_DIR):
+    """
+    Make sure the body has a cache entry for renderer (a renderer_id()).
+
+    Returns (status, key) with status 'hit', 'parsed' or 'unsupported'.
+    """
+    markdown = clean_body(body)
+    key = markdown_key(markdown, renderer)
+    path = Path(cache_dir) / f"{key}.json"
+    if load_entry(path):
+        return 'hit', key
+    try:
+        tree = parse(markdown)
+        entry = {"version": RENDERER_VERSION, "renderer": renderer, "hash": key, "html": to_html(tree), "ast": tree}
+    except Unsupported:
+        return 'unsupported', key
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, path)
+    return 'parsed', key
+
+
+def prune(keys, cache_dir=CACHE_DIR):
+    """Delete entries whose hash is not in keys; returns how many were removed"""
+    removed = 0
+    cache_dir = Path(cache_dir)
+    if cache_dir.is_dir():
+        for path in cache_dir.glob('*.json'):
+            if path.stem not in keys:
+                path.unlink()
+                removed += 1
+    return removed
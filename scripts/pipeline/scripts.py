@@ -0,0 +1,72 @@
+"""
+Registry of the pipeline's command-line scripts and a loader for them.
+
+The scripts have hyphenated file names, so long-running tools (the daemon,
+watch mode) import them by path. Importing is side-effect free because every
+script keeps its work behind if __name__ == "__main__".
+"""
+
+import importlib.util
+import inspect
+from pathlib import Path
+
+from .records import ECG_CONDITION_FIELDS, MI_TYPE_FIELDS
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+# Generator key -> script, output written when run from scripts/, the
+# catalog variable and field spec, and the field that names a record
+GENERATORS = {
+    'clean-rhythm': {
+        'script': 'generate-ecg-articles.py',
+        'output': 'ecg-articles-clean-rhythm.json',
+        'catalog': 'ecg_conditions',
+        'fields': ECG_CONDITION_FIELDS,
+        'name_field': 'name',
+    },
+    'v2': {
+        'script': 'generate-ecg-articles-v2.py',
+        'output': 'ecg-blog-articles-v2.json',
+        'catalog': 'ecg_conditions',
+        'fields': ECG_CONDITION_FIELDS,
+        'name_field': 'name',
+    },
+    'best-images': {
+        'script': 'generate-best-ecg-articles.py',
+        'output': 'ecg-blog-best-images.json',
+        'catalog': 'ecg_conditions',
+        'fields': ECG_CONDITION_FIELDS,
+        'name_field': 'name',
+    },
+    'mi': {
+        'script': 'generate-mi-articles.py',
+        'output': '../public/scripts/mi-ecg-articles.json',
+        'catalog': 'mi_types',
+        'fields': MI_TYPE_FIELDS,
+        'name_field': 'short_name',
+    },
+}
+
+VIDEO_CATEGORIES_SCRIPT = 'fix-video-categories.py'
+
+
+def load_script(filename):
+    """Import a script from scripts/ as a module"""
+    path = SCRIPTS_DIR / filename
+    name = path.stem.replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_records(module, records, start=0):
+    """
+    Render a slice of a generator's catalog.
+
+    start is the catalog position of the first record, for generators whose
+    output depends on position (generate-ecg-articles.py features the first 5).
+    """
+    if 'start' in inspect.signature(module.generate_articles).parameters:
+        return module.generate_articles(records, start=start)
+    return module.generate_articles(records)
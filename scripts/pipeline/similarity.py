@@ -0,0 +1,118 @@
+"""
+Top-k similarity between catalog entries, for "X vs Y" comparison pages.
+
+Each entry is a sparse TF-IDF vector over the words of its weighted fields
+(features, tags, differentials...). Scores are accumulated through an
+inverted index, so an entry is only ever compared with entries it shares a
+word with, and only its k best partners are kept. The number of pairs is at
+most n * k instead of n * (n - 1) / 2.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+WORD = re.compile(r"[a-z0-9][a-z0-9'₂-]*")
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its may of on or the to with without
+    than that this often usually can more most less not no all each other into per vs
+""".split())
+
+
+def tokenize(text):
+    return [w for w in WORD.findall(text.lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+def term_counts(fields):
+    """fields: list of (text, weight) -> weighted term counts"""
+    counts = Counter()
+    for text, weight in fields:
+        for word in tokenize(text):
+            counts[word] += weight
+    return counts
+
+
+def tfidf_vectors(documents, max_df=0.5):
+    """
+    documents: {key: term counts} -> {key: unit-length {term: weight}}
+
+    Terms found in more than max_df of the documents are dropped: they say
+    little about similarity and their postings are what makes scoring quadratic.
+    """
+    document_frequency = Counter()
+    for counts in documents.values():
+        document_frequency.update(counts.keys())
+    total = len(documents)
+    common = {term for term, df in document_frequency.items() if df > max(1, max_df * total)}
+
+    vectors = {}
+    for key, counts in documents.items():
+        vector = {
+            term: (1 + math.log(count)) * math.log((1 + total) / (1 + document_frequency[term]))
+            for term, count in counts.items() if term not in common
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vectors[key] = {term: w / norm for term, w in vector.items() if w > 0}
+    return vectors
+
+
+def mention_links(texts, aliases, bonus):
+    """
+    Links for top_k_pairs from entries whose text names another entry.
+
+    texts: {key: text}; aliases: {key: [phrases]}. One regex pass per text.
+    """
+    owner = {}
+    for key, phrases in aliases.items():
+        for phrase in phrases:
+            owner.setdefault(phrase.lower(), key)
+    if not owner:
+        return {}
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(re.escape(p) for p in sorted(owner, key=len, reverse=True)) + r')\b'
+    )
+
+    links = defaultdict(dict)
+    for key, text in texts.items():
+        for match in pattern.finditer(text.lower()):
+            other = owner[match.group(0)]
+            if other != key:
+                links[key][other] = bonus
+                links[other][key] = bonus
+    return links
+
+
+def top_k_pairs(vectors, k, min_score=0.0, links=None, allowed=None):
+    """
+    Return {(a, b): score} for the k most similar partners of every key.
+
+    links maps key -> {other: bonus} added to the cosine score (e.g. for a
+    listed differential) and allowed(a, b) can veto a pair. Keys in a pair
+    are in sorted order.
+    """
+    links = links or {}
+    postings = defaultdict(list)
+    for key, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((key, weight))
+
+    pairs = {}
+    for key, vector in vectors.items():
+        scores = defaultdict(float)
+        for term, weight in vector.items():
+            for other, other_weight in postings[term]:
+                if other != key:
+                    scores[other] += weight * other_weight
+        for other, extra in links.get(key, {}).items():
+            scores[other] += extra
+
+        candidates = (
+            (score, other) for other, score in scores.items()
+            if score >= min_score and (allowed is None or allowed(key, other))
+        )
+        for score, other in heapq.nlargest(k, candidates, key=lambda c: (c[0], c[1])):
+            pair = tuple(sorted((key, other)))
+            pairs[pair] = max(pairs.get(pair, 0.0), score)
+    return pairs
@@ -0,0 +1,194 @@
+"""
+Slug membership filter and legacy redirect table for the middleware.
+
+Both structures are written to lib/slug-index.json and read by
+lib/slugIndex.ts, which reimplements the lookups below; the hashing must
+stay identical on both sides.
+
+Keys are route-qualified ("blog/<slug>", "watch/<slug>") so an article slug
+never matches a video URL or the other way round.
+
+- Bloom filter: every valid page key. A miss means the page certainly does
+  not exist, so the middleware can answer 404 without touching the data
+  layer; a hit may be a false positive (ERROR_RATE) and is passed on.
+- Redirect table: legacy key -> canonical key, stored as a minimal perfect
+  hash (hash and displace). One seed per bucket places every legacy key in
+  its own slot, so a lookup is two hashes and one comparison.
+- Sources: a hash of the files the index was built from. next.config.ts
+  recomputes it (lib/slugIndexSources.mjs) and the middleware only answers
+  404 from the Bloom filter when the two agree, so an index left stale by a
+  build that skipped the pipeline fails open instead of hiding new pages.
+"""
+
+import base64
+import json
+import math
+import re
+from pathlib import Path
+
+from .hashing import content_hash
+from .slugs import article_slug
+
+INDEX_PATH = Path(__file__).resolve().parents[2] / 'lib' / 'slug-index.json'
+
+ERROR_RATE = 0.01
+BUCKET_SIZE = 2        # average legacy keys per displacement bucket
+SECOND_SEED = 0x9e3779b9
+
+FNV_OFFSET = 0x811c9dc5
+FNV_PRIME = 0x01000193
+
+BLOG_URL = re.compile(r'^https://ecgkid\.com/blog/([^/?#]+)$')
+
+
+def fnv1a(key, seed=0):
+    """32-bit FNV-1a of the UTF-8 key, with the seed folded into the offset"""
+    h = FNV_OFFSET ^ seed
+    for byte in key.encode('utf-8'):
+        h = ((h ^ byte) * FNV_PRIME) & 0xffffffff
+    return h
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.data = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        h1 = fnv1a(key)
+        h2 = fnv1a(key, SECOND_SEED) | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.data[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def to_dict(self):
+        return {
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "count": self.count,
+            "data": base64.b64encode(bytes(self.data)).decode('ascii'),
+        }
+
+
+def build_perfect_hash(mapping):
+    """
+    Build a minimal perfect hash table for mapping.
+
+    Returns {"seeds": [...], "entries": [[key, value], ...]}; a key's slot is
+    fnv1a(key, seeds[fnv1a(key) % len(seeds)]) % len(entries).
+    """
+    keys = sorted(mapping)
+    size = len(keys)
+    if not size:
+        return {"seeds": [], "entries": []}
+
+    buckets = [[] for _ in range(math.ceil(size / BUCKET_SIZE))]
+    for key in keys:
+        buckets[fnv1a(key) % len(buckets)].append(key)
+
+    seeds = [0] * len(buckets)
+    entries = [None] * size
+    # Place the crowded buckets first, while there is still room
+    for index in sorted(range(len(buckets)), key=lambda b: (-len(buckets[b]), b)):
+        bucket = buckets[index]
+        if not bucket:
+            continue
+        seed = 1
+        while True:
+            slots = {fnv1a(key, seed) % size for key in bucket}
+            if len(slots) == len(bucket) and all(entries[s] is None for s in slots):
+                break
+            seed += 1
+        seeds[index] = seed
+        for key in bucket:
+            entries[fnv1a(key, seed) % size] = [key, mapping[key]]
+
+    return {"seeds": seeds, "entries": entries}
+
+
+def perfect_hash_lookup(table, key):
+    """Python twin of the TypeScript lookup, for checking a built table"""
+    if not table["entries"]:
+        return None
+    seed = table["seeds"][fnv1a(key) % len(table["seeds"])]
+    entry = table["entries"][fnv1a(key, seed) % len(table["entries"])]
+    return entry[1] if entry[0] == key else None
+
+
+def legacy_slugs(article):
+    """Blog slugs an article's canonicalUrl / schema @id point at, if not its own"""
+    urls = [
+        article.get('seo', {}).get('canonicalUrl', ''),
+        article.get('schema', {}).get('mainEntityOfPage', {}).get('@id', ''),
+    ]
+    slug = article_slug(article)
+    found = []
+    for url in urls:
+        match = BLOG_URL.match(url)
+        if match and match.group(1) != slug and match.group(1) not in found:
+            found.append(match.group(1))
+    return found
+
+
+def sources_fingerprint(blog_files, video_files, datasets):
+    """
+    Hash of the index's inputs: the MDX and video file names (their stems
+    are the page slugs) and the bytes of the generated datasets. Must match
+    sourcesFingerprint() in lib/slugIndexSources.mjs.
+    """
+    lines = [f"blog/{Path(p).stem}" for p in blog_files]
+    lines += [f"watch/{Path(p).stem}" for p in video_files]
+    lines += [f"{Path(p).name} {content_hash(Path(p).read_bytes())}" for p in datasets]
+    return content_hash('\n'.join(sorted(lines)))
+
+
+def build_slug_index(pages, redirects, sources=''):
+    """pages: iterable of route keys; redirects: legacy key -> canonical key; sources: sources_fingerprint()"""
+    pages = sorted(set(pages))
+    bloom = BloomFilter(len(pages))
+    for key in pages:
+        bloom.add(key)
+    return {"sources": sources, "bloom": bloom.to_dict(), "redirects": build_perfect_hash(redirects)}
+
+
+def site_keys(blog_slugs, video_slugs, articles):
+    """
+    Page keys and legacy redirects for the index.
+
+    blog_slugs are the MDX article slugs, video_slugs the video file stems
+    and articles the generated articles. Returns (pages, redirects,
+    conflicts); a legacy key two canonicals claim keeps the first and is
+    listed in conflicts as (key, kept, other), which build-slug-index.py
+    refuses to publish.
+    """
+    articles = list(articles)
+    pages = {f"blog/{slug}" for slug in blog_slugs}
+    pages |= {f"watch/{slug}" for slug in video_slugs}
+    pages |= {f"blog/{article_slug(a)}" for a in articles}
+
+    redirects, conflicts = {}, []
+    for article in articles:
+        canonical = f"blog/{article_slug(article)}"
+        for legacy in legacy_slugs(article):
+            key = f"blog/{legacy}"
+            if key in pages:
+                continue  # a real page lives there; never shadow it
+            if redirects.get(key, canonical) != canonical:
+                conflicts.append((key, redirects[key], canonical))
+                continue
+            redirects[key] = canonical
+    return pages, redirects, conflicts
+
+
+def index_text(index):
+    """lib/slug-index.json as written, for comparing with the file on disk"""
+    return json.dumps(index, separators=(',', ':')) + '\n'
@@ -0,0 +1,244 @@
+"""
+Persistent registry of every published slug and the source it belongs to.
+
+Slugs come from several places: generated datasets (create_slug of the
+title), MDX file names and video YAML file names. The registry
+(scripts/slug-registry.json) records which source owns each route/slug, so:
+
+- a source keeps its slug across runs, even if another source later wants it;
+- a new source whose slug is taken gets the first free "<slug>-2", "<slug>-3"...
+  Claims are settled in a fixed order (file-named sources, then registered
+  ones, then new ones by source id), so the outcome does not depend on the
+  order datasets are read in;
+- a file-named source (MDX article, video) cannot be renamed, so a clash
+  involving one is reported instead of resolved;
+- slugs and canonical URLs stored on generated articles can be checked
+  against the registry (drift).
+
+Source ids: "mdx:<file name>" for MDX articles, "video:<videoId>" for
+videos and "dataset:<dataset path>#<slug>" for generated articles (the path
+as in dataset_key, the slug the article was first registered under). A
+generated article is identified by the slug stored on it, not by its title
+or position: once add-slugs-to-articles.py has written the registered slug
+back, that slug leads to the article's source wherever it moves, in its
+dataset or to another one, and whatever happens to its title. An article
+with no stored slug is identified by create_slug(title). One whose slug
+names an MDX file was converted to it (convert-json-to-mdx.js names files
+by slug), so the two share the MDX source. Lookups by source id and by
+"route/slug" are both dict lookups.
+
+Unlike the other generated files, slug-registry.json is committed: which
+source won a collision cannot be recomputed from the tree, and the
+published URLs depend on it.
+"""
+
+import json
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from .history import dataset_key
+from .hosting import write_json_if_changed
+from .output import iter_json_array
+from .slugs import article_slug
+
+REGISTRY_PATH = Path(__file__).resolve().parents[1] / 'slug-registry.json'
+REGISTRY_VERSION = 2
+MAX_SLUG = 100   # create_slug's limit
+
+CANONICAL_URL = re.compile(r'^https://ecgkid\.com/blog/([^/?#]+)$')
+
+# fixed: the slug is a file name and cannot be changed by the registry
+Claim = namedtuple('Claim', 'source route slug origin fixed')
+
+
+def mdx_source(file_name):
+    return f"mdx:{file_name}"
+
+
+def dataset_source(dataset, slug):
+    return f"dataset:{dataset_key(dataset)}#{slug}"
+
+
+def video_source(video_id):
+    return f"video:{video_id}"
+
+
+def file_claims(manifest_entries, videos):
+    """Claims of the MDX articles (manifest entries) and videos ({stem: data})"""
+    claims = [Claim(mdx_source(entry['file']), 'blog', entry['slug'], entry['file'], True) for entry in manifest_entries]
+    claims += [
+        Claim(video_source(video.get('videoId') or stem), 'watch', stem, f"{stem}.yaml", True)
+        for stem, video in videos.items() if video
+    ]
+    return claims
+
+
+def dataset_articles(paths):
+    """(dataset, article) for every article of the generated datasets"""
+    for path in paths:
+        for article in iter_json_array(path):
+            yield path, article
+
+
+def route_key(route, slug):
+    return f"{route}/{slug}"
+
+
+def suffixed(slug, number):
+    """slug with a "-<number>" suffix, still within MAX_SLUG characters"""
+    suffix = f"-{number}"
+    return slug[:MAX_SLUG - len(suffix)].rstrip('-') + suffix
+
+
+class SlugRegistry:
+    def __init__(self, sources=None):
+        self.sources = {}       # source id -> {"route", "slug", "origin"}
+        self.slugs = {}         # "route/slug" -> source id
+        self.collisions = []    # dicts: key, holder, source, assigned (None if unresolved)
+        self.duplicates = []    # (source, origins) claimed more than once in a run
+        self.seen = set()
+        for source, entry in (sources or {}).items():
+            self._set(source, entry['route'], entry['slug'], entry.get('origin'))
+
+    @classmethod
+    def load(cls, path=REGISTRY_PATH):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get('version') != REGISTRY_VERSION:
+            return cls()
+        return cls(data['sources'])
+
+    def save(self, path=REGISTRY_PATH):
+        """Write the registry if it changed; returns True if the file was written"""
+        return write_json_if_changed(path, {
+            "version": REGISTRY_VERSION,
+            "sources": {source: self.sources[source] for source in sorted(self.sources)},
+        })
+
+    def _set(self, source, route, slug, origin):
+        old = self.sources.get(source)
+        if old and self.slugs.get(route_key(old['route'], old['slug'])) == source:
+            del self.slugs[route_key(old['route'], old['slug'])]
+        self.sources[source] = {"route": route, "slug": slug, "origin": origin}
+        self.slugs[route_key(route, slug)] = source
+
+    def lookup(self, route, slug):
+        """Source id that owns route/slug, or None"""
+        return self.slugs.get(route_key(route, slug))
+
+    def article_source(self, dataset, article):
+        """
+        Source id of a generated article: the registered owner of its stored
+        slug, the MDX file converted from it, or a new dataset source.
+        """
+        stored = article.get('slug')
+        slug = article_slug(article)
+        owner = self.lookup('blog', slug)
+        if owner and (stored or owner.startswith('mdx:')):
+            return owner
+        return dataset_source(dataset, slug)
+
+    def slug_for(self, source):
+        """Registered slug of a source, or None"""
+        entry = self.sources.get(source)
+        return entry['slug'] if entry else None
+
+    def resolve(self, claims, articles=()):
+        """
+        Settle a run's claims against the registry: claims is an iterable of
+        Claim, articles of (dataset, generated article).
+
+        Articles are matched to their sources (article_source) once the
+        file-named claims are settled, so a moved or retitled article keeps
+        its slug. Collisions and duplicate claims are recorded on the
+        registry; returns the number of sources newly registered or moved.
+        """
+        claims = list(claims)
+        fixed = sorted({c.source: c for c in claims if c.fixed}.values())
+        changed = 0
+        for claim in fixed:
+            self.seen.add(claim.source)
+            key = route_key(claim.route, claim.slug)
+            holder = self.slugs.get(key)
+            if holder not in (None, claim.source) and holder in self.seen:
+                self.collisions.append({"key": key, "holder": holder, "source": claim.source, "assigned": None})
+                continue
+            if self.sources.get(claim.source) != {"route": claim.route, "slug": claim.slug, "origin": claim.origin}:
+                if holder not in (None, claim.source):
+                    # The file wins; the source that held the slug gets a
+                    # new one below if it is still claimed
+                    del self.sources[holder]
+                self._set(claim.source, claim.route, claim.slug, claim.origin)
+                changed += 1
+
+        claims += [
+            Claim(self.article_source(dataset, article), 'blog', article_slug(article), dataset_key(dataset), False)
+            for dataset, article in articles
+        ]
+        # A source claimed twice in a run: two video files with one videoId,
+        # or two generated articles with the same stored slug
+        origins = {}
+        for claim in claims:
+            origins.setdefault((claim.source, claim.fixed), []).append(claim.origin)
+        self.duplicates = sorted((s, sorted(o)) for (s, _), o in origins.items() if len(o) > 1)
+
+        rest = {c.source: c for c in claims if not c.fixed and c.source not in self.seen}
+        new = []
+        for source, claim in sorted(rest.items()):
+            if source not in self.sources:
+                new.append(claim)
+                continue
+            # A known source, possibly moved within or between datasets
+            self.seen.add(source)
+            self.sources[source]['origin'] = claim.origin
+
+        for claim in sorted(new):
+            self.seen.add(claim.source)
+            slug, number = claim.slug, 2
+            while route_key(claim.route, slug) in self.slugs:
+                slug = suffixed(claim.slug, number)
+                number += 1
+            if slug != claim.slug:
+                self.collisions.append({
+                    "key": route_key(claim.route, claim.slug),
+                    "holder": self.slugs[route_key(claim.route, claim.slug)],
+                    "source": claim.source,
+                    "assigned": slug,
+                })
+            self._set(claim.source, claim.route, slug, claim.origin)
+            changed += 1
+        return changed
+
+    def prune(self):
+        """Forget sources not claimed by resolve(); returns how many"""
+        stale = [source for source in self.sources if source not in self.seen]
+        for source in stale:
+            entry = self.sources.pop(source)
+            self.slugs.pop(route_key(entry['route'], entry['slug']), None)
+        return len(stale)
+
+    def drift(self, source, article):
+        """
+        (field, value) pairs of a generated article that disagree with the
+        slug registered for its source: the stored slug, the canonical URL
+        and the schema @id.
+        """
+        slug = self.slug_for(source)
+        if slug is None:
+            return []
+        found = []
+        if article_slug(article) != slug:
+            found.append(('slug', article_slug(article)))
+        urls = (
+            ('seo.canonicalUrl', (article.get('seo') or {}).get('canonicalUrl')),
+            ('schema.@id', ((article.get('schema') or {}).get('mainEntityOfPage') or {}).get('@id')),
+        )
+        for field, url in urls:
+            match = CANONICAL_URL.match(url or '')
+            if url and (not match or match.group(1) != slug):
+                found.append((field, url))
+        return found
@@ -0,0 +1,24 @@
+"""
+Slug helpers shared by the pipeline stages.
+
+create_slug is the only slug rule: the generators, add-slugs-to-articles.py
+and the slug registry (slugregistry.py) all call it.
+"""
+
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def create_slug(title):
+    """Convert title to URL-friendly slug (memoized; titles repeat across stages)"""
+    slug = title.lower()
+    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = re.sub(r'[-\s]+', '-', slug)
+    slug = slug.strip('-')
+    return slug[:100]
+
+
+def article_slug(article):
+    """Slug stored on the article, or the one add-slugs-to-articles.py would assign"""
+    return article.get('slug') or create_slug(article['title'])
@@ -0,0 +1,181 @@
+"""
+Run per-item steps as concurrent stages joined by bounded queues.
+
+    source -> [stage 1] -> queue -> [stage 2] -> queue -> ... -> caller
+
+Each stage is one thread applying a function to every item, in order, so
+output order matches input order. Queues hold at most `depth` items: a
+stage that gets ahead blocks until the next one catches up, which keeps
+memory bounded no matter how long the source is.
+
+Threads share one core for Python code (the GIL): only work that releases
+it, such as file writes and zlib, overlaps with the other stages. A
+CPU-bound stage can be given a process pool instead; its thread then keeps
+up to `depth` items in flight in the workers and forwards the results in
+input order. Its function and items must be picklable.
+
+An exception in any stage stops the others and is re-raised in the caller.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+DEFAULT_DEPTH = 8
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class StagedPipeline:
+    """
+    Iterate over source pushed through stages, a list of (name, function)
+    or (name, function, executor) for a stage run in a process pool.
+
+    A function returns the item for the next stage, or None to drop it.
+    timings records per stage the items handled, seconds spent working (for
+    a pooled stage, waiting on the workers) and seconds blocked on a full
+    queue (backpressure).
+    """
+
+    def __init__(self, source, stages, depth=DEFAULT_DEPTH):
+        if depth < 1:
+            # queue.Queue treats 0 or less as unbounded, which drops the backpressure
+            raise ValueError(f"depth must be at least 1, got {depth}")
+        self.source = source
+        self.stages = list(stages)
+        self.depth = depth
+        self.timings = {name: {"items": 0, "busy": 0.0, "blocked": 0.0}
+                        for name in ['source'] + [name for name, *_ in self.stages]}
+        self._stop = threading.Event()
+        self._errors = []
+
+    def _put(self, q, item, timing):
+        started = time.perf_counter()
+        while True:
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Cancelled()
+        timing['blocked'] += time.perf_counter() - started
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Cancelled()
+
+    def _run_source(self, out):
+        timing = self.timings['source']
+        try:
+            iterator = iter(self.source)
+            while True:
+                started = time.perf_counter()
+                item = next(iterator, _DONE)
+                timing['busy'] += time.perf_counter() - started
+                if item is _DONE:
+                    break
+                timing['items'] += 1
+                self._put(out, item, timing)
+        except _Cancelled:
+            return
+        except BaseException as e:
+            self._fail(e)
+        self._finish(out)
+
+    def _run_stage(self, name, function, source, out):
+        timing = self.timings[name]
+        try:
+            while True:
+                item = self._get(source)
+                if item is _DONE:
+                    break
+                started = time.perf_counter()
+                result = function(item)
+                timing['busy'] += time.perf_counter() - started
+                timing['items'] += 1
+                if result is not None:
+                    self._put(out, result, timing)
+        except _Cancelled:
+            return
+        except BaseException as e:
+            self._fail(e)
+        self._finish(out)
+
+    def _run_pooled(self, name, function, executor, source, out):
+        timing = self.timings[name]
+        pending = deque()
+
+        def forward():
+            started = time.perf_counter()
+            result = pending.popleft().result()
+            timing['busy'] += time.perf_counter() - started
+            timing['items'] += 1
+            if result is not None:
+                self._put(out, result, timing)
+
+        try:
+            done = False
+            while not done:
+                while pending and (pending[0].done() or len(pending) >= self.depth):
+                    forward()
+                item = self._get(source)
+                if item is _DONE:
+                    done = True
+                else:
+                    pending.append(executor.submit(function, item))
+            while pending:
+                forward()
+        except _Cancelled:
+            return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for future in pending:
+                future.cancel()
+        self._finish(out)
+
+    def _fail(self, error):
+        self._errors.append(error)
+        self._stop.set()
+
+    def _finish(self, out):
+        try:
+            self._put(out, _DONE, {"blocked": 0.0})
+        except _Cancelled:
+            pass
+
+    def __iter__(self):
+        queues = [queue.Queue(self.depth) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._run_source, args=(queues[0],), daemon=True)]
+        for index, (name, function, *executor) in enumerate(self.stages):
+            target, args = self._run_stage, (name, function, queues[index], queues[index + 1])
+            if executor:
+                target, args = self._run_pooled, (name, function, executor[0], queues[index], queues[index + 1])
+            threads.append(threading.Thread(target=target, args=args, name=f"stage-{name}", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                yield item
+        except _Cancelled:
+            pass
+        finally:
+            # Also reached when the caller stops early or fails while writing
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        if self._errors:
+            raise self._errors[0]
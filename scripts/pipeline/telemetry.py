@@ -0,0 +1,185 @@
+"""
+Structured run telemetry for the pipeline scripts.
+
+Every instrumented run appends JSON lines (run_start, stage_start,
+stage_end, run_end) to runs.jsonl and, when it finishes, rewrites a
+Prometheus textfile (epulsepoints_pipeline_<script>.prom) that a
+node-exporter textfile collector can scrape.
+
+Both live in PIPELINE_TELEMETRY_DIR (default: <repo>/.pipeline-telemetry);
+PIPELINE_METRICS_DIR overrides where the .prom files go and
+PIPELINE_TELEMETRY=0 turns telemetry off.
+
+Usage:
+
+    @instrumented
+    def main(argv=None):
+        with stage('generate') as s:
+            ...
+            s.items += 1
+            s.add_file(output_path)
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+TELEMETRY_DIR = Path(os.environ.get(
+    'PIPELINE_TELEMETRY_DIR',
+    Path(__file__).resolve().parents[2] / '.pipeline-telemetry',
+))
+METRICS_DIR = Path(os.environ.get('PIPELINE_METRICS_DIR', TELEMETRY_DIR))
+ENABLED = os.environ.get('PIPELINE_TELEMETRY', '1') != '0'
+
+METRIC_PREFIX = 'epulsepoints_pipeline'
+
+_current = None
+
+
+class StageStats:
+    """Counters for one stage; extra holds stage-specific counts (e.g. rejected)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.extra = {}
+        self.duration = 0.0
+
+    def add_file(self, path):
+        """Count the size of a file the stage wrote"""
+        try:
+            self.bytes += os.path.getsize(path)
+        except OSError:
+            pass
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "duration_ms": round(self.duration * 1000, 3),
+            "items": self.items,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            **self.extra,
+        }
+
+
+class Run:
+    def __init__(self, script):
+        self.script = script
+        self.id = uuid.uuid4().hex[:12]
+        self.stages = []
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.success = False
+
+    def log(self, event, **fields):
+        if not ENABLED:
+            return
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "run": self.id,
+            "script": self.script,
+            "event": event,
+            **fields,
+        }
+        TELEMETRY_DIR.mkdir(parents=True, exist_ok=True)
+        with open(TELEMETRY_DIR / 'runs.jsonl', 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def write_metrics(self):
+        if not ENABLED:
+            return
+        script = self.script.replace('\\', '\\\\').replace('"', '\\"')
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_text = ','.join([f'script="{script}"'] + [f'{k}="{v}"' for k, v in labels.items()])
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+        metric('run_duration_seconds', "Wall time of the last run", [({}, round(self.duration, 6))])
+        metric('run_success', "1 if the last run finished without an error", [({}, int(self.success))])
+        metric('last_run_timestamp_seconds', "Unix time the last run finished", [({}, int(time.time()))])
+        metric('stage_duration_seconds', "Wall time of each stage in the last run",
+               [({"stage": s.name}, round(s.duration, 6)) for s in self.stages])
+        metric('stage_items', "Items processed by each stage in the last run",
+               [({"stage": s.name}, s.items) for s in self.stages])
+        metric('stage_bytes_written', "Bytes written by each stage in the last run",
+               [({"stage": s.name}, s.bytes) for s in self.stages])
+        metric('stage_cache_hits', "Cache hits in each stage in the last run",
+               [({"stage": s.name}, s.cache_hits) for s in self.stages])
+
+        # Write then rename so the collector never reads a half-written file
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        target = METRICS_DIR / f"{METRIC_PREFIX}_{self.script.replace('-', '_')}.prom"
+        tmp = target.with_name(target.name + '.tmp')
+        tmp.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        os.replace(tmp, target)
+
+
+@contextmanager
+def run(script):
+    """Record one run of a script; nested runs (daemon calling main) reuse the outer one"""
+    global _current
+    if _current is not None:
+        yield _current
+        return
+
+    current = Run(script)
+    _current = current
+    current.log('run_start', argv=sys.argv[1:], pid=os.getpid())
+    try:
+        yield current
+        current.success = True
+    finally:
+        _current = None
+        current.duration = time.perf_counter() - current.started
+        current.log(
+            'run_end',
+            status='ok' if current.success else 'error',
+            duration_ms=round(current.duration * 1000, 3),
+            items=sum(s.items for s in current.stages),
+            bytes=sum(s.bytes for s in current.stages),
+            cache_hits=sum(s.cache_hits for s in current.stages),
+        )
+        current.write_metrics()
+
+
+@contextmanager
+def stage(name):
+    """Time a stage of the active run (a no-op outside of one)"""
+    stats = StageStats(name)
+    current = _current
+    if current is not None:
+        current.log('stage_start', stage=name)
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.duration = time.perf_counter() - started
+        if current is not None:
+            current.stages.append(stats)
+            current.log('stage_end', **stats.as_dict())
+
+
+def instrumented(func):
+    """Wrap a script's main() in a telemetry run named after the script file"""
+    # Scripts loaded by path (daemon, watch mode) are not in sys.modules
+    script = Path(func.__code__.co_filename).stem
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with run(script):
+            return func(*args, **kwargs)
+
+    return wrapper
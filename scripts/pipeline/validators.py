@@ -0,0 +1,218 @@
+"""
+Record validation for generated articles.
+
+Schemas are plain dicts in a small JSON-Schema-like vocabulary and are
+compiled once into straight-line Python functions, so checking a record in
+the generators' streaming path costs about as much as a few dict lookups.
+
+Supported keywords: type (string, integer, boolean, array, object),
+required (default True), minLength, maxLength, pattern, enum, minItems,
+items, properties, check (name of a function in CHECKS).
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+PUBLIC_DIR = Path(__file__).resolve().parents[2] / 'public'
+
+SLUG = r'^[a-z0-9]+(?:-+[a-z0-9]+)*$'
+LOCAL_IMAGE = r'^/[\w./ ()-]+\.(?:png|jpe?g|webp|gif|svg)$'
+SITE_URL = r'^https://ecgkid\.com/[\w./ ()-]*$'
+HTTPS_URL = r'^https://[^\s"<>]+$'
+ISO_DATETIME = r'^\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?)?$'
+
+
+@lru_cache(maxsize=None)
+def public_file_exists(url_path):
+    """True if a site-relative URL points at a file under public/"""
+    return (PUBLIC_DIR / url_path.lstrip('/')).is_file()
+
+
+def site_file_exists(url):
+    """True if an https://ecgkid.com/... asset URL points at a file under public/"""
+    return public_file_exists(url[len('https://ecgkid.com'):])
+
+
+CHECKS = {
+    'public_file_exists': public_file_exists,
+    'site_file_exists': site_file_exists,
+}
+
+PYTHON_TYPES = {
+    'string': 'str',
+    'integer': 'int',
+    'boolean': 'bool',
+    'array': 'list',
+    'object': 'dict',
+}
+
+STRING = {"type": "string", "minLength": 1}
+SITE_IMAGE = {"type": "string", "pattern": SITE_URL, "check": "site_file_exists"}
+
+ARTICLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "minLength": 10, "maxLength": 200},
+        "slug": {"type": "string", "pattern": SLUG, "maxLength": 100, "required": False},
+        "excerpt": {"type": "string", "minLength": 20},
+        "content": {"type": "string", "minLength": 200},
+        "imageUrl": {"type": "string", "pattern": LOCAL_IMAGE, "check": "public_file_exists"},
+        "category": {"type": "string", "enum": ["clinical", "education", "technology"]},
+        "tags": {"type": "array", "minItems": 1, "items": STRING},
+        "author": {
+            "type": "object",
+            "properties": {
+                "name": STRING,
+                "title": STRING,
+                "avatar": {"type": "string", "pattern": HTTPS_URL, "required": False},
+            },
+        },
+        "publishedAt": {"type": "string", "pattern": ISO_DATETIME},
+        "updatedAt": {"type": "string", "pattern": ISO_DATETIME},
+        "views": {"type": "integer"},
+        "featured": {"type": "boolean"},
+        "schema": {
+            "type": "object",
+            "required": False,
+            "properties": {
+                "@context": {"type": "string", "enum": ["https://schema.org"]},
+                "@type": STRING,
+                "name": STRING,
+                "image": dict(SITE_IMAGE, required=False),
+            },
+        },
+        "seo": {
+            "type": "object",
+            "required": False,
+            "properties": {
+                "metaTitle": STRING,
+                "metaDescription": STRING,
+                "canonicalUrl": {"type": "string", "pattern": SITE_URL},
+                "ogImage": SITE_IMAGE,
+                "twitterImage": SITE_IMAGE,
+            },
+        },
+    },
+}
+
+
+class _Compiler:
+    """Turn a schema dict into the source of a validation function"""
+
+    def __init__(self):
+        self.lines = []
+        self.constants = {}
+        self.counter = 0
+
+    def name(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, prefix, value):
+        name = self.name(prefix)
+        self.constants[name] = value
+        return name
+
+    def emit(self, depth, line):
+        self.lines.append('    ' * depth + line)
+
+    def value(self, schema, var, path, depth):
+        """Emit checks for a value already bound to var"""
+        kind = schema['type']
+        # bool is a subclass of int, so compare exact types
+        self.emit(depth, f"if type({var}) is not {PYTHON_TYPES[kind]}:")
+        self.emit(depth + 1, f"errors.append({path!r} + ' must be {kind}')")
+        self.emit(depth, "else:")
+        depth += 1
+        body_start = len(self.lines)
+
+        if 'minLength' in schema:
+            self.emit(depth, f"if len({var}) < {schema['minLength']}:")
+            self.emit(depth + 1, f"errors.append({path!r} + ' is shorter than {schema['minLength']}')")
+        if 'maxLength' in schema:
+            self.emit(depth, f"if len({var}) > {schema['maxLength']}:")
+            self.emit(depth + 1, f"errors.append({path!r} + ' is longer than {schema['maxLength']}')")
+        if 'pattern' in schema:
+            regex = self.constant('pattern', re.compile(schema['pattern']))
+            self.emit(depth, f"if not {regex}.match({var}):")
+            self.emit(depth + 1, f"errors.append({path!r} + ' has an invalid format: ' + repr({var}[:80]))")
+        if 'check' in schema:
+            check = self.constant('check', CHECKS[schema['check']])
+            # Only run the (slower) check once the value has the right shape
+            keyword = 'elif' if 'pattern' in schema else 'if'
+            self.emit(depth, f"{keyword} not {check}({var}):")
+            self.emit(depth + 1, f"errors.append({path!r} + ' does not resolve to a file: ' + {var})")
+        if 'enum' in schema:
+            allowed = self.constant('allowed', frozenset(schema['enum']))
+            self.emit(depth, f"if {var} not in {allowed}:")
+            self.emit(depth + 1, f"errors.append({path!r} + ' is not one of ' + repr(sorted({allowed})))")
+        if 'minItems' in schema:
+            self.emit(depth, f"if len({var}) < {schema['minItems']}:")
+            self.emit(depth + 1, f"errors.append({path!r} + ' needs at least {schema['minItems']} item(s)')")
+        if 'items' in schema:
+            item = self.name('item')
+            index = self.name('i')
+            self.emit(depth, f"for {index}, {item} in enumerate({var}):")
+            self.value(schema['items'], item, f"{path}[]", depth + 1)
+        for field, sub in schema.get('properties', {}).items():
+            self.field(field, sub, var, field if var == 'record' else f"{path}.{field}", depth)
+        if len(self.lines) == body_start:
+            self.emit(depth, "pass")
+
+    def field(self, field, schema, parent, path, depth):
+        var = self.name('v')
+        self.emit(depth, f"{var} = {parent}.get({field!r}, MISSING)")
+        self.emit(depth, f"if {var} is MISSING:")
+        if schema.get('required', True):
+            self.emit(depth + 1, f"errors.append('missing ' + {path!r})")
+        else:
+            self.emit(depth + 1, "pass")
+        self.emit(depth, "else:")
+        self.value(schema, var, path, depth + 1)
+
+
+def compile_validator(schema, name='validate'):
+    """
+    Compile a schema into validate(record) -> list of error strings.
+
+    The generated source is kept on the function as __source__ for debugging.
+    """
+    compiler = _Compiler()
+    compiler.emit(0, f"def {name}(record):")
+    compiler.emit(1, "errors = []")
+    compiler.value(schema, 'record', 'record', 1)
+    compiler.emit(1, "return errors")
+
+    source = '\n'.join(compiler.lines)
+    namespace = dict(compiler.constants, MISSING=object())
+    exec(compile(source, f"<validator {name}>", 'exec'), namespace)
+    validator = namespace[name]
+    validator.__source__ = source
+    return validator
+
+
+validate_article = compile_validator(ARTICLE_SCHEMA, 'validate_article')
+
+
+class Rejections:
+    """Drop articles that fail validation, reporting each one"""
+
+    def __init__(self, validator=validate_article):
+        self.validator = validator
+        self.count = 0
+
+    def check(self, article):
+        """The article if it is valid, otherwise None (and it is reported)"""
+        errors = self.validator(article)
+        if errors:
+            self.count += 1
+            title = article.get('title', '<untitled>') if isinstance(article, dict) else '<not an object>'
+            print(f"⛔ Rejected '{title}': {'; '.join(errors)}")
+            return None
+        return article
+
+    def filter(self, articles):
+        for article in articles:
+            if self.check(article) is not None:
+                yield article
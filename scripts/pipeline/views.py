@@ -0,0 +1,245 @@
+"""
+View counts from hosting access logs, written in batches.
+
+Counting a view with one database write per hit does not scale, so views
+are read from access logs instead: every counted hit on /blog/<slug> or
+/watch/<slug> adds to an in-memory counter, and the counters are flushed
+once per time window (by log time) as a single batch of increments.
+
+Two sinks take the batches:
+
+    JsonlSink       one {"window", "route", "slug", "views"} line per counter
+    FirestoreSink   one commit of increment transforms per batch, against the
+                    Firestore emulator's REST API (FIRESTORE_EMULATOR_HOST)
+
+Alongside the counts, every view bumps an exponentially decaying score, so
+hot() ranks what is being read right now rather than what was read most
+ever; the pipeline uses that ranking to choose what to pre-render first.
+
+Log lines can be Combined Log Format (nginx, Apache, `firebase serve`
+access logs) or Cloud Logging JSON exports with an httpRequest object.
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+VIEW_PATH = re.compile(r'^/(blog|watch)/([^/?#]+)/?(?:[?#].*)?$')
+COMBINED_LOG = re.compile(
+    r'^\S+ \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) \S+'
+    r'(?: "[^"]*" "(?P<agent>[^"]*)")?'
+)
+BOT_AGENT = re.compile(r'bot|crawl|spider|slurp|preview|monitor|lighthouse|headless', re.I)
+COUNTED_STATUS = {200, 304}
+
+DEFAULT_WINDOW = 60              # seconds of log time per batch
+DEFAULT_HALF_LIFE = 6 * 3600     # seconds for a view's weight in the ranking to halve
+
+FIRESTORE_PROJECT = "epulsepoints-website"
+FIRESTORE_COLLECTION = "viewCounts"
+FIRESTORE_BATCH = 500            # Firestore's limit on writes per commit
+
+RANKING_PATH = Path(__file__).resolve().parents[1] / 'hot-articles.json'
+
+
+def _timestamp(value):
+    """Seconds since the epoch for a CLF ('10/Oct/2025:13:55:36 +0000') or ISO 8601 time"""
+    try:
+        return datetime.strptime(value, '%d/%b/%Y:%H:%M:%S %z').timestamp()
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def parse_log_line(line):
+    """(timestamp, route, slug) for a line that counts as a page view, else None"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith('{'):
+            entry = json.loads(line)
+            request = entry.get('httpRequest') or {}
+            method = request.get('requestMethod', 'GET')
+            path = urlsplit(request.get('requestUrl', '')).path
+            status = int(request.get('status', 0))
+            agent = request.get('userAgent', '')
+            when = _timestamp(entry.get('timestamp') or entry.get('receiveTimestamp'))
+        else:
+            match = COMBINED_LOG.match(line)
+            if not match:
+                return None
+            method, path, status = match['method'], match['path'], int(match['status'])
+            agent = match['agent'] or ''
+            when = _timestamp(match['time'])
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+    if method != 'GET' or status not in COUNTED_STATUS or BOT_AGENT.search(agent):
+        return None
+    view = VIEW_PATH.match(path)
+    if not view:
+        return None
+    return when, view.group(1), view.group(2).lower()
+
+
+def load_ranking(path=RANKING_PATH):
+    """{(route, slug): score} from a hot ranking written by aggregate-views.py ({} if missing)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)['entries']
+        return {(entry['route'], entry['slug']): entry['score'] for entry in entries}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def read_log(path, offsets, follow=False, poll=1.0, on_idle=None):
+    """
+    Yield (line, offset after it) from a log file, '-' for stdin.
+
+    offsets maps a file path to [inode, offset] from the previous run; the
+    file is read from there unless it was rotated (new inode) or truncated.
+    With follow, keep waiting for new lines like `tail -f`, calling on_idle()
+    whenever the file has nothing new.
+    """
+    if path == '-':
+        for line in sys.stdin:
+            yield line, None
+        return
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        stat = os.fstat(f.fileno())
+        inode, offset = offsets.get(os.path.abspath(path), (None, 0))
+        if inode == stat.st_ino and offset <= stat.st_size:
+            f.seek(offset)
+        pending = ''
+        while True:
+            line = f.readline()
+            if line.endswith('\n'):
+                yield pending + line, f.tell()
+                pending = ''
+            elif line:
+                pending += line   # a writer is mid-line; wait for the rest
+            elif not follow:
+                break
+            else:
+                if on_idle:
+                    on_idle()
+                time.sleep(poll)
+
+
+class JsonlSink:
+    """Append each batch to a JSONL file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, window_start, window_end, counts):
+        start = datetime.fromtimestamp(window_start, timezone.utc).isoformat()
+        end = datetime.fromtimestamp(window_end, timezone.utc).isoformat()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for (route, slug), views in sorted(counts.items()):
+                f.write(json.dumps({"window": [start, end], "route": route, "slug": slug, "views": views}) + '\n')
+
+
+class FirestoreSink:
+    """
+    Commit each batch as increment transforms on viewCounts/<route>--<slug>.
+
+    Talks to the Firestore emulator over REST, so no client library is
+    needed; documents that do not exist yet are created by the transform.
+    """
+
+    def __init__(self, host=None, project=FIRESTORE_PROJECT, collection=FIRESTORE_COLLECTION):
+        host = host or os.environ.get('FIRESTORE_EMULATOR_HOST', 'localhost:8080')
+        self.database = f"projects/{project}/databases/(default)"
+        self.url = f"http://{host}/v1/{self.database}/documents:commit"
+        self.collection = collection
+
+    def write(self, window_start, window_end, counts):
+        writes = [
+            {
+                "transform": {
+                    "document": f"{self.database}/documents/{self.collection}/{route}--{slug}",
+                    "fieldTransforms": [
+                        {"fieldPath": "views", "increment": {"integerValue": str(views)}},
+                        {"fieldPath": "updatedAt", "setToServerValue": "REQUEST_TIME"},
+                    ],
+                }
+            }
+            for (route, slug), views in sorted(counts.items())
+        ]
+        for i in range(0, len(writes), FIRESTORE_BATCH):
+            body = json.dumps({"writes": writes[i:i + FIRESTORE_BATCH]}).encode('utf-8')
+            request = urllib.request.Request(
+                self.url,
+                data=body,
+                headers={"Content-Type": "application/json", "Authorization": "Bearer owner"},
+                method='POST',
+            )
+            with urllib.request.urlopen(request, timeout=10) as response:
+                response.read()
+
+
+class ViewAggregator:
+    """
+    Coalesce views into per-window increments and keep a decaying hot score.
+
+    scores maps "route/slug" -> [score, as of timestamp] and is updated in
+    place, so it can be saved and passed back in on the next run.
+    """
+
+    def __init__(self, sink, window=DEFAULT_WINDOW, half_life=DEFAULT_HALF_LIFE, scores=None):
+        self.sink = sink
+        self.window = window
+        self.decay = math.log(2) / half_life
+        self.scores = scores if scores is not None else {}
+        self.counts = {}
+        self.window_start = None
+        self.latest = 0.0
+        self.views = 0
+        self.flushes = 0
+
+    def add(self, when, route, slug):
+        if self.window_start is not None and when >= self.window_start + self.window:
+            self.flush()
+        if self.window_start is None:
+            self.window_start = when - when % self.window
+        key = (route, slug)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.views += 1
+        self.latest = max(self.latest, when)
+
+        score, since = self.scores.get(f"{route}/{slug}", (0.0, when))
+        self.scores[f"{route}/{slug}"] = [score * math.exp(-self.decay * max(0.0, when - since)) + 1, max(since, when)]
+
+    def flush(self):
+        """Send the current window's counters to the sink as one batch"""
+        if self.counts:
+            self.sink.write(self.window_start, self.window_start + self.window, self.counts)
+            self.flushes += 1
+        self.counts = {}
+        self.window_start = None
+
+    def forget(self, threshold=0.01, now=None):
+        """Drop scores that have decayed below threshold so saved state stays small"""
+        now = now if now is not None else self.latest
+        for key, (score, since) in list(self.scores.items()):
+            if score * math.exp(-self.decay * max(0.0, now - since)) < threshold:
+                del self.scores[key]
+
+    def hot(self, limit, now=None):
+        """[(route, slug, score)] highest first, with scores decayed to now"""
+        now = now if now is not None else self.latest
+        ranked = []
+        for key, (score, since) in self.scores.items():
+            route, slug = key.split('/', 1)
+            ranked.append((route, slug, round(score * math.exp(-self.decay * max(0.0, now - since)), 4)))
+        ranked.sort(key=lambda item: (-item[2], item[0], item[1]))
+        return ranked[:limit]
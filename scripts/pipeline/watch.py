@@ -0,0 +1,446 @@
+"""
+Watch mode: keep generated output in sync with its sources.
+
+Sources are polled by mtime, so no extra dependency is needed. Bursts of
+changes (an editor saving several files, a folder of images being copied)
+are debounced, then each changed file is mapped to the outputs that depend
+on it:
+
+    catalog entry edited (script or --catalog file) -> that entry's articles
+    template code in a generate-*.py edited         -> every article of that generator
+    image under public/ added, changed or removed   -> articles using it or its folder
+    content/videos/*.yaml edited                    -> that video's category check
+    fix-video-categories.py edited                  -> category check for every video
+
+Only affected articles are re-rendered and re-validated; the dataset and its
+metadata sidecar are rewritten from the cached articles. After every change
+SiteIndexes brings the rest of the site along: the slug registry settles the
+slugs of new or retitled articles (and of added or removed videos), the
+registered slugs are written onto the articles, and the slug index, article
+manifest and listing pages are rebuilt from the published datasets.
+
+A catalog that repeats a name renders every copy, as the generator itself
+would; the repeats are reported, and the slug registry numbers their slugs.
+"""
+
+import ast
+import json
+import posixpath
+import time
+import traceback
+from pathlib import Path
+
+from .generator import DATASETS_DIR, published_datasets, sidecar_path
+from .hashing import content_hash
+from .listings import LISTINGS_DIR, article_categories, build_lists, write_listings
+from .manifest import MANIFEST_PATH, load_manifest, manifest_fingerprint, refresh_manifest, write_manifest
+from .mdx import ARTICLES_DIR, mdx_files, mdx_slug
+from .metadata import content_metadata, extract_images
+from .output import atomic_open, iter_json_array, write_json_array
+from .records import stream_records
+from .scripts import GENERATORS, SCRIPTS_DIR, VIDEO_CATEGORIES_SCRIPT, load_script, render_records
+from .slugindex import INDEX_PATH, build_slug_index, index_text, site_keys, sources_fingerprint
+from .slugregistry import REGISTRY_PATH, SlugRegistry, file_claims
+from .slugs import article_slug, create_slug
+from .validators import PUBLIC_DIR, validate_article
+from .videos import VIDEOS_DIR, VideoCatalog
+
+IMAGE_DIRS = ['clean_rhythm_ecg', 'best_ecg_images', 'MI_ecg_database']
+
+
+def template_fingerprint(script, catalog_name):
+    """Hash of a generator's code with its catalog literal left out"""
+    tree = ast.parse(Path(script).read_text(encoding='utf-8'))
+    body = [
+        node for node in tree.body
+        if not (isinstance(node, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == catalog_name for t in node.targets))
+    ]
+    return content_hash(ast.dump(ast.Module(body=body, type_ignores=[])))
+
+
+def article_images(article):
+    """Image paths (relative to public/) an article depends on"""
+    sources = [article.get('imageUrl', '')] + extract_images(article.get('content', ''))
+    return {src.lstrip('/') for src in sources if src.startswith('/')}
+
+
+class GeneratorTarget:
+    """Cached articles for one generator, re-rendered entry by entry"""
+
+    def __init__(self, key, output_dir=SCRIPTS_DIR, catalog_path=None):
+        self.key = key
+        self.spec = GENERATORS[key]
+        self.script = SCRIPTS_DIR / self.spec['script']
+        self.output = (Path(output_dir) / self.spec['output']).resolve()
+        self.catalog_path = Path(catalog_path).resolve() if catalog_path else None
+        self.module = None
+        self.template = None
+        self.records = {}    # name -> (record hash, record)
+        self.order = []      # names in catalog order
+        self.repeated = []   # names the catalog repeats
+        self.articles = {}   # name -> rendered articles that passed validation
+        self.images = {}     # name -> image paths the articles use
+        self.metadata = {}   # name -> metadata of each article
+        self.slugs = None    # slugs given out by the last apply_slugs()
+
+    def sources(self):
+        return [self.script] + ([self.catalog_path] if self.catalog_path else [])
+
+    def reload(self):
+        """Re-import the script and catalog; return (names to render, names removed)"""
+        module = load_script(self.spec['script'])
+        template = template_fingerprint(self.script, self.spec['catalog'])
+        if self.catalog_path:
+            records = list(stream_records(self.catalog_path, self.spec['fields']))
+        else:
+            records = list(module.builtin_records())
+
+        # A repeated name keeps its place under "<name> (2)", "<name> (3)"...
+        name_field = self.spec['name_field']
+        new, repeated = {}, []
+        for record in records:
+            name, number = record[name_field], 2
+            if name in new:
+                repeated.append(name)
+                while f"{name} ({number})" in new:
+                    number += 1
+                name = f"{name} ({number})"
+            new[name] = (content_hash(json.dumps(record, sort_keys=True)), record)
+        order = list(new)
+
+        if template != self.template:
+            stale = set(order)
+        else:
+            stale = {name for name in order if self.records.get(name, (None,))[0] != new[name][0]}
+            # Entries that moved can change positional output (featured flags)
+            stale |= {name for i, name in enumerate(order) if i >= len(self.order) or self.order[i] != name}
+
+        removed = set(self.order) - set(order)
+        for name in removed:
+            self.articles.pop(name, None)
+            self.images.pop(name, None)
+            self.metadata.pop(name, None)
+
+        self.module, self.template, self.records, self.order = module, template, new, order
+        self.repeated = sorted(set(repeated))
+        return stale, removed
+
+    def affected_by_images(self, paths):
+        """Names whose articles use one of the images, or an image folder they draw from"""
+        folders = {posixpath.dirname(p) for p in paths}
+        return {
+            name for name, images in self.images.items()
+            if images & paths or {posixpath.dirname(i) for i in images} & folders
+        }
+
+    def render(self, names):
+        """Re-render the named entries"""
+        for position, name in enumerate(self.order):
+            if name not in names:
+                continue
+            articles = []
+            for article in render_records(self.module, [self.records[name][1]], start=position):
+                errors = validate_article(article)
+                if errors:
+                    print(f"   ⛔ Rejected '{article['title']}': {'; '.join(errors)}")
+                    continue
+                articles.append(article)
+            self.articles[name] = articles
+            self.images[name] = set().union(*map(article_images, articles)) if articles else set()
+            self.metadata[name] = [content_metadata(a['content']) for a in articles]
+
+    def all_articles(self):
+        return [a for name in self.order for a in self.articles.get(name, [])]
+
+    def apply_slugs(self, registry):
+        """
+        Give every article its registered slug (create_slug of the title if
+        it has none, like add-slugs-to-articles.py). Returns (slugs gone,
+        slugs added) since the last call, or None if none changed.
+        """
+        for article in self.all_articles():
+            source = registry.article_source(self.output, article)
+            article['slug'] = registry.slug_for(source) or create_slug(article['title'])
+        slugs, old = {article['slug'] for article in self.all_articles()}, self.slugs
+        self.slugs = slugs
+        if old is None or old == slugs:
+            return None
+        return sorted(old - slugs), sorted(slugs - old)
+
+    def write(self):
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        count = write_json_array(self.output, self.all_articles())
+        sidecar = {}
+        for name in self.order:
+            sidecar.update(zip(map(article_slug, self.articles.get(name, [])), self.metadata.get(name, [])))
+        with atomic_open(sidecar_path(self.output, '.meta.json')) as f:
+            json.dump(sidecar, f, ensure_ascii=False, separators=(',', ':'))
+        return count
+
+
+class VideoTarget:
+    """Warm video corpus; changed videos are re-checked against the category rules"""
+
+    def __init__(self):
+        self.rules_script = SCRIPTS_DIR / VIDEO_CATEGORIES_SCRIPT
+        self.catalog = VideoCatalog()
+        self.rules = None
+
+    def sources(self):
+        return [self.rules_script] + sorted(VIDEOS_DIR.glob('*.yaml'))
+
+    def reload_rules(self):
+        self.rules = load_script(VIDEO_CATEGORIES_SCRIPT)
+
+    def check(self, stems):
+        """Report category fixes the rules would make for these videos"""
+        suggestions = 0
+        for stem in sorted(stems):
+            data = self.catalog.videos.get(stem)
+            if not data:
+                continue
+            original = data.get('category', '')
+            category, reason = self.rules.categorize(stem, data)
+            if category and category != original:
+                suggestions += 1
+                print(f"   ⚠️  {stem}: {original} → {category} ({reason})")
+        return suggestions
+
+
+class SiteIndexes:
+    """
+    Slug registry, slug index, article manifest and listing pages, kept in
+    step with the datasets the watcher writes. The published datasets are
+    those in datasets_dir; a target writing elsewhere gets registered slugs
+    but does not claim any.
+    """
+
+    def __init__(self, datasets_dir=DATASETS_DIR, articles_dir=ARTICLES_DIR, videos_dir=VIDEOS_DIR,
+                 registry_path=REGISTRY_PATH, index_path=INDEX_PATH, manifest_path=MANIFEST_PATH,
+                 listings_dir=LISTINGS_DIR):
+        self.datasets_dir = Path(datasets_dir).resolve()
+        self.articles_dir = articles_dir
+        self.videos_dir = Path(videos_dir)
+        self.catalog = VideoCatalog(videos_dir)
+        self.registry_path = registry_path
+        self.index_path = Path(index_path)
+        self.manifest_path = manifest_path
+        self.listings_dir = listings_dir
+        self.entries = []
+
+    def sources(self):
+        """MDX articles and video files: adding, renaming or removing one changes the indexes"""
+        return mdx_files(self.articles_dir) + sorted(self.videos_dir.glob('*.yaml'))
+
+    def datasets(self, targets):
+        paths = set(published_datasets(self.datasets_dir))
+        paths |= {t.output for t in targets if t.output.parent == self.datasets_dir}
+        return sorted(paths)
+
+    def register(self, targets):
+        """
+        Settle the slugs of every published article (the targets' from
+        memory, as they are about to be written) and of every MDX article and
+        video, then write the registered slugs onto the targets' articles.
+
+        Returns (registry, {target key: apply_slugs() result}).
+        """
+        self.entries, _ = refresh_manifest(load_manifest(self.manifest_path), self.articles_dir)
+        self.catalog.refresh()
+        watched = {target.output: target for target in targets}
+        articles = []
+        for path in self.datasets(targets):
+            if path in watched:
+                articles += [(path, article) for article in watched[path].all_articles()]
+            else:
+                articles += [(path, article) for article in iter_json_array(path)]
+
+        registry = SlugRegistry.load(self.registry_path)
+        registry.resolve(file_claims(self.entries, self.catalog.videos), articles)
+        registry.save(self.registry_path)
+        return registry, {target.key: target.apply_slugs(registry) for target in targets}
+
+    def rebuild(self, targets):
+        """Slug index, article manifest and listings from the written datasets; returns counts"""
+        datasets = self.datasets(targets)
+        written = {"manifest": write_manifest(self.entries, self.manifest_path)}
+
+        articles = mdx_files(self.articles_dir)
+        videos = sorted(p for p in self.videos_dir.iterdir() if p.suffix in ('.yaml', '.yml'))
+        pages, redirects, conflicts = site_keys(
+            [mdx_slug(p) for p in articles],
+            [p.stem for p in videos],
+            (article for path in datasets for article in iter_json_array(path)),
+        )
+        text = index_text(build_slug_index(pages, redirects, sources_fingerprint(articles, videos, datasets)))
+        written['index'] = not self.index_path.exists() or self.index_path.read_text(encoding='utf-8') != text
+        if written['index']:
+            with atomic_open(self.index_path) as f:
+                f.write(text)
+
+        lists = build_lists(self.entries, article_categories(datasets))
+        counts = write_listings(lists, self.listings_dir, fingerprint=manifest_fingerprint(self.entries))
+        return dict(written, pages=len(pages), redirects=len(redirects), conflicts=conflicts,
+                    listings=counts['written'] + counts['removed'])
+
+    def update(self, targets):
+        """register() and rebuild(), reporting what changed; returns the targets whose slugs moved"""
+        registry, moved = self.register(targets)
+        for collision in registry.collisions:
+            if collision['assigned']:
+                print(f"   🔗 {collision['key']} is taken; {collision['source']} gets {collision['assigned']}")
+            else:
+                print(f"   ⛔ {collision['key']} is claimed by {collision['holder']} and {collision['source']}")
+        for source, origins in registry.duplicates:
+            print(f"   ⚠️  {source} appears in {', '.join(origins)}")
+        for key, change in moved.items():
+            if change:
+                gone, added = change
+                print(f"   🔗 {key}: slugs changed {', '.join(gone) or '-'} → {', '.join(added) or '-'}")
+        return [target for target in targets if moved[target.key]]
+
+    def report(self, targets):
+        counts = self.rebuild(targets)
+        for key, kept, other in counts['conflicts']:
+            print(f"   ⛔ {key} is claimed by {kept} and {other}; the build will refuse this index")
+        changed = [name for name in ('index', 'manifest') if counts[name]]
+        if counts['listings']:
+            changed.append(f"{counts['listings']} listing page(s)")
+        print(f"   📇 {counts['pages']} pages, {counts['redirects']} redirects; "
+              f"updated: {', '.join(changed) or 'nothing'}")
+
+
+class Watcher:
+    def __init__(self, targets, videos=None, site=None, poll=0.1, quiet=0.25):
+        self.targets = targets
+        self.videos = videos
+        self.site = site
+        self.poll = poll
+        self.quiet = quiet
+
+    def watched_files(self):
+        files = [path for target in self.targets for path in target.sources()]
+        for folder in IMAGE_DIRS:
+            files.extend(p for p in (PUBLIC_DIR / folder).rglob('*') if p.is_file())
+        if self.videos:
+            files.extend(self.videos.sources())
+        if self.site:
+            files.extend(self.site.sources())
+        return files
+
+    def scan(self):
+        mtimes = {}
+        for path in self.watched_files():
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    @staticmethod
+    def changed(before, after):
+        return {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+
+    def build(self):
+        """Initial full build so the output matches the sources before watching"""
+        for target in self.targets:
+            target.render(target.reload()[0])
+            self.report_repeats(target)
+        if self.videos:
+            self.videos.reload_rules()
+            self.videos.catalog.refresh()
+            print(f"✓ videos: {len(self.videos.catalog.videos)} loaded")
+        if self.site:
+            self.site.update(self.targets)
+        for target in self.targets:
+            count = target.write()
+            print(f"✓ {target.key}: {count} articles → {target.output}")
+        if self.site:
+            self.site.report(self.targets)
+
+    @staticmethod
+    def report_repeats(target):
+        if target.repeated:
+            print(f"   ⚠️  {target.key}: catalog repeats {', '.join(target.repeated)}; every copy is rendered")
+
+    def apply(self, changed):
+        started = time.perf_counter()
+        images = {p.relative_to(PUBLIC_DIR).as_posix() for p in changed if PUBLIC_DIR in p.parents}
+
+        dirty = []
+        for target in self.targets:
+            try:
+                stale, removed = set(), set()
+                if changed & set(target.sources()):
+                    stale, removed = target.reload()
+                    self.report_repeats(target)
+                stale |= target.affected_by_images(images)
+                if not stale and not removed:
+                    continue
+                target.render(stale)
+                dirty.append(target)
+                names = ', '.join(sorted(stale)[:5]) + (' …' if len(stale) > 5 else '')
+                print(f"↻ {target.key}: re-rendered {len(stale)} entr{'y' if len(stale) == 1 else 'ies'} [{names}]")
+            except Exception:
+                print(f"❌ {target.key}: keeping previous output\n{traceback.format_exc()}")
+
+        if self.videos:
+            try:
+                rules_changed = self.videos.rules_script in changed
+                if rules_changed:
+                    self.videos.reload_rules()
+                refreshed = self.videos.catalog.refresh()
+                stems = set(self.videos.catalog.videos) if rules_changed else set(refreshed)
+                if stems:
+                    suggestions = self.videos.check(stems)
+                    print(f"↻ videos: checked {len(stems)}, {suggestions} category fix(es) suggested")
+            except Exception:
+                print(f"❌ videos: {traceback.format_exc()}")
+
+        site_changed = self.site and (dirty or changed & set(self.site.sources()))
+        if site_changed:
+            try:
+                dirty += [target for target in self.site.update(self.targets) if target not in dirty]
+            except Exception:
+                print(f"❌ slug registry: {traceback.format_exc()}")
+
+        for target in dirty:
+            try:
+                count = target.write()
+                print(f"   ✓ {target.key}: {count} articles written")
+            except Exception:
+                print(f"❌ {target.key}: {traceback.format_exc()}")
+
+        if site_changed:
+            try:
+                self.site.report(self.targets)
+            except Exception:
+                print(f"❌ site indexes: {traceback.format_exc()}")
+
+        print(f"   done in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def run(self):
+        self.build()
+        print(f"\n👀 Watching {len(self.watched_files())} files (Ctrl+C to stop)")
+        previous = self.scan()
+        while True:
+            time.sleep(self.poll)
+            current = self.scan()
+            changed = self.changed(previous, current)
+            if not changed:
+                continue
+
+            # Debounce: keep collecting until the sources have been quiet for a moment
+            deadline = time.monotonic() + self.quiet
+            while time.monotonic() < deadline:
+                time.sleep(self.poll)
+                latest = self.scan()
+                more = self.changed(current, latest)
+                if more:
+                    changed |= more
+                    current = latest
+                    deadline = time.monotonic() + self.quiet
+
+            previous = current
+            self.apply(changed)
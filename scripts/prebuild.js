@@ -0,0 +1,53 @@
+/**
+ * Prebuild: run the Python pipeline steps before `next build`
+ *
+ * Every artifact they write has a runtime fallback: lib/articles.ts parses
+ * the MDX files when the article manifest, listings or HTML cache are
+ * missing or stale, public/sw.js precaches nothing without its manifest,
+ * and middleware.ts stops answering 404 from lib/slug-index.json when the
+ * index was not built from the current content (next.config.ts). So a
+ * machine without python3 and PyYAML still builds, just without them.
+ *
+ * A step that runs and fails (a stale or conflicting slug index) still
+ * fails the build.
+ */
+
+const { spawnSync } = require('child_process');
+const path = require('path');
+
+const ROOT = path.join(__dirname, '..');
+
+const STEPS = [
+  ['build-slug-index.py', '--check'],
+  ['build-article-manifest.py'],
+  ['build-listings.py'],
+  ['build-html-cache.py'],
+  ['build-precache-manifest.py'],
+];
+
+/**
+ * Whether python3 runs and can import the pipeline's dependencies
+ */
+function pythonAvailable() {
+  const result = spawnSync('python3', ['-c', 'import yaml'], { stdio: 'ignore' });
+  return !result.error && result.status === 0;
+}
+
+function main() {
+  if (process.env.SKIP_PIPELINE || !pythonAvailable()) {
+    console.warn('⚠️  python3 with PyYAML not found (or SKIP_PIPELINE set); skipping the pipeline steps.');
+    console.warn('   The site builds from the MDX files directly; pages and listings are not pre-rendered');
+    console.warn('   and unknown slugs are left to the pages unless lib/slug-index.json is current.');
+    return;
+  }
+
+  for (const [script, ...args] of STEPS) {
+    const result = spawnSync('python3', [path.join('scripts', script), ...args], { cwd: ROOT, stdio: 'inherit' });
+    if (result.status !== 0) {
+      console.error(`❌ ${script} failed`);
+      process.exit(result.status || 1);
+    }
+  }
+}
+
+main();
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Compute reading time, word counts, TOC headings and image lists for every
+content/articles/*.mdx file and write them to one sidecar keyed by slug.
+"""
+
+import argparse
+import json
+
+from pipeline.mdx import ARTICLES_DIR, mdx_files, mdx_slug, read_mdx
+from pipeline.metadata import content_metadata
+from pipeline.telemetry import instrumented, stage
+
+
+@instrumented
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--articles-dir', default=ARTICLES_DIR, help="Directory of .mdx articles")
+    parser.add_argument(
+        '--output',
+        default=ARTICLES_DIR.parent / 'article-metadata.json',
+        help="Sidecar JSON to write (default: content/article-metadata.json)",
+    )
+    args = parser.parse_args()
+
+    with stage('scan') as stats:
+        entries = {}
+        for path in mdx_files(args.articles_dir):
+            _, body = read_mdx(path)
+            entries[mdx_slug(path)] = content_metadata(body)
+
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, separators=(',', ':'))
+        stats.items = len(entries)
+        stats.add_file(args.output)
+
+    total_words = sum(entry['wordCount'] for entry in entries.values())
+    print(f"✅ Scanned {len(entries)} articles ({total_words:,} words)")
+    print(f"📁 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The CLIs run from scripts/ and import the pipeline package from there
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture(autouse=True)
+def telemetry_dir(tmp_path, monkeypatch):
+    """Keep the runs the tests make out of the repo's .pipeline-telemetry"""
+    from pipeline import telemetry
+    directory = tmp_path / 'telemetry'
+    monkeypatch.setattr(telemetry, 'TELEMETRY_DIR', directory)
+    monkeypatch.setattr(telemetry, 'METRICS_DIR', directory)
+    monkeypatch.setattr(telemetry, 'ENABLED', True)
+    return directory
@@ -0,0 +1,14 @@
+// Render a JSON array of Markdown strings (stdin) the way lib/articles.ts does,
+// printing a JSON array of HTML strings. Used by test_markdown.py.
+import { remark } from 'remark';
+import html from 'remark-html';
+import remarkGfm from 'remark-gfm';
+
+let input = '';
+for await (const chunk of process.stdin) input += chunk;
+
+const rendered = [];
+for (const markdown of JSON.parse(input)) {
+  rendered.push((await remark().use(remarkGfm).use(html, { sanitize: false }).process(markdown)).toString());
+}
+process.stdout.write(JSON.stringify(rendered));
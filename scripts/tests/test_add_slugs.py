@@ -0,0 +1,46 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pipeline.scripts import load_script
+from pipeline.slugs import create_slug
+
+add_slugs = load_script('add-slugs-to-articles.py').add_slugs
+
+DATASET = Path(__file__).resolve().parents[2] / 'public' / 'scripts' / 'ecg-blog-best-images.json'
+
+
+def test_output_matches_loading_and_dumping_the_whole_file(tmp_path):
+    path = tmp_path / DATASET.name
+    shutil.copy(DATASET, path)
+    articles = json.loads(path.read_text(encoding='utf-8'))
+    for article in articles:
+        article.pop('slug', None)
+    path.write_text(json.dumps(articles, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    count, examples = add_slugs(path)
+
+    for article in articles:
+        article['slug'] = create_slug(article['title'])
+    assert path.read_text(encoding='utf-8') == json.dumps(articles, indent=2, ensure_ascii=False)
+    assert count == len(articles)
+    assert examples == [(a['title'], a['slug']) for a in articles[:3]]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_empty_dataset(tmp_path):
+    path = tmp_path / 'empty.json'
+    path.write_text('[]')
+    assert add_slugs(path) == (0, [])
+    assert path.read_text() == '[]'
+
+
+def test_a_malformed_dataset_is_left_as_it_was(tmp_path):
+    path = tmp_path / 'broken.json'
+    path.write_text('[{"title": "Alpha"}, {"title": ')
+    with pytest.raises(ValueError):
+        add_slugs(path)
+    assert path.read_text() == '[{"title": "Alpha"}, {"title": '
+    assert list(tmp_path.iterdir()) == [path]
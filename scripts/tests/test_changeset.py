@@ -0,0 +1,75 @@
+import copy
+
+import pytest
+
+from pipeline.changeset import diff_articles, document_name, field_hashes, to_firestore_value
+
+ARTICLE = {
+    "title": "Atrial Flutter: ECG Recognition",
+    "slug": "atrial-flutter",
+    "content": "<p>Sawtooth waves.</p>",
+    "tags": ["flutter"],
+    "views": 0,
+    "publishedAt": "2025-01-01T00:00:00",
+    "updatedAt": "2025-01-01T00:00:00",
+    "schema": {"@type": "Article", "datePublished": "2025-01-01", "dateModified": "2025-01-01"},
+}
+
+
+def run(snapshot, articles):
+    return list(diff_articles(snapshot, articles, project_id="p", collection="blog"))
+
+
+def test_to_firestore_value_encodes_every_json_type():
+    assert to_firestore_value({"a": [1, 1.5, True, None, "x"]}) == {"mapValue": {"fields": {"a": {"arrayValue": {"values": [
+        {"integerValue": "1"},
+        {"doubleValue": 1.5},
+        {"booleanValue": True},
+        {"nullValue": None},
+        {"stringValue": "x"},
+    ]}}}}}
+    assert to_firestore_value(float("nan")) == {"doubleValue": "nan"}
+    with pytest.raises(TypeError):
+        to_firestore_value({1, 2})
+
+
+def test_field_hashes_ignore_run_time_stamps():
+    rerun = copy.deepcopy(ARTICLE)
+    rerun.update(publishedAt="2026-01-01T00:00:00", updatedAt="2026-01-01T00:00:00", views=12)
+    rerun["schema"].update(datePublished="2026-01-01", dateModified="2026-01-01")
+    assert field_hashes(rerun) == field_hashes(ARTICLE)
+    assert "views" not in field_hashes(ARTICLE)
+
+
+def test_first_run_inserts_and_a_rerun_writes_nothing():
+    snapshot = {}
+    [(op, slug, write)] = run(snapshot, [ARTICLE])
+    assert (op, slug) == ("insert", "atrial-flutter")
+    assert write["currentDocument"] == {"exists": False}
+    assert write["update"]["name"] == document_name("atrial-flutter", "p", "blog")
+    assert write["update"]["fields"]["slug"] == {"stringValue": "atrial-flutter"}
+
+    assert run(snapshot, [dict(ARTICLE, updatedAt="2026-02-02T00:00:00")]) == []
+
+
+def test_update_carries_only_changed_and_removed_fields():
+    snapshot = {}
+    run(snapshot, [ARTICLE])
+    edited = dict(ARTICLE, tags=["flutter", "arrhythmia"])
+    del edited["schema"]
+
+    [(op, _, write)] = run(snapshot, [edited])
+
+    assert op == "update"
+    assert write["updateMask"]["fieldPaths"] == ["schema", "tags", "updatedAt"]
+    assert set(write["update"]["fields"]) == {"tags", "updatedAt"}
+    assert write["currentDocument"] == {"exists": True}
+
+
+def test_missing_articles_are_deleted_from_the_snapshot():
+    snapshot = {}
+    other = dict(ARTICLE, title="Sinus Rhythm", slug="sinus-rhythm")
+    run(snapshot, [ARTICLE, other])
+
+    assert run(snapshot, [ARTICLE]) == [("delete", "sinus-rhythm", {"delete": document_name("sinus-rhythm", "p", "blog")})]
+    assert set(snapshot) == {"atrial-flutter"}
@@ -0,0 +1,33 @@
+import json
+
+from pipeline.chunks import ChunkWriter, split_content
+
+HTML = '<div class="lead"><img src="/a.png"></div>\n<h2 id="x">Key <em>Points</em></h2>\n<p>One</p>\n<h2>Management</h2>\n<p>Two</p>\n'
+
+
+def test_chunks_reassemble_the_content():
+    chunks = split_content(HTML)
+    assert ''.join(c['html'] for c in chunks) == HTML
+    assert [c['heading'] for c in chunks] == [None, 'Key Points', 'Management']
+    assert [c['index'] for c in chunks] == [0, 1, 2]
+
+
+def test_markdown_sections_and_a_body_starting_with_a_heading():
+    chunks = split_content("## Überblick\nText\n## Next\nMore\n")
+    assert [c['heading'] for c in chunks] == ['Überblick', 'Next']
+    assert chunks[0]['bytes'] == len("## Überblick\nText\n".encode('utf-8'))
+
+
+def test_shared_chunks_are_written_once(tmp_path):
+    path = tmp_path / 'dataset.chunks.jsonl'
+    with ChunkWriter(path) as writer:
+        first = writer.split({"title": "A", "content": HTML, "tags": []})
+        writer.split({"title": "B", "content": HTML.replace('One', 'Uno'), "tags": []})
+
+    assert list(first) == ['title', 'contentChunks', 'contentBytes', 'tags']
+    assert first['contentBytes'] == len(HTML.encode('utf-8'))
+    assert all('html' not in c for c in first['contentChunks'])
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert len(lines) == 4   # lead and "Management" are shared
+    bodies = {line['hash']: line['html'] for line in lines}
+    assert ''.join(bodies[c['hash']] for c in first['contentChunks']) == HTML
@@ -0,0 +1,63 @@
+import argparse
+
+import pytest
+
+from pipeline.scripts import load_script
+from pipeline.similarity import top_k_pairs
+
+comparisons = load_script('generate-comparison-articles.py')
+
+
+@pytest.fixture(scope='module')
+def pairs():
+    profiles, _ = comparisons.load_profiles(argparse.Namespace(input=None))
+    return dict(comparisons.confusable_pairs(profiles, comparisons.DEFAULT_TOP_K, comparisons.DEFAULT_MIN_SCORE))
+
+
+@pytest.mark.parametrize("a, b", [
+    ("second degree av block mobitz type i", "second degree av block mobitz type ii"),
+    ("supraventricular tachycardia", "ventricular tachycardia"),
+])
+def test_names_sharing_a_prefix_are_compared(pairs, a, b):
+    assert (a, b) in pairs
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("Atrial Fibrillation", "Atrial Fibrillation with RVR", True),
+    ("ventricular tachycardia", "monomorphic ventricular tachycardia", True),
+    ("Mobitz Type I", "Mobitz Type II", False),
+    ("ventricular tachycardia", "supraventricular tachycardia", False),
+    ("atrial flutter", "atrial fibrillation", False),
+])
+def test_is_variant_compares_whole_words(a, b, expected):
+    assert comparisons.is_variant(a, b) is expected
+    assert comparisons.is_variant(b, a) is expected
+
+
+def test_variants_are_never_paired(pairs):
+    assert not [pair for pair in pairs if comparisons.is_variant(*pair)]
+
+
+def test_top_k_pairs_keeps_the_k_best_partners_of_each_key():
+    vectors = {
+        "a": {"x": 1.0},
+        "b": {"x": 0.9, "y": 0.1},
+        "c": {"x": 0.5, "y": 0.5},
+        "d": {"y": 1.0},
+    }
+    pairs = top_k_pairs(vectors, 1)
+    assert set(pairs) == {("a", "b"), ("c", "d")}
+    assert pairs[("a", "b")] == pytest.approx(0.9)
+
+
+def test_top_k_pairs_applies_links_threshold_and_veto():
+    vectors = {"a": {"x": 1.0}, "b": {"x": 0.2}, "c": {"z": 1.0}}
+    assert top_k_pairs(vectors, 2, min_score=0.3) == {}
+    assert top_k_pairs(vectors, 2, min_score=0.3, links={"a": {"c": 0.5}}) == {("a", "c"): 0.5}
+    assert top_k_pairs(vectors, 2, allowed=lambda a, b: "c" not in (a, b)) == {("a", "b"): pytest.approx(0.2)}
+
+
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_top_k_must_be_positive(value):
+    with pytest.raises(SystemExit):
+        comparisons.main(["--top-k", value])
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import threading
+
+import pytest
+
+from pipeline import daemon
+from pipeline.scripts import load_script
+from pipeline.videos import VideoCatalog
+
+send = load_script('generation-daemon.py').send
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    videos = tmp_path / 'videos'
+    videos.mkdir()
+    (videos / 'stemi-basics.yaml').write_text('videoId: "v1"\ntitle: "STEMI basics"\ncategory: "Arrhythmias"\n')
+    monkeypatch.setattr(daemon, 'VideoCatalog', lambda: VideoCatalog(videos))
+
+    # Unix socket paths are limited to about 100 bytes; tmp_path can be longer
+    socket_path = os.path.join(tempfile.mkdtemp(prefix='epp-'), 'd.sock')
+    thread = threading.Thread(target=daemon.serve, args=(socket_path,), daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.socket_in_use(socket_path):
+            break
+        thread.join(0.05)
+    yield socket_path, videos
+    send(socket_path, {"cmd": "shutdown"})
+    thread.join(5)
+    assert not os.path.exists(socket_path)
+
+
+def test_answers_from_warm_state(server):
+    socket_path, _ = server
+    ping = send(socket_path, {"cmd": "ping"})
+    assert ping['ok'] and ping['videos'] == 1 and 'v2' in ping['generators']
+    assert send(socket_path, {"cmd": "slug", "title": "Atrial Flutter: Guide"})['slug'] == 'atrial-flutter-guide'
+
+    rendered = send(socket_path, {"cmd": "article", "generator": "v2", "name": "atrial flutter"})
+    assert [a['title'] for a in rendered['articles']] == ["Atrial Flutter: ECG Recognition and Emergency Management"]
+    assert rendered['errors'] == {}
+
+
+def test_generate_runs_the_cli_and_errors_do_not_stop_the_daemon(server, tmp_path):
+    socket_path, _ = server
+    output = tmp_path / 'v2.json'
+    result = send(socket_path, {"cmd": "generate", "generator": "v2", "argv": ['--output', str(output)]})
+    assert result['ok'], result.get('error')
+    assert len(json.loads(output.read_text(encoding='utf-8'))) == 17
+
+    bad = send(socket_path, {"cmd": "generate", "generator": "v2", "argv": ['--queue-depth', '0']})
+    assert not bad['ok'] and 'must be at least 1' in bad['error']
+    assert not send(socket_path, {"cmd": "nope"})['ok']
+    assert send(socket_path, {"cmd": "ping"})['ok']
+
+
+def test_second_daemon_on_the_same_socket_is_refused(server):
+    socket_path, _ = server
+    with pytest.raises(RuntimeError):
+        daemon.serve(socket_path)
+
+
+def test_recategorize_applies_only_when_asked(server):
+    socket_path, videos = server
+    preview = send(socket_path, {"cmd": "recategorize"})
+    assert preview['changes'] and not preview['applied']
+    assert 'Arrhythmias' in (videos / 'stemi-basics.yaml').read_text()
+
+    applied = send(socket_path, {"cmd": "recategorize", "apply": True})
+    assert applied['applied']
+    assert preview['changes'][0]['to'] in (videos / 'stemi-basics.yaml').read_text()
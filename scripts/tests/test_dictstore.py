@@ -0,0 +1,60 @@
+import zlib
+
+import pytest
+
+from pipeline.dictstore import CODEC_ZLIB, CODEC_ZSTD, ArticleStore, build_store, encode_article, zstandard
+from pipeline.scripts import load_script
+from pipeline.slugs import article_slug
+
+BEST = load_script('generate-best-ecg-articles.py')
+ARTICLES = list(BEST.generate_articles(BEST.ecg_conditions))
+
+
+@pytest.fixture(params=[CODEC_ZLIB, CODEC_ZSTD])
+def codec(request):
+    if request.param == CODEC_ZSTD and zstandard is None:
+        pytest.skip("needs the zstandard package")
+    return request.param
+
+
+def test_every_article_reads_back_on_its_own(tmp_path, codec):
+    path = tmp_path / 'articles.store'
+    sizes = build_store(path, ARTICLES, codec=codec)
+    assert sizes['articles'] == len(ARTICLES)
+    with ArticleStore(path) as store:
+        assert len(store) == len(ARTICLES)
+        for article in ARTICLES:
+            assert store.get(article_slug(article)) == article
+
+
+def test_dictionary_beats_compressing_each_article_alone(tmp_path):
+    sizes = build_store(tmp_path / 'articles.store', ARTICLES, codec=CODEC_ZLIB)
+    alone = sum(len(zlib.compress(encode_article(a), 9)) for a in ARTICLES)
+    assert sizes['records_bytes'] + sizes['dictionary_bytes'] < alone
+
+
+def test_repeated_slugs_keep_the_first(tmp_path):
+    first, second = dict(ARTICLES[0], slug='afib'), dict(ARTICLES[1], slug='afib')
+    sizes = build_store(tmp_path / 'articles.store', [first, second], codec=CODEC_ZLIB)
+    assert sizes['duplicates'] == ['afib']
+    with ArticleStore(tmp_path / 'articles.store') as store:
+        assert store.get('afib') == first
+
+
+def test_corrupt_records_are_detected(tmp_path):
+    path = tmp_path / 'articles.store'
+    build_store(path, [dict(ARTICLES[0], slug='afib')], codec=CODEC_ZLIB)
+    with ArticleStore(path) as store:
+        offset, length, _, _ = store.index['afib']
+    data = bytearray(path.read_bytes())
+    data[offset + length // 2] ^= 0xff
+    path.write_bytes(bytes(data))
+    with ArticleStore(path) as store, pytest.raises((ValueError, zlib.error)):
+        store.get('afib')
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'not.store'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        ArticleStore(path)
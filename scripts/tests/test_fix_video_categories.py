@@ -0,0 +1,50 @@
+import sys
+
+import yaml
+
+from pipeline import videos
+from pipeline.scripts import load_script
+
+fix = load_script('fix-video-categories.py')
+
+
+def video(directory, stem, title, category, description=''):
+    (directory / f"{stem}.yaml").write_text(
+        yaml.safe_dump({"videoId": stem, "title": title, "description": description, "category": category}),
+        encoding='utf-8',
+    )
+
+
+def test_rules():
+    assert fix.categorize('x', {"title": "Bundle branch block", "category": "Conduction Disorders"}) == \
+        ("Conduction Blocks", "Changed 'Conduction Disorders' to 'Conduction Blocks'")
+    assert fix.categorize('what-is-ihd-ischemic-heart-disease', {"category": "Basics"})[0] == "STEMI & MI"
+    hits = fix.Counter()
+    category, reason = fix.categorize('x', {"title": "Inferior wall STEMI", "category": "Arrhythmias",
+                                            "description": "An inferior wall heart attack"}, hits)
+    assert (category, reason) == ("STEMI & MI", "Contains MI/STEMI keywords: stemi")
+    assert hits == {"stemi": 1, "inferior wall": 2, "heart attack": 1}
+    # Whole words only: "mitral" and "semi" are not MI keywords
+    assert fix.categorize('x', {"title": "Mitral stenosis, semi-urgent", "category": "Valves"}) == ("Valves", "")
+    assert fix.categorize('x', {"title": "STEMI", "category": "Myocardial Infarction"}) == ("Myocardial Infarction", "")
+
+
+def test_each_file_is_parsed_once_and_only_changes_are_written(tmp_path, monkeypatch, capsys):
+    video(tmp_path, 'stemi', "Anterior wall STEMI", "Arrhythmias")
+    video(tmp_path, 'blocks', "Bundle branch blocks", "Conduction Disorders")
+    video(tmp_path, 'axis', "Axis", "ECG Basics")
+    untouched = (tmp_path / 'axis.yaml').read_bytes()
+
+    parsed = []
+    read = videos.read_yaml_safe
+    monkeypatch.setattr(videos, 'read_yaml_safe', lambda path: parsed.append(path) or read(path))
+    monkeypatch.setattr(sys, 'argv', ['fix-video-categories.py', '--videos-dir', str(tmp_path)])
+    fix.main()
+
+    assert sorted(p.name for p in parsed) == ['axis.yaml', 'blocks.yaml', 'stemi.yaml']
+    assert yaml.safe_load((tmp_path / 'stemi.yaml').read_text())['category'] == "STEMI & MI"
+    assert yaml.safe_load((tmp_path / 'blocks.yaml').read_text())['category'] == "Conduction Blocks"
+    assert (tmp_path / 'axis.yaml').read_bytes() == untouched
+    out = capsys.readouterr().out
+    assert "Total fixes applied: 2" in out
+    assert "STEMI & MI: 1" in out and "ECG Basics: 1" in out
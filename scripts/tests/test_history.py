@@ -0,0 +1,83 @@
+import copy
+
+import pytest
+
+from pipeline.history import (
+    MAX_CHUNK, REPO_ROOT, HistoryStore, checkout_path, chunk_text, dataset_key, diff_revisions, diff_snapshots,
+    revisions_by_slug,
+)
+from pipeline.scripts import load_script
+from pipeline.slugs import article_slug
+
+V2 = load_script('generate-ecg-articles-v2.py')
+ARTICLES = list(V2.generate_articles(V2.ecg_conditions[:4]))
+
+
+def test_chunks_rejoin_and_boundaries_follow_the_text():
+    body = ARTICLES[0]['content']
+    chunks = chunk_text(body)
+    assert ''.join(chunks) == body and len(chunks) > 1
+    edited = chunk_text(body.replace('</h2>', '</h2>\n<p>New paragraph.</p>', 1))
+    assert len(set(chunks) & set(edited)) >= len(chunks) - 2
+
+    long_line = 'x' * (MAX_CHUNK * 2 + 5)
+    assert [len(c) for c in chunk_text(long_line)] == [MAX_CHUNK, MAX_CHUNK, 5]
+
+
+def test_checkout_returns_exactly_what_was_committed(tmp_path):
+    store = HistoryStore(tmp_path)
+    snapshot, counts = store.commit({'public/scripts/v2.json': ARTICLES}, 'first')
+    assert counts['articles'] == counts['new_revisions'] == len(ARTICLES)
+    assert store.checkout(store.load_snapshot(snapshot['number'])) == {'public/scripts/v2.json': ARTICLES}
+
+
+def test_regenerated_articles_cost_no_new_objects(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.commit({'v2': ARTICLES})
+    regenerated = copy.deepcopy(ARTICLES)
+    for article in regenerated:
+        article['publishedAt'] = article['updatedAt'] = '2030-01-01T00:00:00'
+    snapshot, counts = store.commit({'v2': regenerated})
+    assert counts['new_revisions'] == 0 and counts['objects'] == 0
+    assert store.checkout(snapshot)['v2'] == regenerated
+    assert diff_snapshots(store.load_snapshot(1), snapshot) == ([], [], [])
+
+
+def test_an_edit_stores_only_the_chunks_it_touches(tmp_path):
+    store = HistoryStore(tmp_path)
+    first, _ = store.commit({'v2': ARTICLES})
+    edited = copy.deepcopy(ARTICLES[:3])
+    edited[1]['content'] = edited[1]['content'].replace('</h2>', '</h2>\n<p>Added line.</p>', 1)
+    edited[2]['title'] = 'Retitled'   # a new slug: removed and added
+    second, counts = store.commit({'v2': edited})
+    assert counts['new_revisions'] == 2
+    assert counts['objects'] <= 5   # two revisions plus one or two chunks
+
+    slugs = [article_slug(a) for a in ARTICLES]
+    added, removed, changed = diff_snapshots(first, second)
+    assert (added, removed, changed) == (['retitled'], sorted(slugs[2:]), [slugs[1]])
+
+    before, after = revisions_by_slug(first), revisions_by_slug(second)
+    patch = diff_revisions(store, before[slugs[1]], after[slugs[1]], slugs[1])
+    assert '+<p>Added line.</p>' in patch and f"b/{slugs[1]}/content" in patch
+    assert diff_revisions(store, before[slugs[0]], after[slugs[0]]) == ''
+
+
+def test_snapshots_by_number(tmp_path):
+    store = HistoryStore(tmp_path)
+    with pytest.raises(LookupError):
+        store.load_snapshot()
+    store.commit({'v2': ARTICLES[:1]}, 'one')
+    store.commit({'v2': ARTICLES[:2]}, 'two')
+    assert store.load_snapshot()['message'] == 'two'
+    assert store.load_snapshot(-2)['message'] == store.load_snapshot(1)['message'] == 'one'
+    with pytest.raises(LookupError):
+        store.load_snapshot(7)
+
+
+def test_datasets_are_named_by_repo_path(tmp_path):
+    assert dataset_key(REPO_ROOT / 'public' / 'scripts' / 'v2.json') == 'public/scripts/v2.json'
+    outside = dataset_key(tmp_path / 'v2.json')
+    assert outside.startswith('/')
+    assert checkout_path(tmp_path / 'out', outside) == tmp_path / 'out' / outside.lstrip('/')
+    assert checkout_path(tmp_path / 'out', 'public/scripts/v2.json') == tmp_path / 'out/public/scripts/v2.json'
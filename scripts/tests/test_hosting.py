@@ -0,0 +1,76 @@
+import json
+from datetime import date, timedelta
+
+from pipeline.hosting import (
+    HTML_CACHE, IMMUTABLE, STABLE_AFTER, glob_escape, header_rules, merge_firebase_headers, rule_group,
+    write_json_if_changed,
+)
+
+TODAY = date(2026, 3, 1)
+
+
+def site(root):
+    for path, text in {
+        '_next/static/chunks/app-3f2a.js': 'js',
+        'index.html': '<html>',
+        'best images (1)/afib.png': 'png',
+        'best images (1)/deep/vt.png': 'png2',
+        'robots.txt': 'User-agent: *',
+        'LICENSE': 'x',
+        '.well-known/keys.json': '{}',
+    }.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(text)
+    return root
+
+
+def cache(rules):
+    return {rule['source']: rule['headers'][0]['value'] for rule in rules}
+
+
+def test_groups_by_top_level_directory_and_extension():
+    assert rule_group('/robots.txt') == '/*.txt'
+    assert rule_group('/best images (1)/deep/vt.png') == '/best images \\(1\\)/**/*.png'
+    assert rule_group('/LICENSE') is None
+    assert glob_escape('a[1]*') == 'a\\[1\\]\\*'
+
+
+def test_new_files_get_the_short_ttl_and_stable_groups_the_long_one(tmp_path):
+    root = site(tmp_path)
+    state = {}
+    rules, counts = header_rules(root, state, TODAY)
+    policies = cache(rules)
+    assert policies['/_next/static/**'] == IMMUTABLE
+    assert policies['**/*.html'] == HTML_CACHE
+    assert policies['/*.txt'] == policies['/best images \\(1\\)/**/*.png'] == "public, max-age=300, must-revalidate"
+    assert counts == {"immutable": 1, "mutable": 3, "changed": 3, "groups": 2}
+    assert not any('well-known' in url for url in state)
+
+    later = TODAY + STABLE_AFTER
+    (root / 'best images (1)' / 'afib.png').write_text('new png')
+    rules, counts = header_rules(root, state, later)
+    policies = cache(rules)
+    assert policies['/*.txt'] == "public, max-age=3600, must-revalidate"
+    # One changed image keeps its whole group on the short TTL
+    assert policies['/best images \\(1\\)/**/*.png'] == "public, max-age=300, must-revalidate"
+    assert counts['changed'] == 1
+
+    (root / 'robots.txt').unlink()
+    header_rules(root, state, later + timedelta(days=1))
+    assert '/robots.txt' not in state
+
+
+def test_generated_rules_replace_last_runs_and_keep_hand_written_ones(tmp_path):
+    config = {"hosting": {"headers": [
+        {"source": "/fonts/**", "headers": [{"key": "X", "value": "1"}]},
+        {"source": "/*.txt", "headers": [{"key": "Cache-Control", "value": "old"}]},
+    ]}}
+    rules, _ = header_rules(site(tmp_path), {}, TODAY)
+    merged = merge_firebase_headers(config, rules, ['/*.txt'])
+    sources = [rule['source'] for rule in merged['hosting']['headers']]
+    assert sources[0] == '/fonts/**'
+    assert sources.count('/*.txt') == 1
+
+    path = tmp_path / 'firebase.json'
+    assert write_json_if_changed(path, merged) is True
+    assert write_json_if_changed(path, json.loads(path.read_text())) is False
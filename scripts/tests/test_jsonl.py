@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from pipeline.jsonl import JsonlReader, JsonlWriter, encode_line, index_path
+
+ARTICLES = [
+    {"title": "Atrial Flutter", "content": "<p>Line one\nline two</p>"},
+    {"title": "Sinus Rhythm", "slug": "normal-sinus-rhythm", "content": "<p>Ritmo – normal ✓</p>"},
+    {"title": "Ventricular Tachycardia", "content": ""},
+]
+
+
+def write(path, articles):
+    with JsonlWriter(path) as writer:
+        for article in articles:
+            writer.write(article)
+    return writer
+
+
+def test_encode_line_is_one_compact_line():
+    line = encode_line(ARTICLES[0])
+    assert line.count(b"\n") == 1 and line.endswith(b"\n")
+    assert json.loads(line) == ARTICLES[0]
+
+
+def test_round_trip_by_slug_and_in_order(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    write(path, ARTICLES)
+
+    with JsonlReader(path) as reader:
+        assert reader.slugs() == ["atrial-flutter", "normal-sinus-rhythm", "ventricular-tachycardia"]
+        assert len(reader) == 3 and "normal-sinus-rhythm" in reader
+        assert reader.get("normal-sinus-rhythm") == ARTICLES[1]
+        assert list(reader) == ARTICLES
+    assert index_path(path).name == "articles.index.json"
+    assert not (tmp_path / "articles.jsonl.tmp").exists()
+
+
+def test_duplicate_slugs_keep_the_first_line(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    repeat = dict(ARTICLES[0], content="<p>second</p>")
+    writer = write(path, ARTICLES + [repeat])
+
+    assert writer.duplicates == ["atrial-flutter"]
+    with JsonlReader(path) as reader:
+        assert len(reader) == 3
+        assert reader.get("atrial-flutter") == ARTICLES[0]
+        assert len(list(reader)) == 4
+
+
+def test_empty_dataset(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    write(path, [])
+    with JsonlReader(path) as reader:
+        assert len(reader) == 0 and list(reader) == []
+
+
+def test_failed_write_keeps_the_previous_dataset(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    write(path, ARTICLES[:1])
+    with pytest.raises(RuntimeError):
+        with JsonlWriter(path) as writer:
+            writer.write(ARTICLES[1])
+            raise RuntimeError("generator failed")
+
+    with JsonlReader(path) as reader:
+        assert reader.slugs() == ["atrial-flutter"]
+    assert not (tmp_path / "articles.jsonl.tmp").exists()
+
+
+def test_reader_refuses_a_file_changed_since_indexing(tmp_path):
+    path = tmp_path / "articles.jsonl"
+    write(path, ARTICLES)
+    with open(path, "ab") as f:
+        f.write(encode_line({"title": "Appended"}))
+    with pytest.raises(ValueError, match="changed since its index was written"):
+        JsonlReader(path)
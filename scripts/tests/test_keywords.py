@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from pipeline.keywords import KeywordAutomaton
+
+
+def matches(keywords, text):
+    return [keyword for _, keyword in KeywordAutomaton(keywords).finditer(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Acute MI on ECG", ["mi"]),
+    ("MI", ["mi"]),
+    ("mi, then (mi) and mi.", ["mi", "mi", "mi"]),
+    ("semi-urgent", []),
+    ("mitral valve", []),
+    ("STEMI and NSTEMI", []),
+    ("admin", []),
+    ("mi_type", []),
+    ("inferior-mi pattern", ["mi"]),
+])
+def test_mi_only_matches_whole_words(text, expected):
+    assert matches(["mi"], text) == expected
+
+
+def test_old_space_padded_keywords_still_match_at_the_end():
+    # "mi " used to need a trailing space; the automaton checks boundaries itself
+    assert matches(["mi "], "posterior MI") == ["mi"]
+    assert len(KeywordAutomaton(["mi ", "MI", " mi"])) == 1
+
+
+def test_overlapping_and_nested_keywords():
+    automaton = KeywordAutomaton(["heart", "heart block", "block", "av block"])
+    found = [(start, keyword) for start, keyword in automaton.finditer("Complete AV block, not heart block")]
+    assert found == [(9, "av block"), (12, "block"), (23, "heart"), (23, "heart block"), (29, "block")]
+
+
+def test_keywords_with_punctuation_edges():
+    # Boundaries are only checked on a side where the keyword has a word character
+    assert matches(["a-fib", "st-"], "a-fibrillation, st-elevation") == ["st-"]
+    assert matches(["a-fib"], "new a-fib.") == ["a-fib"]
+
+
+def test_counts_match_a_word_boundary_regex():
+    keywords = ["mi", "stemi", "ecg", "heart block", "arrhythmia", "lbbb"]
+    texts = [
+        "STEMI vs NSTEMI: ECG findings in acute MI",
+        "Semi-automated ECG reading; mitral MI mimics",
+        "Heart block, 2nd-degree heart-block and LBBB (lbbb)",
+        None,
+    ]
+    expected = {}
+    for keyword in keywords:
+        pattern = re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
+        total = sum(len(pattern.findall(text or "")) for text in texts)
+        if total:
+            expected[keyword] = total
+    assert dict(KeywordAutomaton(keywords).counts(*texts)) == expected
+
+
+def test_no_keywords_find_nothing():
+    assert len(KeywordAutomaton(["", "  "])) == 0
+    assert matches([], "anything") == []
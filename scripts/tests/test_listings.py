@@ -0,0 +1,80 @@
+import json
+
+from pipeline.listings import (
+    article_categories, build_lists, decode_cursor, encode_cursor, indexed_pages, page_path, write_listings,
+)
+
+
+def entry(slug, tags=(), featured=False, published="2025-01-01"):
+    return {"title": slug.title(), "slug": slug, "excerpt": "", "tags": list(tags), "publishedAt": published,
+            "featured": featured, "imageUrl": ""}
+
+
+def page(directory, name, number):
+    return json.loads(page_path(directory, name, number).read_text(encoding='utf-8'))
+
+
+def test_lists_by_feature_category_and_tag():
+    entries = [entry('afib', ['AFib', 'CHA₂DS₂-VASc'], featured=True), entry('flutter', ['qt_interval'])]
+    lists = build_lists(entries, {'afib': 'clinical'})
+    assert [c['slug'] for c in lists['newest']] == ['afib', 'flutter']
+    assert [c['slug'] for c in lists['featured']] == ['afib']
+    assert [c['slug'] for c in lists['category/clinical']] == ['afib']
+    assert 'tag/cha₂ds₂-vasc' in lists and 'tag/qt_interval' in lists
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor('tag/cha₂ds₂-vasc', 3)) == ('tag/cha₂ds₂-vasc', 3)
+
+
+def test_pages_link_to_each_other(tmp_path):
+    lists = build_lists([entry(f"a{i}") for i in range(5)], {})
+    write_listings(lists, tmp_path, page_size=2, fingerprint='abc')
+    first, last = page(tmp_path, 'newest', 1), page(tmp_path, 'newest', 3)
+    assert (first['pages'], first['total'], first['prev']) == (3, 5, None)
+    assert decode_cursor(first['next']) == ('newest', 2)
+    assert last['next'] is None and len(last['articles']) == 1
+    assert json.loads((tmp_path / 'index.json').read_text())['manifest'] == 'abc'
+
+
+def test_rebuild_only_rewrites_and_removes_what_changed(tmp_path):
+    entries = [entry(f"a{i}", ['old-tag'] if i == 0 else []) for i in range(5)]
+    write_listings(build_lists(entries, {}), tmp_path, page_size=2)
+
+    # The tag is gone and the newest list shrinks from three pages to two
+    counts = write_listings(build_lists(entries[1:], {}), tmp_path, page_size=2)
+    assert counts['removed'] == 2
+    assert not (tmp_path / 'tag').exists()
+    assert not page_path(tmp_path, 'newest', 3).exists()
+
+    again = write_listings(build_lists(entries[1:], {}), tmp_path, page_size=2)
+    assert again == {"written": 0, "unchanged": 3, "removed": 0}   # newest 1-2, featured 1
+
+
+def test_files_the_tool_did_not_write_are_left_alone(tmp_path):
+    (tmp_path / 'notes').mkdir()
+    (tmp_path / 'notes' / 'keep.json').write_text('{}')
+    (tmp_path / 'stray.json').write_text('{}')
+    (tmp_path / 'newest').mkdir()
+    (tmp_path / 'newest' / '9.json').write_text('{}')
+
+    write_listings(build_lists([entry('a')], {}), tmp_path)
+    write_listings(build_lists([entry('b')], {}), tmp_path)
+
+    assert (tmp_path / 'notes' / 'keep.json').exists()
+    assert (tmp_path / 'stray.json').exists()
+    assert (tmp_path / 'newest' / '9.json').exists()
+
+
+def test_an_index_cannot_point_outside_the_directory(tmp_path):
+    listings = tmp_path / 'listings'
+    index = {"lists": {"../outside": {"pages": 1}, "newest": {"pages": 2}}}
+    assert indexed_pages(listings, index) == {page_path(listings, 'newest', 1), page_path(listings, 'newest', 2)}
+    assert indexed_pages(listings, None) == set()
+
+
+def test_article_categories_first_dataset_wins(tmp_path):
+    first, second = tmp_path / 'a.json', tmp_path / 'b.json'
+    first.write_text(json.dumps([{"title": "Atrial Flutter", "category": "clinical"}]))
+    second.write_text(json.dumps([{"title": "Atrial Flutter", "category": "education", "slug": "flutter-2"}]))
+    assert article_categories([first, second]) == {'atrial-flutter': 'clinical', 'flutter-2': 'education'}
@@ -0,0 +1,65 @@
+import datetime
+import json
+import os
+
+from pipeline.manifest import (
+    MANIFEST_VERSION, load_manifest, manifest_fingerprint, published_key, refresh_manifest, write_manifest,
+)
+
+
+def write_mdx(directory, name, published, title="T", extra=""):
+    path = directory / name
+    path.write_text(f"---\ntitle: \"{title}\"\npublishedAt: {published}\ntags: [ECG]\n{extra}---\n\nBody\n",
+                    encoding='utf-8')
+    return path
+
+
+def test_entries_are_newest_first_with_frontmatter(tmp_path):
+    write_mdx(tmp_path, 'old.mdx', '2024-01-01')
+    write_mdx(tmp_path, 'new.md', '2025-03-02T10:00:00Z', title="Newer", extra="slug: custom\nfeatured: true\n")
+    entries, counts = refresh_manifest({}, tmp_path)
+    assert [e['file'] for e in entries] == ['new.md', 'old.mdx']
+    assert entries[0]['slug'] == 'custom' and entries[1]['slug'] == 'old'
+    assert entries[0]['featured'] is True and entries[0]['tags'] == ['ECG']
+    assert entries[1]['publishedAt'] == '2024-01-01T00:00:00.000Z'
+    assert counts == {"unchanged": 0, "touched": 0, "parsed": 2, "removed": 0}
+
+
+def test_dates_match_javascript_toisostring():
+    plus_two = datetime.timezone(datetime.timedelta(hours=2))
+    assert published_key(datetime.datetime(2025, 1, 2, 12, 0, 0, 123456, tzinfo=plus_two)) == '2025-01-02T10:00:00.123Z'
+    assert published_key(datetime.date(2025, 1, 2)) == '2025-01-02T00:00:00.000Z'
+    assert published_key(None) == ''
+
+
+def test_refresh_opens_only_what_changed(tmp_path):
+    first = write_mdx(tmp_path, 'a.mdx', '2024-01-01')
+    write_mdx(tmp_path, 'b.mdx', '2024-01-02')
+    gone = write_mdx(tmp_path, 'c.mdx', '2024-01-03')
+    entries, _ = refresh_manifest({}, tmp_path)
+    previous = {e['file']: e for e in entries}
+
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))   # touched, same bytes
+    write_mdx(tmp_path, 'b.mdx', '2024-01-02', title="Edited")
+    gone.unlink()
+
+    entries, counts = refresh_manifest(previous, tmp_path)
+    assert counts == {"unchanged": 0, "touched": 1, "parsed": 1, "removed": 1}
+    assert {e['file']: e['title'] for e in entries} == {'a.mdx': 'T', 'b.mdx': 'Edited'}
+    assert refresh_manifest({e['file']: e for e in entries}, tmp_path)[1]['unchanged'] == 2
+
+
+def test_write_is_skipped_when_unchanged_and_stale_versions_are_ignored(tmp_path):
+    write_mdx(tmp_path, 'a.mdx', '2024-01-01')
+    entries, _ = refresh_manifest({}, tmp_path)
+    path = tmp_path / 'manifest.json'
+    assert write_manifest(entries, path) is True
+    assert write_manifest(entries, path) is False
+    manifest = json.loads(path.read_text(encoding='utf-8'))
+    assert manifest['fingerprint'] == manifest_fingerprint(entries)
+    assert load_manifest(path) == {'a.mdx': entries[0]}
+
+    path.write_text(json.dumps(dict(manifest, version=MANIFEST_VERSION - 1)))
+    assert load_manifest(path) == {}
+    assert load_manifest(tmp_path / 'missing.json') == {}
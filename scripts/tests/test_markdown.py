@@ -0,0 +1,78 @@
+"""
+Expected HTML is what remark + remark-gfm + remark-html give for the same
+input (test_remark_parity.py checks the article corpus against remark itself).
+"""
+
+import pytest
+
+from pipeline.markdown import Unsupported, clean_body, parse, to_html
+
+
+def render(markdown):
+    return to_html(parse(markdown))
+
+
+@pytest.mark.parametrize("markdown, html", [
+    (
+        "# Title\n\nSome *em*, **strong**, ~~del~~ and `code`.",
+        "<h1>Title</h1>\n<p>Some <em>em</em>, <strong>strong</strong>, <del>del</del> and <code>code</code>.</p>\n",
+    ),
+    ("Heading\n=======\n\n---\n\n***", "<h1>Heading</h1>\n<hr>\n<hr>\n"),
+    ("A & B < C\nnext line  \nbreak", "<p>A &#x26; B &#x3C; C\nnext line<br>\nbreak</p>\n"),
+    ("Escaped \\*not em\\* &amp; &copy;", "<p>Escaped *not em* &#x26; ©</p>\n"),
+    ("a_b_c and __init__", "<p>a_b_c and <strong>init</strong></p>\n"),
+    ("**bold**text", "<p><strong>bold</strong>text</p>\n"),
+])
+def test_inline_and_simple_blocks(markdown, html):
+    assert render(markdown) == html
+
+
+@pytest.mark.parametrize("markdown, html", [
+    (
+        "- a\n- b\n  - c\n\n1. one\n2. two",
+        "<ul>\n<li>a</li>\n<li>b\n<ul>\n<li>c</li>\n</ul>\n</li>\n</ul>\n<ol>\n<li>one</li>\n<li>two</li>\n</ol>\n",
+    ),
+    ("3. three\n4. four", '<ol start="3">\n<li>three</li>\n<li>four</li>\n</ol>\n'),
+    ("- a\n\n- b", "<ul>\n<li>\n<p>a</p>\n</li>\n<li>\n<p>b</p>\n</li>\n</ul>\n"),
+    ("* a\n* b\n\ntext", "<ul>\n<li>a</li>\n<li>b</li>\n</ul>\n<p>text</p>\n"),
+])
+def test_lists(markdown, html):
+    assert render(markdown) == html
+
+
+def test_links_and_images_are_normalized():
+    assert render('See [the guide](/blog/a%20b "Guide") and ![ECG *strip*](/img/é.png)') == (
+        '<p>See <a href="/blog/a%20b" title="Guide">the guide</a> and '
+        '<img src="/img/%C3%A9.png" alt="ECG strip"></p>\n'
+    )
+    assert render("[x](</a b>)") == '<p><a href="/a%20b">x</a></p>\n'
+
+
+def test_parse_builds_mdast():
+    assert parse("# Hi *there*") == {"type": "root", "children": [{
+        "type": "heading",
+        "depth": 1,
+        "children": [
+            {"type": "text", "value": "Hi "},
+            {"type": "emphasis", "children": [{"type": "text", "value": "there"}]},
+        ],
+    }]}
+
+
+@pytest.mark.parametrize("markdown", [
+    "> quote",
+    "| a | b |\n|---|---|\n| 1 | 2 |",
+    "```\ncode\n```",
+    "<div>x</div>",
+    "visit https://ecgkid.com",
+])
+def test_syntax_left_to_remark_is_unsupported(markdown):
+    with pytest.raises(Unsupported):
+        parse(markdown)
+
+
+def test_clean_body_matches_lib_articles():
+    assert clean_body("\n\n  a\n      b\n\n\n\nc  ") == "a\nb\n\nc"
+    assert clean_body(" text﻿") == "text"
+    # JavaScript's \s includes newlines, so a blank run before indentation collapses too
+    assert clean_body("   text   \n\n\n\n\n more") == "text   \nmore"
@@ -0,0 +1,41 @@
+import json
+
+from pipeline.metadata import MetadataCollector, content_metadata, heading_id
+
+
+def test_html_body():
+    content = ('<h2>Key Points</h2><p>Rate &gt; 100 bpm in <strong>all</strong> leads.</p>'
+               '<img src="/a.png"><h3>Wolff-Parkinson-White</h3><style>p { color: red }</style>'
+               '<img src="/a.png">')
+    meta = content_metadata(content)
+    assert meta['headings'] == [
+        {"id": "key-points", "text": "Key Points", "level": 2},
+        {"id": "wolff-parkinson-white", "text": "Wolff-Parkinson-White", "level": 3},
+    ]
+    assert meta['images'] == ['/a.png']
+    assert meta['readingTime'] == 1
+    assert 'color' not in json.dumps(meta)
+
+
+def test_markdown_body_counts_words_not_markup():
+    content = "## Axis\n\n**Left** axis [deviation](/blog/axis) and ![ECG](/ecg.png) don't mix.\n"
+    meta = content_metadata(content)
+    assert meta['wordCount'] == 8   # Axis, Left, axis, deviation, and, ECG, don't, mix
+    assert meta['headings'] == [{"id": "axis", "text": "Axis", "level": 2}]
+    assert meta['images'] == ['/ecg.png']
+
+
+def test_reading_time_rounds_up():
+    assert content_metadata(' '.join(['word'] * 401))['readingTime'] == 3
+
+
+def test_heading_id_matches_table_of_contents():
+    assert heading_id("Mobitz II (Type 2) — Management") == 'mobitz-ii-type-2-management'
+
+
+def test_collector_keys_by_slug(tmp_path):
+    collector = MetadataCollector()
+    article = {"title": "Atrial Flutter: Guide", "content": "<h2>A</h2>"}
+    assert collector.observe(article) is article
+    collector.write(tmp_path / 'meta.json')
+    assert list(json.loads((tmp_path / 'meta.json').read_text())) == ['atrial-flutter-guide']
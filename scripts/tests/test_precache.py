@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from pipeline.precache import (
+    FEATURED_BONUS, HOT_BONUS, ShardWriter, article_candidates, build_manifest, hot_bonuses, page_size, select,
+    video_candidates,
+)
+from pipeline.views import load_ranking
+
+
+def entry(slug, featured=False, image='', size=1000):
+    return {"slug": slug, "featured": featured, "imageUrl": image, "hash": f"hash-{slug}", "size": size}
+
+
+def candidate(url, priority, size):
+    return {"url": url, "revision": url, "size": size, "kind": "page", "priority": priority}
+
+
+def by_url(candidates):
+    return {c['url']: c for c in candidates}
+
+
+def test_pages_come_from_the_article_manifest(tmp_path):
+    (tmp_path / 'ecg').mkdir()
+    (tmp_path / 'ecg' / 'afib.jpg').write_bytes(b'x' * 300)
+    entries = [entry('afib', image='/ecg/afib.jpg', size=2000), entry('no-image', image='/ecg/missing.jpg')]
+
+    found = by_url(article_candidates(entries, {}, {}, tmp_path))
+
+    assert set(found) == {'/blog/afib', '/ecg/afib.jpg', '/blog/no-image'}
+    assert found['/blog/afib']['revision'] == 'hash-afib'
+    assert found['/blog/afib']['size'] == page_size(2000)
+    assert found['/ecg/afib.jpg']['size'] == 300
+    assert found['/ecg/afib.jpg']['priority'] < found['/blog/afib']['priority']
+
+
+def test_featured_category_and_hot_raise_priority(tmp_path):
+    entries = [entry('plain'), entry('featured', featured=True), entry('clinical'), entry('hot')]
+    bonuses = hot_bonuses({('blog', 'hot'): 30.0, ('blog', 'warm'): 15.0})
+    found = by_url(article_candidates(entries, {'clinical': 'clinical'}, bonuses, tmp_path))
+
+    plain = found['/blog/plain']['priority']
+    assert found['/blog/featured']['priority'] == plain + FEATURED_BONUS
+    assert found['/blog/clinical']['priority'] > plain
+    assert found['/blog/hot']['priority'] == plain + HOT_BONUS
+    assert bonuses[('blog', 'warm')] == HOT_BONUS / 2
+
+
+def test_hot_bonuses_of_an_empty_ranking():
+    assert hot_bonuses({}) == {}
+
+
+def test_load_ranking(tmp_path):
+    path = tmp_path / 'hot.json'
+    path.write_text(json.dumps({"entries": [{"route": "blog", "slug": "afib", "score": 2.5}]}))
+    assert load_ranking(path) == {('blog', 'afib'): 2.5}
+    assert load_ranking(tmp_path / 'missing.json') == {}
+    for malformed in ('{"entries": 3}', '{"entries": [{"slug": "afib"}]}', '[]', 'not json'):
+        path.write_text(malformed)
+        assert load_ranking(path) == {}
+
+
+def test_select_fills_the_budget_in_priority_order():
+    candidates = [
+        candidate('/a', 5.0, 600),
+        candidate('/b', 4.0, 600),    # no longer fits
+        candidate('/c', 3.0, 300),    # still does
+        candidate('/a', 1.0, 600),    # duplicate keeps the higher priority
+    ]
+    selected, skipped = select(candidates, 1000)
+    assert [e['url'] for e in selected] == ['/a', '/c']
+    assert [e['url'] for e in skipped] == ['/b']
+    assert selected[0]['priority'] == 5.0
+
+    manifest = build_manifest(selected, 1000)
+    assert manifest['bytes'] == 900
+    assert manifest['version'] == build_manifest(selected, 1000)['version']
+    assert manifest['version'] != build_manifest(selected[:1], 1000)['version']
+
+
+def test_video_shards_are_content_addressed_and_pruned(tmp_path):
+    videos = tmp_path / 'videos'
+    videos.mkdir()
+    (videos / 'afib-basics.yaml').write_text("videoId: v1\ntitle: AFib basics\ncategory: Arrhythmias\n")
+    (videos / 'leads.yaml').write_text("videoId: v2\ntitle: Leads\ncategory: ECG Fundamentals\n")
+    public = tmp_path / 'public'
+    stale = public / 'offline' / 'videos' / 'arrhythmias.0123456789abcdef.json'
+    stale.parent.mkdir(parents=True)
+    stale.write_text('{}')
+
+    shards = ShardWriter(public / 'offline' / 'videos', public)
+    bonuses = hot_bonuses({('watch', 'afib-basics'): 1.0})
+    found = {c['url'].split('/')[-1].split('.')[0]: c for c in video_candidates(shards, bonuses, videos)}
+
+    assert set(found) == {'arrhythmias', 'ecg-fundamentals'}
+    assert found['arrhythmias']['url'].startswith('/offline/videos/arrhythmias.')
+    assert found['arrhythmias']['priority'] > found['ecg-fundamentals']['priority']
+    assert shards.prune() == 1
+    assert not stale.exists()
+    shard = json.loads((public / found['arrhythmias']['url'].lstrip('/')).read_text())
+    assert shard['videos'][0]['slug'] == 'afib-basics'
+
+
+@pytest.mark.parametrize("budget", [0, 1])
+def test_nothing_fits_a_tiny_budget(budget):
+    selected, skipped = select([candidate('/a', 1.0, 10)], budget)
+    assert selected == [] and len(skipped) == 1
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from pipeline.records import ECG_CONDITION_FIELDS, RecordError, split_list, stream_records, validate_record
+
+CONDITION = {
+    "name": "Atrial Flutter",
+    "filename": "atrial-flutter.jpg",
+    "rate": "150 bpm",
+    "features": ["Sawtooth flutter waves", "Regular ventricular rate"],
+    "significance": "Common re-entrant arrhythmia",
+    "management": "Rate control and anticoagulation",
+    "tags": ["flutter", "arrhythmia"],
+    "category": "clinical",
+    "difficulty": "intermediate",
+}
+
+
+class Collect:
+    def __init__(self):
+        self.errors = []
+
+    def __call__(self, source, line_no, error):
+        self.errors.append((line_no, str(error)))
+
+
+def write_csv(path, rows):
+    header = list(CONDITION)
+    lines = [','.join(header)]
+    for row in rows:
+        lines.append(','.join(row))
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def csv_row(condition):
+    return ['"' + ('|'.join(v) if isinstance(v, list) else v) + '"' for v in condition.values()]
+
+
+def test_split_list_drops_blank_items():
+    assert split_list(" a | b ||  ") == ["a", "b"]
+
+
+def test_validate_record_round_trips_a_clean_record():
+    assert validate_record(CONDITION, ECG_CONDITION_FIELDS) == CONDITION
+
+
+def test_validate_record_strips_strings_and_splits_lists():
+    raw = dict(CONDITION, name="  Atrial Flutter ", tags="flutter|arrhythmia")
+    record = validate_record(raw, ECG_CONDITION_FIELDS)
+    assert record["name"] == "Atrial Flutter"
+    assert record["tags"] == ["flutter", "arrhythmia"]
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"name": None}, "missing field 'name'"),
+    ({"rate": "  "}, "field 'rate' is empty"),
+    ({"features": [1, 2]}, "must be a list of strings"),
+    ({"rate": 150}, "field 'rate' must be a string"),
+    ({"category": "cardiology"}, "expected one of: clinical, education, technology"),
+])
+def test_validate_record_rejects(change, message):
+    with pytest.raises(RecordError, match=message):
+        validate_record(dict(CONDITION, **change), ECG_CONDITION_FIELDS)
+
+
+def test_validate_record_rejects_non_objects():
+    with pytest.raises(RecordError, match="expected an object, got list"):
+        validate_record([], ECG_CONDITION_FIELDS)
+
+
+def test_stream_csv_matches_jsonl(tmp_path):
+    csv_path = tmp_path / "catalog.csv"
+    write_csv(csv_path, [csv_row(CONDITION)])
+    jsonl_path = tmp_path / "catalog.jsonl"
+    jsonl_path.write_text(json.dumps(CONDITION) + "\n", encoding="utf-8")
+
+    assert list(stream_records(csv_path, ECG_CONDITION_FIELDS)) == [CONDITION]
+    assert list(stream_records(jsonl_path, ECG_CONDITION_FIELDS)) == [CONDITION]
+
+
+def test_stream_skips_and_reports_bad_rows(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+    path.write_text("\n".join([
+        json.dumps(CONDITION),
+        "{not json",
+        "",
+        json.dumps(dict(CONDITION, difficulty="expert")),
+        json.dumps(dict(CONDITION, name="Sinus Rhythm")),
+    ]) + "\n", encoding="utf-8")
+    errors = Collect()
+
+    names = [record["name"] for record in stream_records(path, ECG_CONDITION_FIELDS, on_error=errors)]
+
+    assert names == ["Atrial Flutter", "Sinus Rhythm"]
+    assert [line_no for line_no, _ in errors.errors] == [2, 4]
+    assert errors.errors[0][1].startswith("invalid JSON")
+
+
+def test_stream_csv_reports_extra_values(tmp_path):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, [csv_row(CONDITION) + ['"extra"']])
+    errors = Collect()
+
+    assert list(stream_records(path, ECG_CONDITION_FIELDS, on_error=errors)) == []
+    assert errors.errors == [(2, "1 extra value(s) in row")]
+
+
+def test_stream_fails_before_the_first_record(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported catalog format"):
+        stream_records(tmp_path / "catalog.txt", ECG_CONDITION_FIELDS)
+    with pytest.raises(FileNotFoundError):
+        stream_records(tmp_path / "missing.csv", ECG_CONDITION_FIELDS)
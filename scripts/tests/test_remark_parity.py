@@ -0,0 +1,57 @@
+"""
+pipeline.markdown must produce exactly the HTML remark gives lib/articles.ts,
+since the site serves the cached HTML in its place. Needs node and the site's
+node_modules: skipped without them locally, but a failure under CI (or with
+REMARK_PARITY=1, as `npm run test:pipeline` sets), so parity is never
+silently unchecked there.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pipeline.markdown import Unsupported, clean_body, parse, to_html
+from pipeline.mdx import mdx_files, read_mdx
+
+ROOT = Path(__file__).resolve().parents[2]
+RENDER_SCRIPT = Path(__file__).with_name('render-remark.mjs')
+
+HAVE_REMARK = shutil.which('node') is not None and (ROOT / 'node_modules' / 'remark').is_dir()
+REQUIRED = bool(os.environ.get('CI') or os.environ.get('REMARK_PARITY'))
+
+pytestmark = pytest.mark.skipif(not (HAVE_REMARK or REQUIRED), reason="needs node and `npm install`")
+
+
+def remark_html(bodies):
+    result = subprocess.run(
+        ['node', str(RENDER_SCRIPT)],
+        input=json.dumps(bodies),
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    return json.loads(result.stdout)
+
+
+def corpus():
+    bodies = {}
+    for path in mdx_files():
+        markdown = clean_body(read_mdx(path)[1])
+        try:
+            bodies[path.name] = (markdown, to_html(parse(markdown)))
+        except Unsupported:
+            continue
+    return bodies
+
+
+def test_articles_render_like_remark():
+    assert HAVE_REMARK, "remark parity is required here: install node and run `npm install`"
+    bodies = corpus()
+    expected = remark_html([markdown for markdown, _ in bodies.values()])
+    mismatches = [name for (name, (_, ours)), theirs in zip(bodies.items(), expected) if ours != theirs]
+    assert not mismatches, f"{len(mismatches)} article(s) render differently from remark: {mismatches[:5]}"
@@ -0,0 +1,51 @@
+import json
+
+from pipeline.rendercache import (
+    RENDERER_VERSION, cache_key, load_entry, markdown_key, prune, render_cached, renderer_id,
+)
+
+REMARK = "remark@15.0.1 remark-gfm@4.0.1 remark-html@16.0.1"
+BODY = "\n# Title\n\nSome **bold** text.\n"
+
+
+def lock(tmp_path, versions):
+    path = tmp_path / 'package-lock.json'
+    path.write_text(json.dumps({"packages": {f"node_modules/{n}": {"version": v} for n, v in versions.items()}}))
+    return path
+
+
+def test_renderer_id_reads_the_locked_versions(tmp_path):
+    path = lock(tmp_path, {"remark": "15.0.1", "remark-gfm": "4.0.1", "remark-html": "16.0.1", "other": "1.0.0"})
+    assert renderer_id(path) == REMARK
+    assert renderer_id(lock(tmp_path, {"remark": "15.0.1"})) == "remark@15.0.1 remark-gfm@ remark-html@"
+    assert renderer_id(tmp_path / 'missing.json') == "remark@ remark-gfm@ remark-html@"
+
+
+def test_key_covers_the_cleaned_body_and_the_renderer():
+    assert cache_key(BODY, REMARK) == markdown_key("# Title\n\nSome **bold** text.", REMARK)
+    assert cache_key(BODY, REMARK) == cache_key(BODY + "\n\n\n", REMARK)
+    assert cache_key(BODY, REMARK) != cache_key(BODY, REMARK.replace("16.0.1", "16.0.2"))
+
+
+def test_render_cached_parses_once(tmp_path):
+    status, key = render_cached(BODY, REMARK, tmp_path)
+    assert status == 'parsed'
+    entry = load_entry(tmp_path / f"{key}.json")
+    assert entry['version'] == RENDERER_VERSION
+    assert entry['renderer'] == REMARK
+    assert entry['html'] == "<h1>Title</h1>\n<p>Some <strong>bold</strong> text.</p>\n"
+
+    assert render_cached(BODY, REMARK, tmp_path) == ('hit', key)
+    # An upgraded remark gets its own entry; the old one is pruned
+    status, upgraded = render_cached(BODY, "remark@16.0.0 remark-gfm@4.0.1 remark-html@16.0.1", tmp_path)
+    assert status == 'parsed' and upgraded != key
+    assert prune({upgraded}, tmp_path) == 1
+    assert [p.stem for p in tmp_path.glob('*.json')] == [upgraded]
+
+
+def test_entries_of_another_version_are_rebuilt(tmp_path):
+    _, key = render_cached(BODY, REMARK, tmp_path)
+    path = tmp_path / f"{key}.json"
+    path.write_text(json.dumps(dict(json.loads(path.read_text()), version=RENDERER_VERSION - 1)))
+    assert load_entry(path) is None
+    assert render_cached(BODY, REMARK, tmp_path) == ('parsed', key)
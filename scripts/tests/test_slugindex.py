@@ -0,0 +1,123 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pipeline.scripts import load_script
+from pipeline.slugindex import (
+    BloomFilter, build_perfect_hash, build_slug_index, perfect_hash_lookup, site_keys, sources_fingerprint,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+SOURCES_SCRIPT = ROOT / 'lib' / 'slugIndexSources.mjs'
+
+
+def article(title, canonical):
+    url = f"https://ecgkid.com/blog/{canonical}"
+    return {"title": title, "seo": {"canonicalUrl": url}, "schema": {"mainEntityOfPage": {"@id": url}}}
+
+
+def test_legacy_urls_redirect_to_the_published_slug():
+    pages, redirects, conflicts = site_keys(['leads'], ['axis'], [article("Atrial Flutter: Guide", 'atrial-flutter')])
+    assert pages == {'blog/leads', 'watch/axis', 'blog/atrial-flutter-guide'}
+    assert redirects == {'blog/atrial-flutter': 'blog/atrial-flutter-guide'}
+    assert conflicts == []
+
+
+def test_a_legacy_url_never_shadows_a_page():
+    _, redirects, _ = site_keys(['atrial-flutter'], [], [article("Atrial Flutter: Guide", 'atrial-flutter')])
+    assert redirects == {}
+
+
+def test_two_canonicals_for_one_legacy_url_are_a_conflict():
+    articles = [article("Flutter: Basics", 'atrial-flutter'), article("Flutter: Advanced", 'atrial-flutter')]
+    _, redirects, conflicts = site_keys([], [], articles)
+    assert redirects == {'blog/atrial-flutter': 'blog/flutter-basics'}
+    assert conflicts == [('blog/atrial-flutter', 'blog/flutter-basics', 'blog/flutter-advanced')]
+
+
+def test_build_refuses_conflicting_datasets(tmp_path, capsys):
+    first, second = tmp_path / 'a.json', tmp_path / 'b.json'
+    first.write_text(json.dumps([article("Flutter: Basics", 'atrial-flutter')]))
+    second.write_text(json.dumps([article("Flutter: Advanced", 'atrial-flutter')]))
+    output = tmp_path / 'slug-index.json'
+
+    with pytest.raises(SystemExit) as exited:
+        load_script('build-slug-index.py').main([str(first), str(second), '--output', str(output)])
+    assert exited.value.code
+    assert "claimed by blog/flutter-basics and blog/flutter-advanced" in capsys.readouterr().out
+    assert not output.exists()
+
+
+def test_perfect_hash_places_every_key():
+    mapping = {f"blog/legacy-{i}": f"blog/page-{i}" for i in range(200)}
+    table = build_perfect_hash(mapping)
+    assert all(perfect_hash_lookup(table, k) == v for k, v in mapping.items())
+    assert perfect_hash_lookup(table, 'blog/page-1') is None
+    assert perfect_hash_lookup(build_perfect_hash({}), 'blog/x') is None
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(500)
+    keys = [f"blog/article-{i}" for i in range(500)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"watch/other-{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.03
+
+
+def test_sources_fingerprint_follows_the_inputs(tmp_path):
+    (tmp_path / 'a.mdx').write_text('')
+    dataset = tmp_path / 'd.json'
+    dataset.write_text('[]')
+    before = sources_fingerprint([tmp_path / 'a.mdx'], [], [dataset])
+    assert build_slug_index([], {}, before)['sources'] == before
+
+    dataset.write_text('[{}]')
+    assert sources_fingerprint([tmp_path / 'a.mdx'], [], [dataset]) != before
+    assert sources_fingerprint([tmp_path / 'a.mdx'], [tmp_path / 'a.yaml'], []) != \
+        sources_fingerprint([tmp_path / 'a.mdx'], [], [])
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node")
+def test_next_config_computes_the_same_fingerprint(tmp_path):
+    """next.config.ts fails the middleware open when these disagree"""
+    for directory in ('content/articles', 'content/videos', 'public/scripts'):
+        (tmp_path / directory).mkdir(parents=True)
+    (tmp_path / 'content/articles/atrial-flutter.mdx').write_text('---\n---\n')
+    (tmp_path / 'content/articles/notes.txt').write_text('')
+    (tmp_path / 'content/videos/leads.yaml').write_text('title: Leads\n')
+    (tmp_path / 'public/scripts/ecg-blog-articles-v2.json').write_text('[{"title": "Ü"}]')
+    (tmp_path / 'public/scripts/ecg-blog-articles-v2.meta.json').write_text('{}')
+
+    expected = sources_fingerprint(
+        [tmp_path / 'content/articles/atrial-flutter.mdx'],
+        [tmp_path / 'content/videos/leads.yaml'],
+        [tmp_path / 'public/scripts/ecg-blog-articles-v2.json'],
+    )
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e',
+         f"import {{ sourcesFingerprint }} from {json.dumps(SOURCES_SCRIPT.as_uri())};"
+         f"console.log(sourcesFingerprint({json.dumps(str(tmp_path))}))"],
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == expected
+
+
+def test_committed_index_matches_the_tree():
+    index = json.loads((ROOT / 'lib' / 'slug-index.json').read_text(encoding='utf-8'))
+    script = load_script('build-slug-index.py')
+    videos = sorted(p for p in script.VIDEOS_DIR.iterdir() if p.suffix in ('.yaml', '.yml'))
+    assert index['sources'] == sources_fingerprint(
+        script.mdx_files(script.ARTICLES_DIR), videos, script.published_datasets(),
+    )
+
+
+def test_generated_datasets_leave_every_legacy_url_one_owner():
+    v2, best = load_script('generate-ecg-articles-v2.py'), load_script('generate-best-ecg-articles.py')
+    articles = list(v2.generate_articles(v2.ecg_conditions)) + list(best.generate_articles(best.ecg_conditions))
+    _, _, conflicts = site_keys([], [], articles)
+    assert conflicts == []
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+from pipeline.scripts import load_script
+from pipeline.slugregistry import Claim, SlugRegistry, dataset_articles, mdx_source, video_source
+
+add_slugs = load_script('add-slugs-to-articles.py').add_slugs
+
+
+def article(title, **fields):
+    return dict({"title": title, "content": f"<p>{title}</p>"}, **fields)
+
+
+ALPHA, BETA, GAMMA = article("Alpha Rhythm"), article("Beta Rhythm"), article("Gamma Rhythm")
+
+
+def write(path, articles):
+    path.write_text(json.dumps(articles, indent=2, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def read(path):
+    return {a['title']: a['slug'] for a in json.loads(path.read_text(encoding='utf-8'))}
+
+
+def publish(registry_path, datasets, claims=()):
+    """build-slug-registry.py followed by add-slugs-to-articles.py"""
+    registry = SlugRegistry.load(registry_path)
+    registry.resolve(claims, list(dataset_articles(datasets)))
+    registry.save(registry_path)
+    for path in datasets:
+        add_slugs(path, registry)
+    return registry
+
+
+def test_inserting_an_article_keeps_published_slugs(tmp_path):
+    registry_path = tmp_path / 'registry.json'
+    dataset = write(tmp_path / 'rhythms.json', [ALPHA, BETA])
+    publish(registry_path, [dataset])
+    assert read(dataset) == {"Alpha Rhythm": "alpha-rhythm", "Beta Rhythm": "beta-rhythm"}
+
+    published = json.loads(dataset.read_text(encoding='utf-8'))
+    write(dataset, [GAMMA] + published)
+    registry = publish(registry_path, [dataset])
+
+    assert read(dataset) == {"Gamma Rhythm": "gamma-rhythm", "Alpha Rhythm": "alpha-rhythm", "Beta Rhythm": "beta-rhythm"}
+    assert registry.collisions == []
+
+
+def test_retitled_or_moved_article_keeps_its_slug(tmp_path):
+    registry_path = tmp_path / 'registry.json'
+    first = write(tmp_path / 'first.json', [ALPHA, BETA])
+    publish(registry_path, [first])
+
+    alpha, beta = json.loads(first.read_text(encoding='utf-8'))
+    alpha['title'] = "Alpha Rhythm (fixed typo)"
+    write(first, [alpha])
+    second = write(tmp_path / 'second.json', [beta])
+    registry = publish(registry_path, [first, second])
+
+    assert read(first) == {"Alpha Rhythm (fixed typo)": "alpha-rhythm"}
+    assert read(second) == {"Beta Rhythm": "beta-rhythm"}
+    assert len(registry.sources) == 2
+
+
+def test_regenerated_dataset_without_slugs_keeps_resolved_collisions(tmp_path):
+    registry_path = tmp_path / 'registry.json'
+    first = write(tmp_path / 'first.json', [ALPHA])
+    second = write(tmp_path / 'second.json', [ALPHA])
+    registry = publish(registry_path, [first, second])
+    assert registry.collisions[0]['assigned'] == "alpha-rhythm-2"
+    assert read(second) == {"Alpha Rhythm": "alpha-rhythm-2"}
+
+    # A generator rewrites the dataset from scratch, without slugs
+    write(second, [ALPHA])
+    write(first, [ALPHA])
+    publish(registry_path, [second, first])
+    assert read(first) == {"Alpha Rhythm": "alpha-rhythm"}
+    assert read(second) == {"Alpha Rhythm": "alpha-rhythm-2"}
+
+
+def test_article_converted_to_mdx_shares_its_source(tmp_path):
+    dataset = write(tmp_path / 'rhythms.json', [ALPHA])
+    claims = [Claim(mdx_source('alpha-rhythm.mdx'), 'blog', 'alpha-rhythm', 'alpha-rhythm.mdx', True)]
+    registry = publish(tmp_path / 'registry.json', [dataset], claims)
+
+    assert registry.collisions == []
+    assert registry.lookup('blog', 'alpha-rhythm') == mdx_source('alpha-rhythm.mdx')
+    assert read(dataset) == {"Alpha Rhythm": "alpha-rhythm"}
+
+
+def test_routes_do_not_clash(tmp_path):
+    registry_path = tmp_path / 'registry.json'
+    dataset = write(tmp_path / 'rhythms.json', [article("Alpha Rhythm", slug="alpha")])
+    publish(registry_path, [dataset])
+    registry = SlugRegistry.load(registry_path)
+    registry.resolve([Claim(video_source('abc'), 'watch', 'alpha', 'alpha.yaml', True)], dataset_articles([dataset]))
+    assert registry.collisions == []
+    assert registry.lookup('watch', 'alpha') == video_source('abc')
+
+
+def test_clash_between_files_is_reported_not_resolved():
+    registry = SlugRegistry()
+    registry.resolve([
+        Claim(video_source('one'), 'watch', 'sinus', 'sinus.yaml', True),
+        Claim(video_source('two'), 'watch', 'sinus', 'sinus.yaml', True),
+    ])
+    assert registry.collisions == [{
+        "key": "watch/sinus", "holder": video_source('one'), "source": video_source('two'), "assigned": None,
+    }]
+
+
+def test_same_stored_slug_twice_is_a_duplicate(tmp_path):
+    registry_path = tmp_path / 'registry.json'
+    first = write(tmp_path / 'first.json', [ALPHA])
+    publish(registry_path, [first])
+    copy = write(tmp_path / 'copy.json', json.loads(first.read_text(encoding='utf-8')))
+
+    registry = SlugRegistry.load(registry_path)
+    registry.resolve([], dataset_articles([first, copy]))
+    [(source, origins)] = registry.duplicates
+    assert registry.slug_for(source) == "alpha-rhythm"
+    assert len(origins) == 2
+
+
+def test_resolution_does_not_depend_on_dataset_order(tmp_path):
+    first = write(tmp_path / 'first.json', [ALPHA, BETA])
+    second = write(tmp_path / 'second.json', [article("Alpha  Rhythm!"), GAMMA])
+    forward, backward = SlugRegistry(), SlugRegistry()
+    forward.resolve([], dataset_articles([first, second]))
+    backward.resolve([], dataset_articles([second, first]))
+    assert forward.sources == backward.sources
+
+
+def test_prune_forgets_unclaimed_sources(tmp_path):
+    registry = SlugRegistry()
+    registry.resolve([], dataset_articles([write(tmp_path / 'a.json', [ALPHA, BETA])]))
+    fresh = SlugRegistry(registry.sources)
+    fresh.resolve([], dataset_articles([write(tmp_path / 'a.json', [ALPHA])]))
+    assert fresh.prune() == 1
+    assert fresh.lookup('blog', 'beta-rhythm') is None
+
+
+@pytest.mark.parametrize("fields, drift", [
+    ({}, []),
+    ({"slug": "alpha-rhythm", "seo": {"canonicalUrl": "https://ecgkid.com/blog/alpha-rhythm"}}, []),
+    ({"seo": {"canonicalUrl": "https://ecgkid.com/blog/alpha"}},
+     [("seo.canonicalUrl", "https://ecgkid.com/blog/alpha")]),
+    ({"schema": {"mainEntityOfPage": {"@id": "https://ecgkid.com/watch/alpha-rhythm"}}},
+     [("schema.@id", "https://ecgkid.com/watch/alpha-rhythm")]),
+])
+def test_drift(tmp_path, fields, drift):
+    registry = SlugRegistry()
+    dataset = tmp_path / 'a.json'
+    registry.resolve([], [(dataset, ALPHA)])
+    candidate = dict(ALPHA, **fields)
+    assert registry.drift(registry.article_source(dataset, candidate), candidate) == drift
@@ -0,0 +1,27 @@
+import pytest
+
+from pipeline.slugs import article_slug, create_slug
+
+
+@pytest.mark.parametrize("title, slug", [
+    ("Atrial Flutter", "atrial-flutter"),
+    ("Anterior Wall MI (AWMI): ECG Recognition", "anterior-wall-mi-awmi-ecg-recognition"),
+    ("  Wolff–Parkinson–White  ", "wolffparkinsonwhite"),
+    ("ST - elevation -- pattern", "st-elevation-pattern"),
+    ("Torsades de Pointes!", "torsades-de-pointes"),
+    ("Ritmo sinusal: niños", "ritmo-sinusal-niños"),
+])
+def test_create_slug(title, slug):
+    assert create_slug(title) == slug
+
+
+def test_create_slug_is_capped_at_100_characters():
+    slug = create_slug("word " * 40)
+    assert len(slug) == 100
+    assert slug.startswith("word-word")
+
+
+def test_article_slug_prefers_the_stored_slug():
+    assert article_slug({"title": "Atrial Flutter", "slug": "flutter"}) == "flutter"
+    assert article_slug({"title": "Atrial Flutter", "slug": ""}) == "atrial-flutter"
+    assert article_slug({"title": "Atrial Flutter"}) == "atrial-flutter"
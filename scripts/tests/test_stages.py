@@ -0,0 +1,96 @@
+import gzip
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from pipeline.generator import build_parser, write_articles
+from pipeline.scripts import load_script
+from pipeline.stages import StagedPipeline
+
+
+def square(n):
+    return n * n
+
+
+def odd_or_none(n):
+    return n if n % 2 else None
+
+
+def test_items_keep_their_order_and_none_drops_them():
+    pipeline = StagedPipeline(range(50), [('square', square), ('odd', odd_or_none)], depth=2)
+    assert list(pipeline) == [n * n for n in range(50) if n % 2]
+    assert pipeline.timings['square']['items'] == 50
+    assert pipeline.timings['odd']['items'] == 50
+
+
+def test_queues_bound_how_far_the_source_runs_ahead():
+    pulled = []
+    release = threading.Event()
+
+    def source():
+        for n in range(100):
+            pulled.append(n)
+            yield n
+
+    def slow(n):
+        release.wait()
+        return n
+
+    pipeline = iter(StagedPipeline(source(), [('slow', slow)], depth=2))
+    first = threading.Thread(target=lambda: next(pipeline))
+    first.start()
+    first.join(0.5)
+    # One item in the stage, two in its input queue, one waiting to be put
+    assert len(pulled) <= 4
+    release.set()
+    first.join()
+    assert list(pipeline) == list(range(1, 100))
+
+
+def test_a_failing_stage_stops_the_others_and_raises():
+    def fail_on_three(n):
+        if n == 3:
+            raise KeyError(n)
+        return n
+
+    with pytest.raises(KeyError):
+        list(StagedPipeline(range(1000), [('fail', fail_on_three), ('square', square)], depth=2))
+
+
+def test_depth_below_one_is_rejected():
+    with pytest.raises(ValueError):
+        StagedPipeline([], [('square', square)], depth=0)
+
+
+@pytest.mark.parametrize('executor', [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_pooled_stage_returns_results_in_order(executor):
+    with executor(max_workers=3) as pool:
+        pipeline = StagedPipeline(range(200), [('square', square, pool), ('odd', odd_or_none)], depth=4)
+        assert list(pipeline) == [n * n for n in range(200) if n % 2]
+    assert pipeline.timings['square']['items'] == 200
+
+
+def test_pooled_stage_failure_is_raised():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with pytest.raises(ZeroDivisionError):
+            list(StagedPipeline(range(10), [('invert', lambda n: 1 / (n - 5), pool)], depth=2))
+
+
+def test_serialize_workers_write_the_same_dataset(tmp_path):
+    best = load_script('generate-best-ecg-articles.py')
+    articles = list(best.generate_articles(best.ecg_conditions))
+    outputs = []
+    for workers in ('1', '3'):
+        output = tmp_path / f"dataset-{workers}.json"
+        args = build_parser("test", "unused.json").parse_args(
+            ['--output', str(output), '--gzip', '--jsonl', '--queue-depth', '2', '--workers', workers])
+        assert write_articles(args, iter(articles)) == len(articles)
+        outputs.append(output)
+
+    first, pooled = (p.read_text(encoding='utf-8') for p in outputs)
+    assert first == pooled
+    assert json.loads(pooled) == articles
+    assert gzip.decompress((tmp_path / 'dataset-3.json.gz').read_bytes()).decode('utf-8') == pooled
+    assert (tmp_path / 'dataset-1.jsonl').read_bytes() == (tmp_path / 'dataset-3.jsonl').read_bytes()
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from pipeline.telemetry import instrumented, run, stage
+
+
+def events(directory):
+    return [json.loads(line) for line in (directory / 'runs.jsonl').read_text(encoding='utf-8').splitlines()]
+
+
+def test_run_logs_stages_and_writes_metrics(telemetry_dir, tmp_path):
+    output = tmp_path / 'out.json'
+    output.write_text('x' * 10)
+
+    @instrumented
+    def main():
+        with stage('generate') as stats:
+            stats.items = 3
+            stats.cache_hits = 1
+            stats.add_file(output)
+            stats.add_file(tmp_path / 'missing.json')
+            stats.extra['rejected'] = 2
+
+    main()
+    logged = events(telemetry_dir)
+    assert [e['event'] for e in logged] == ['run_start', 'stage_start', 'stage_end', 'run_end']
+    assert len({e['run'] for e in logged}) == 1
+    assert logged[0]['script'] == 'test_telemetry'
+    assert logged[2]['items'] == 3 and logged[2]['bytes'] == 10 and logged[2]['rejected'] == 2
+    assert logged[3]['status'] == 'ok' and logged[3]['cache_hits'] == 1
+
+    prom = (telemetry_dir / 'epulsepoints_pipeline_test_telemetry.prom').read_text()
+    assert 'epulsepoints_pipeline_run_success{script="test_telemetry"} 1' in prom
+    assert 'epulsepoints_pipeline_stage_items{script="test_telemetry",stage="generate"} 3' in prom
+    assert not list(telemetry_dir.glob('*.tmp'))
+
+
+def test_failed_run_is_recorded_as_an_error(telemetry_dir):
+    with pytest.raises(RuntimeError):
+        with run('broken'):
+            with stage('load'):
+                raise RuntimeError("boom")
+    logged = events(telemetry_dir)
+    assert logged[-1]['event'] == 'run_end' and logged[-1]['status'] == 'error'
+    assert 'run_success{script="broken"} 0' in (telemetry_dir / 'epulsepoints_pipeline_broken.prom').read_text()
+
+
+def test_nested_runs_share_the_outer_one(telemetry_dir):
+    with run('daemon'):
+        with run('generate-ecg-articles'):
+            with stage('generate'):
+                pass
+    assert [e['script'] for e in events(telemetry_dir)] == ['daemon'] * 4
+
+
+def test_stage_outside_a_run_still_times(telemetry_dir):
+    with stage('alone') as stats:
+        stats.items += 1
+    assert stats.duration >= 0
+    assert not telemetry_dir.exists()
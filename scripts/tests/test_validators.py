@@ -0,0 +1,74 @@
+import copy
+import json
+
+import pytest
+
+from pipeline.validators import PUBLIC_DIR, Rejections, compile_validator, validate_article
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 2, "maxLength": 5, "pattern": r"^[a-z]+$"},
+        "count": {"type": "integer"},
+        "flag": {"type": "boolean", "required": False},
+        "kind": {"type": "string", "enum": ["a", "b"]},
+        "tags": {"type": "array", "minItems": 1, "items": {"type": "string", "minLength": 1}},
+        "nested": {"type": "object", "required": False, "properties": {"id": {"type": "string"}}},
+    },
+}
+
+validate = compile_validator(SCHEMA)
+VALID = {"name": "abc", "count": 3, "kind": "a", "tags": ["x"]}
+
+
+@pytest.fixture(scope="module")
+def article():
+    with open(PUBLIC_DIR / "scripts" / "mi-ecg-articles.json", "r", encoding="utf-8") as f:
+        return json.load(f)[0]
+
+
+def test_valid_record_has_no_errors():
+    assert validate(VALID) == []
+    assert validate(dict(VALID, flag=True, nested={"id": "x"})) == []
+
+
+@pytest.mark.parametrize("change, error", [
+    ({"name": "a"}, "name is shorter than 2"),
+    ({"name": "abcdef"}, "name is longer than 5"),
+    ({"name": "AB"}, "name has an invalid format: 'AB'"),
+    ({"count": "3"}, "count must be integer"),
+    ({"count": True}, "count must be integer"),
+    ({"flag": 1}, "flag must be boolean"),
+    ({"kind": "c"}, "kind is not one of ['a', 'b']"),
+    ({"tags": []}, "tags needs at least 1 item(s)"),
+    ({"tags": ["x", ""]}, "tags[] is shorter than 1"),
+    ({"nested": {"id": 1}}, "nested.id must be string"),
+])
+def test_invalid_values_are_reported(change, error):
+    assert validate(dict(VALID, **change)) == [error]
+
+
+def test_missing_required_fields_are_reported():
+    assert validate({"name": "abc"}) == ["missing count", "missing kind", "missing tags"]
+    assert validate([]) == ["record must be object"]
+
+
+def test_generated_article_is_valid(article):
+    assert validate_article(article) == []
+
+
+def test_article_image_must_exist(article):
+    broken = copy.deepcopy(article)
+    broken["imageUrl"] = "/MI_ecg_database/missing.png"
+    broken["seo"]["ogImage"] = "https://ecgkid.com/missing.png"
+    errors = validate_article(broken)
+    assert "imageUrl does not resolve to a file: /MI_ecg_database/missing.png" in errors
+    assert "seo.ogImage does not resolve to a file: https://ecgkid.com/missing.png" in errors
+
+
+def test_rejections_drop_invalid_articles(article, capsys):
+    rejections = Rejections()
+    kept = list(rejections.filter([article, dict(article, category="cardiology"), "not an article"]))
+    assert kept == [article]
+    assert rejections.count == 2
+    assert "⛔ Rejected '<not an object>'" in capsys.readouterr().out
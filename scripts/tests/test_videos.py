@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from pipeline import videos
+from pipeline.videos import VideoCatalog, load_yaml_files, read_yaml_safe
+
+
+def write(directory, stem, text):
+    path = directory / f"{stem}.yaml"
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+def test_unescaped_quotes_in_titles_are_repaired(tmp_path):
+    path = write(tmp_path, 'quotes', 'title: "The "R on T" phenomenon"\ncategory: "Arrhythmias"\n')
+    assert read_yaml_safe(path) == {"title": 'The "R on T" phenomenon', "category": "Arrhythmias"}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_results_come_back_in_path_order(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(videos, 'PARALLEL_MIN_FILES', 4)
+    paths = [write(tmp_path, f"v{i:02d}", f"videoId: v{i}\ntitle: Video {i}\n") for i in range(12)]
+    assert [d['videoId'] for d in load_yaml_files(paths, workers)] == [f"v{i}" for i in range(12)]
+
+
+def test_refresh_rereads_only_changed_files(tmp_path, monkeypatch):
+    first = write(tmp_path, 'a', 'title: A\n')
+    write(tmp_path, 'b', 'title: B\n')
+    catalog = VideoCatalog(tmp_path)
+    assert sorted(catalog.refresh()) == ['a', 'b']
+    assert catalog.refresh() == []
+
+    stat = first.stat()
+    first.write_text('title: A2\n')
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (tmp_path / 'b.yaml').unlink()
+    write(tmp_path, 'c', 'title: C\n')
+    assert sorted(catalog.refresh()) == ['a', 'b', 'c']
+    assert catalog.videos == {'a': {'title': 'A2'}, 'c': {'title': 'C'}}
+
+    catalog.save('c', {'title': 'C2'})
+    assert catalog.refresh() == []
+    assert read_yaml_safe(catalog.path('c')) == {'title': 'C2'}
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from pipeline.views import ViewAggregator, parse_log_line, read_log
+
+CLF = '1.2.3.4 - - [10/Oct/2025:13:55:{second:02d} +0000] "{method} {path} HTTP/1.1" {status} 512 "-" "{agent}"'
+
+
+def clf(path, second=0, method='GET', status=200, agent='Mozilla/5.0'):
+    return CLF.format(second=second, method=method, path=path, status=status, agent=agent)
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+
+    def write(self, start, end, counts):
+        self.batches.append((start, end, dict(counts)))
+
+
+def test_counted_views():
+    when, route, slug = parse_log_line(clf('/blog/Atrial-Flutter/?ref=x'))
+    assert (route, slug) == ('blog', 'atrial-flutter')
+    assert when == 1760104500.0
+    cloud = {"timestamp": "2025-10-10T13:55:00Z",
+             "httpRequest": {"requestMethod": "GET", "requestUrl": "https://ecgkid.com/watch/axis", "status": 304}}
+    assert parse_log_line(json.dumps(cloud))[1:] == ('watch', 'axis')
+
+
+@pytest.mark.parametrize('line', [
+    clf('/blog/x', method='HEAD'),
+    clf('/blog/x', status=404),
+    clf('/blog/x', agent='Googlebot/2.1'),
+    clf('/blog/x/comments'),
+    clf('/videos'),
+    'not a log line',
+    '{"timestamp": "nonsense", "httpRequest": {}}',
+    '',
+])
+def test_lines_that_do_not_count(line):
+    assert parse_log_line(line) is None
+
+
+def test_views_are_flushed_once_per_window():
+    sink = ListSink()
+    aggregator = ViewAggregator(sink, window=60)
+    for when, slug in [(0, 'a'), (10, 'a'), (59, 'b'), (60, 'a'), (200, 'b')]:
+        aggregator.add(when, 'blog', slug)
+    aggregator.flush()
+    assert sink.batches == [
+        (0, 60, {('blog', 'a'): 2, ('blog', 'b'): 1}),
+        (60, 120, {('blog', 'a'): 1}),
+        (180, 240, {('blog', 'b'): 1}),
+    ]
+    assert aggregator.views == 5 and aggregator.flushes == 3
+
+
+def test_recent_views_outrank_older_ones():
+    aggregator = ViewAggregator(ListSink(), half_life=3600)
+    for _ in range(3):
+        aggregator.add(0, 'blog', 'old')
+    for _ in range(2):
+        aggregator.add(7200, 'blog', 'new')
+    (first, _, score), (second, _, old_score) = [(s, r, v) for r, s, v in aggregator.hot(2)]
+    assert (first, second) == ('new', 'old')
+    assert score == 2 and old_score == pytest.approx(0.75)
+
+    aggregator.forget(threshold=1, now=7200)
+    assert list(aggregator.scores) == ['blog/new']
+
+
+def test_read_log_resumes_and_restarts_after_rotation(tmp_path):
+    log = tmp_path / 'access.log'
+    log.write_text("one\ntwo\npart")
+    offsets = {}
+    lines = list(read_log(str(log), offsets))
+    assert [line for line, _ in lines] == ["one\n", "two\n"]   # the unfinished line waits
+
+    offsets[str(log)] = [log.stat().st_ino, lines[-1][1]]
+    with open(log, 'a') as f:
+        f.write("ial\n")
+    assert [line for line, _ in read_log(str(log), offsets)] == ["partial\n"]
+
+    log.unlink()
+    log.write_text("fresh\n")
+    offsets[str(log)][0] = -1   # a rotated log is a different file
+    assert [line for line, _ in read_log(str(log), offsets)] == ["fresh\n"]
+
@@ -0,0 +1,120 @@
+import base64
+import json
+
+import pytest
+
+from pipeline.scripts import load_script
+from pipeline.slugindex import SECOND_SEED, fnv1a
+from pipeline.slugregistry import SlugRegistry
+from pipeline.watch import GeneratorTarget, SiteIndexes, Watcher
+
+CONDITIONS = load_script('generate-ecg-articles.py').ecg_conditions[:2]
+AFIB, AVR = (c['name'] for c in CONDITIONS)
+
+
+def write_catalog(path, records):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in records), encoding='utf-8')
+    return path
+
+
+def in_bloom(index_path, key):
+    """Is key in the slug index's Bloom filter (the lookup lib/slugIndex.ts does)"""
+    bloom = json.loads(index_path.read_text())['bloom']
+    data = base64.b64decode(bloom['data'])
+    h1, h2 = fnv1a(key), fnv1a(key, SECOND_SEED) | 1
+    return all(data[p >> 3] & (1 << (p & 7)) for p in ((h1 + i * h2) % bloom['bits'] for i in range(bloom['hashes'])))
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / 'articles').mkdir()
+    (tmp_path / 'videos').mkdir()
+    (tmp_path / 'videos' / 'leads.yaml').write_text("videoId: v1\ntitle: Leads\ncategory: ECG Fundamentals\n")
+    datasets = tmp_path / 'datasets'
+    datasets.mkdir()
+    catalog = write_catalog(tmp_path / 'catalog.jsonl', CONDITIONS)
+    target = GeneratorTarget('clean-rhythm', datasets, catalog)
+    indexes = SiteIndexes(
+        datasets, tmp_path / 'articles', tmp_path / 'videos',
+        registry_path=tmp_path / 'registry.json',
+        index_path=tmp_path / 'slug-index.json',
+        manifest_path=tmp_path / 'manifest.json',
+        listings_dir=tmp_path / 'listings',
+    )
+    watcher = Watcher([target], site=indexes)
+    watcher.build()
+    return tmp_path, target, watcher
+
+
+def published(target):
+    return {a['title']: a['slug'] for a in json.loads(target.output.read_text(encoding='utf-8'))}
+
+
+def test_build_registers_slugs_and_writes_the_indexes(site):
+    tmp_path, target, _ = site
+    slugs = published(target)
+    assert len(slugs) == 2 and all(slugs.values())
+
+    registry = SlugRegistry.load(tmp_path / 'registry.json')
+    assert sorted(registry.slug_for(s) for s in registry.sources if s.startswith('dataset:')) == sorted(slugs.values())
+    assert registry.slug_for('video:v1') == 'leads'
+    for slug in slugs.values():
+        assert in_bloom(tmp_path / 'slug-index.json', f"blog/{slug}")
+    assert in_bloom(tmp_path / 'slug-index.json', 'watch/leads')
+    assert (tmp_path / 'listings' / 'index.json').exists()
+
+    sidecar = json.loads(target.output.with_name(target.output.stem + '.meta.json').read_text())
+    assert set(sidecar) == set(slugs.values())
+    assert not list(tmp_path.rglob('*.tmp'))
+
+
+def test_retitled_entry_is_registered_and_indexed(site, capsys):
+    tmp_path, target, watcher = site
+    old = published(target)
+    renamed = [dict(CONDITIONS[0], name="Atrial Fibrillation Variant"), CONDITIONS[1]]
+    catalog = write_catalog(target.catalog_path, renamed)
+
+    watcher.apply({catalog})
+
+    new = published(target)
+    moved = (set(new.values()) - set(old.values())).pop()
+    assert 'atrial-fibrillation-variant' in moved
+    assert "slugs changed" in capsys.readouterr().out
+    assert in_bloom(tmp_path / 'slug-index.json', f"blog/{moved}")
+    assert SlugRegistry.load(tmp_path / 'registry.json').lookup('blog', moved)
+
+
+def test_added_video_reaches_the_registry_and_index(site):
+    tmp_path, _, watcher = site
+    video = tmp_path / 'videos' / 'axis.yaml'
+    video.write_text("videoId: v2\ntitle: Axis\ncategory: ECG Fundamentals\n")
+
+    watcher.apply({video})
+
+    assert SlugRegistry.load(tmp_path / 'registry.json').slug_for('video:v2') == 'axis'
+    assert in_bloom(tmp_path / 'slug-index.json', 'watch/axis')
+
+
+def test_repeated_catalog_names_render_every_copy(tmp_path, capsys):
+    catalog = write_catalog(tmp_path / 'catalog.jsonl', [CONDITIONS[0], CONDITIONS[1], CONDITIONS[0]])
+    target = GeneratorTarget('clean-rhythm', tmp_path, catalog)
+    watcher = Watcher([target])
+    watcher.build()
+
+    assert target.order == [AFIB, AVR, f"{AFIB} (2)"]
+    assert target.repeated == [AFIB]
+    assert len(json.loads(target.output.read_text())) == 3
+    assert f"catalog repeats {AFIB}" in capsys.readouterr().out
+
+
+def test_failed_sidecar_write_keeps_the_previous_file(tmp_path, monkeypatch):
+    target = GeneratorTarget('clean-rhythm', tmp_path, write_catalog(tmp_path / 'c.jsonl', CONDITIONS))
+    Watcher([target]).build()
+    sidecar = target.output.with_name(target.output.stem + '.meta.json')
+    before = sidecar.read_bytes()
+
+    monkeypatch.setattr(json, 'dump', lambda *args, **kwargs: (_ for _ in ()).throw(OSError("disk full")))
+    with pytest.raises(OSError):
+        target.write()
+    assert sidecar.read_bytes() == before
+    assert not list(tmp_path.glob('*.tmp'))
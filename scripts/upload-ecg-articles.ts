@@ -1,4 +1,4 @@
-import { collection, addDoc, Timestamp } from 'firebase/firestore';
+import { collection, deleteDoc, doc, getDocs, query, setDoc, Timestamp, where } from 'firebase/firestore';
 import { db } from '../lib/firebase';
 
 // All 17 ECG conditions from clean_rhythm_ecg folder
@@ -160,6 +160,16 @@ function generateSlug(title: string): string {
     .replace(/^-|-$/g, ''); // Remove leading/trailing hyphens
 }
 
+// Articles are stored under their slug, the document ID scripts/diff-articles.py
+// addresses. Uploads before that used addDoc (random IDs); drop those copies so
+// re-running the upload replaces articles instead of duplicating them.
+async function removeRandomIdCopies(slug: string) {
+  const copies = await getDocs(query(collection(db, 'blog'), where('slug', '==', slug)));
+  for (const copy of copies.docs) {
+    if (copy.id !== slug) await deleteDoc(copy.ref);
+  }
+}
+
 async function uploadArticles() {
   console.log('Starting to upload articles...');
   
@@ -187,8 +197,9 @@ async function uploadArticles() {
         },
       };
 
-      const docRef = await addDoc(collection(db, 'blog'), article);
-      console.log(`✓ Uploaded: ${ecg.condition} (ID: ${docRef.id})`);
+      await setDoc(doc(db, 'blog', slug), article);
+      await removeRandomIdCopies(slug);
+      console.log(`✓ Uploaded: ${ecg.condition} (ID: ${slug})`);
       
       // Small delay to avoid rate limiting
       await new Promise(resolve => setTimeout(resolve, 500));
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Watch generator catalogs, templates, ECG image folders, content/articles and
+content/videos, and regenerate only the articles affected by each change.
+After each change the slug registry, the registered slugs on the articles,
+lib/slug-index.json, the article manifest and the listing pages are brought
+up to date as well (--no-indexes to leave them alone).
+
+Usage:
+    python watch-content.py
+    python watch-content.py --generators mi v2 --catalog v2=conditions.csv
+"""
+
+import argparse
+
+from pipeline.scripts import GENERATORS, SCRIPTS_DIR
+from pipeline.watch import GeneratorTarget, SiteIndexes, VideoTarget, Watcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate content as its sources change")
+    parser.add_argument(
+        '--generators',
+        nargs='+',
+        choices=list(GENERATORS),
+        default=list(GENERATORS),
+        help="Generators to keep up to date (default: all)",
+    )
+    parser.add_argument(
+        '--catalog',
+        action='append',
+        default=[],
+        metavar='GENERATOR=PATH',
+        help="Use a CSV/JSONL catalog instead of the script's built-in list",
+    )
+    parser.add_argument('--output-dir', default=SCRIPTS_DIR, help="Directory outputs are written relative to")
+    parser.add_argument('--no-videos', action='store_true', help="Do not check video categories")
+    parser.add_argument('--no-indexes', action='store_true', help="Do not update the slug registry and site indexes")
+    parser.add_argument('--poll', type=float, default=0.1, help="Seconds between scans")
+    parser.add_argument('--quiet', type=float, default=0.25, help="Debounce window in seconds")
+    args = parser.parse_args()
+
+    catalogs = {}
+    for entry in args.catalog:
+        key, _, path = entry.partition('=')
+        if key not in GENERATORS or not path:
+            parser.error(f"--catalog expects GENERATOR=PATH with GENERATOR in: {', '.join(GENERATORS)}")
+        catalogs[key] = path
+
+    targets = [GeneratorTarget(key, args.output_dir, catalogs.get(key)) for key in args.generators]
+    videos = None if args.no_videos else VideoTarget()
+    site = None if args.no_indexes else SiteIndexes()
+    watcher = Watcher(targets, videos, site, poll=args.poll, quiet=args.quiet)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+
+if __name__ == "__main__":
+    main()